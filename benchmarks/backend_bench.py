@@ -0,0 +1,78 @@
+"""
+Throughput of the garden backends against each other.
+
+Every backend simulates the same seeded gardens from their first step, without rendering. Steps per second are
+reported per garden along with the speedup of every backend over the object backend:
+
+    python -m benchmarks.backend_bench
+    python -m benchmarks.backend_bench --size 100x70 400x1000 --seed 1 3 --steps 2000 --output backends.json
+"""
+import argparse
+import json
+import sys
+from dataclasses import dataclass, asdict
+from typing import Final, List, Tuple
+
+from dotenv import load_dotenv
+
+from src.helper.log import logger
+from src.simulation import headless
+from src.simulation.__main__ import parse_size
+from src.simulation.backends import BACKENDS
+
+DEFAULT_SIZES: Final = ("100x70", "400x200", "400x1000")
+BASELINE: Final = "object"
+
+
+@dataclass(frozen=True)
+class Result:
+    backend: str
+    size: str
+    seed: int
+    steps: int
+    steps_per_second: float
+    # steps per second relative to the object backend on the same garden
+    speedup: float
+
+
+def run(backends: List[str], sizes: List[Tuple[int, int]], seeds: List[int], steps: int):
+    results = []
+    for width, height in sizes:
+        for seed in seeds:
+            rates = {}
+            for backend in backends:
+                stats = headless.run(BACKENDS[backend]((height, width), seed), steps)
+                rates[backend] = stats.steps_per_second
+
+            for backend, rate in rates.items():
+                result = Result(backend, f"{width}x{height}", seed, steps, rate, rate / rates[BASELINE])
+                results.append(result)
+                print(f"{result.size:>9} seed {seed:<3} {backend:>7}  {rate:8.1f} steps/s  {result.speedup:5.2f}x")
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.backend_bench", description=__doc__.split("\n\n")[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", nargs="+", type=parse_size, default=[parse_size(s) for s in DEFAULT_SIZES],
+                        help="garden sizes as WIDTHxHEIGHT")
+    parser.add_argument("--seed", nargs="+", type=int, default=[1, 3], help="garden seeds")
+    parser.add_argument("--steps", type=int, default=500, help="steps per garden")
+    parser.add_argument("--output", default=None, help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    logger.disable("src")
+
+    backends = [BASELINE, *(name for name in BACKENDS if name != BASELINE)]
+    results = run(backends, args.size, args.seed, args.steps)
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump({"config": {"steps": args.steps}, "results": [asdict(result) for result in results]}, file,
+                      indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""
+Reproducible timings of every garden update phase and every draw mode.
+
+Gardens are grown from a fixed seed up to each population stage, then every phase is timed over the same
+steps and every draw mode over the same frames. Results are written as JSON so that runs can be compared:
+
+    python -m benchmarks.garden_bench --output before.json
+    python -m benchmarks.garden_bench --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Tuple, Union
+
+import numpy as np
+import pyxel as px
+from dotenv import load_dotenv
+from loguru import logger
+
+load_dotenv()
+logger.disable("src")
+
+from src.helper.vec import Vec2
+from src.simulation import checkpoint
+from src.simulation.__main__ import parse_size
+from src.simulation.backends import BACKENDS
+from src.simulation.garden import BaseGarden
+from src.simulation.kinds import CellKind
+from src.widgets.garden_widget import GardenWidget
+
+PHASES = BaseGarden.UPDATE_PHASES
+DRAW_MODES = ("draw_plants", "draw_energy", "draw_shadow", "draw_plants_id")
+
+DEFAULT_SIZES = ("100x70", "400x200", "1000x1000")
+DEFAULT_STAGES = ("early:100", "mid:1000", "late:3000")
+
+
+@dataclass(frozen=True)
+class Result:
+    backend: str
+    size: str
+    stage: str
+    step: int
+    occupied: int
+    plants: int
+    name: str
+    samples: int
+    mean_ms: float
+    median_ms: float
+    min_ms: float
+    max_ms: float
+
+    @property
+    def key(self):
+        return self.backend, self.size, self.stage, self.name
+
+
+def parse_stage(value: str):
+    try:
+        name, steps = value.split(":")
+        steps = int(steps)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Required: NAME:STEPS; Got: {value}")
+
+    if steps < 0:
+        raise argparse.ArgumentTypeError(f"Required: steps >= 0; Got: {value}")
+
+    return name, steps
+
+
+def summarize(garden: BaseGarden, backend: str, size: str, stage: str, name: str, samples: List[float]):
+    samples_ms = [sample * 1000 for sample in samples]
+    counts = garden.cell_counts()
+    return Result(backend, size, stage, garden.steps,
+                  sum(counts.values()) - counts[CellKind.EMPTY], len(garden.plants),
+                  name, len(samples_ms), statistics.fmean(samples_ms), statistics.median(samples_ms),
+                  min(samples_ms), max(samples_ms))
+
+
+def time_phases(garden: BaseGarden, steps: int):
+    """Seconds spent in every phase of each of `steps` updates, as timed by the garden's own StepProfile"""
+    samples: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+    profile = garden.enable_profiling()
+
+    try:
+        for _ in range(steps):
+            garden.update()
+            for phase, seconds in profile.durations.items():
+                samples[phase].append(seconds)
+    finally:
+        garden.disable_profiling()
+
+    return samples
+
+
+def time_draw_modes(garden: BaseGarden, frames: int):
+    """
+    Seconds spent drawing each of `frames` frames in every draw mode into an offscreen image.
+    The garden is updated between frames, so incremental redraws are measured as they happen in the app
+    """
+    widget = GardenWidget(garden, Vec2(1, 1), px.COLOR_WHITE)
+    target = px.Image(widget.size[0] + 2, widget.size[1] + 2)
+    samples: Dict[str, List[float]] = {mode: [] for mode in DRAW_MODES}
+
+    for mode in DRAW_MODES:
+        widget.draw(mode, target)
+
+    for _ in range(frames):
+        garden.update()
+        for mode in DRAW_MODES:
+            start = time.perf_counter()
+            widget.draw(mode, target)
+            samples[mode].append(time.perf_counter() - start)
+
+    return samples
+
+
+def grow(backend: str, size: Tuple[int, int], seed: int, stages: List[Tuple[str, int]], cache: Union[str, None]):
+    """(stage, state of the garden) for every stage, one garden is grown through all of them"""
+    width, height = size
+    garden = BACKENDS[backend]((height, width), seed)
+
+    # the initial seed falls from the middle of the garden first, stages start once it took root
+    while not garden.has_plants and not garden.is_extinct:
+        garden.update()
+    rooted = garden.steps
+
+    for stage, steps in sorted(stages, key=lambda s: s[1]):
+        path = None if cache is None else os.path.join(cache, f"{backend}-{width}x{height}-{seed}-{steps}.npz")
+
+        if path is not None and os.path.exists(path):
+            garden = checkpoint.load(path)
+        else:
+            while garden.steps < rooted + steps:
+                garden.update()
+
+            if path is not None:
+                os.makedirs(cache, exist_ok=True)
+                checkpoint.save(garden, path)
+
+        yield stage, garden.state()
+
+
+def run(backends: List[str], sizes: List[Tuple[int, int]], stages: List[Tuple[str, int]], seed: int,
+        steps: int, frames: int, cache: Union[str, None], progress: Callable[[Result], None]):
+    results: List[Result] = []
+
+    for backend in backends:
+        for width, height in sizes:
+            size = f"{width}x{height}"
+
+            for stage, state in grow(backend, (width, height), seed, stages, cache):
+                garden = BACKENDS[backend].from_state(state)
+                for name, samples in time_phases(garden, steps).items():
+                    results.append(summarize(garden, backend, size, stage, name, samples))
+                    progress(results[-1])
+
+                garden = BACKENDS[backend].from_state(state)
+                for name, samples in time_draw_modes(garden, frames).items():
+                    results.append(summarize(garden, backend, size, stage, name, samples))
+                    progress(results[-1])
+
+    return results
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pyxel": px.VERSION,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+
+
+def print_result(result: Result, baseline: Union[Result, None] = None):
+    change = ""
+    if baseline is not None and baseline.median_ms > 0:
+        change = f" ({(result.median_ms / baseline.median_ms - 1) * 100:+.1f}%)"
+
+    print(f"{result.backend:>6} {result.size:>9} {result.stage:>6} {result.name:>18}: "
+          f"median {result.median_ms:9.3f} ms, mean {result.mean_ms:9.3f} ms{change} "
+          f"[{result.occupied} tiles, {result.plants} plants]")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.garden_bench", description=__doc__.split("\n\n")[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", nargs="+", choices=tuple(BACKENDS), default=list(BACKENDS))
+    parser.add_argument("--size", nargs="+", type=parse_size, default=[parse_size(s) for s in DEFAULT_SIZES],
+                        help="garden sizes as WIDTHxHEIGHT")
+    parser.add_argument("--stage", nargs="+", type=parse_stage, default=[parse_stage(s) for s in DEFAULT_STAGES],
+                        help="population stages as NAME:STEPS, steps grown after the initial seed took root")
+    parser.add_argument("--seed", type=int, default=1, help="garden seed")
+    parser.add_argument("--steps", type=int, default=20, help="timed updates per stage")
+    parser.add_argument("--frames", type=int, default=10, help="timed frames per draw mode and stage")
+    parser.add_argument("--cache", default=None, help="directory to keep grown gardens in between runs")
+    parser.add_argument("--output", default=None, help="write the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="show changes against the results in this JSON file")
+    args = parser.parse_args(argv)
+
+    baseline: Dict[tuple, Result] = {}
+    if args.compare is not None:
+        with open(args.compare) as file:
+            baseline = {result.key: result for result in map(lambda r: Result(**r), json.load(file)["results"])}
+
+    results = run(args.backend, args.size, args.stage, args.seed, args.steps, args.frames, args.cache,
+                  lambda result: print_result(result, baseline.get(result.key)))
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump({
+                "environment": environment(),
+                "config": {"seed": args.seed, "steps": args.steps, "frames": args.frames,
+                           "stages": dict(args.stage)},
+                "results": [asdict(result) for result in results],
+            }, file, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
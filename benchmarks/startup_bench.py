@@ -0,0 +1,154 @@
+"""
+Startup time of the simulation package, measured in fresh interpreters.
+
+Every case runs `--repeat` times in a new process: the time its code takes within the process, the whole process
+from start to exit, and the modules it pulled in that the simulation core must not import. A case fails if it
+imports one of them, writes any output or is slower than `--budget`:
+
+    python -m benchmarks.startup_bench --output before.json
+    python -m benchmarks.startup_bench --compare before.json --budget 500
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Final, List, Union
+
+from dotenv import load_dotenv
+
+# modules only the app, the CLI entry points or logging that is switched on may import
+FORBIDDEN: Final = ("pyxel", "dotenv", "loguru")
+
+CASES: Final = {
+    "garden": "import src.simulation.garden",
+    "backends": "import src.simulation.backends",
+    "env": "import src.simulation.env",
+    "cli": "import src.simulation.__main__",
+    "first_step": "from src.helper.log import logger\n"
+                  "logger.disable('src')\n"
+                  "from src.simulation.backends import BACKENDS\n"
+                  "BACKENDS['object']((70, 100), 1).update()",
+}
+
+# runs the case and reports its time and the forbidden modules it imported as JSON on the last line of stdout
+_RUNNER: Final = """
+import json, sys, time
+start = time.perf_counter()
+exec(compile({code!r}, "<case>", "exec"))
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "imported": [name for name in {forbidden!r} if name in sys.modules]}}))
+"""
+
+ROOT: Final = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass(frozen=True)
+class Result:
+    case: str
+    repeat: int
+    # milliseconds within the process and of the whole process
+    median_ms: float
+    min_ms: float
+    process_median_ms: float
+    imported: List[str]
+    output: str
+
+
+def run_case(name: str, repeat: int):
+    runner = _RUNNER.format(code=CASES[name], forbidden=FORBIDDEN)
+    inner, outer = [], []
+    imported, output = set(), ""
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, "-c", runner], cwd=ROOT, capture_output=True, text=True)
+        outer.append(time.perf_counter() - start)
+
+        lines = process.stdout.splitlines()
+        if process.returncode != 0 or not lines:
+            raise RuntimeError(f"case {name} failed:\n{process.stderr}")
+
+        report = json.loads(lines[-1])
+        inner.append(report["seconds"])
+        imported.update(report["imported"])
+        output = output or "\n".join(lines[:-1]) + process.stderr
+
+    return Result(name, repeat, statistics.median(inner) * 1000, min(inner) * 1000, statistics.median(outer) * 1000,
+                  sorted(imported), output.strip())
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+
+
+def failures(result: Result, budget: Union[float, None]):
+    reasons = []
+    if result.imported:
+        reasons.append(f"imports {', '.join(result.imported)}")
+    if result.output:
+        reasons.append(f"writes output: {result.output.splitlines()[0]}")
+    if budget is not None and result.median_ms > budget:
+        reasons.append(f"median above {budget:.0f} ms")
+
+    return reasons
+
+
+def print_result(result: Result, reasons: List[str], baseline: Union[Result, None] = None):
+    line = (f"{result.case:>12}  median {result.median_ms:7.1f} ms  min {result.min_ms:7.1f} ms  "
+            f"process {result.process_median_ms:7.1f} ms")
+    if baseline is not None:
+        line += f"  ({(result.median_ms / baseline.median_ms - 1) * 100:+.1f}%)"
+    if reasons:
+        line += f"  FAILED: {'; '.join(reasons)}"
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup_bench", description=__doc__.split("\n\n")[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--case", nargs="+", choices=tuple(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=10, help="fresh processes per case")
+    parser.add_argument("--budget", type=float, default=None, help="fail cases with a median above this many ms")
+    parser.add_argument("--output", default=None, help="write the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="show changes against the results in this JSON file")
+    args = parser.parse_args(argv)
+
+    # the cases get the config through the environment, without importing dotenv themselves
+    load_dotenv(os.path.join(ROOT, ".env"))
+
+    baseline: Dict[str, Result] = {}
+    if args.compare is not None:
+        with open(args.compare) as file:
+            baseline = {result.case: result for result in map(lambda r: Result(**r), json.load(file)["results"])}
+
+    results, failed = [], False
+    for name in args.case:
+        result = run_case(name, args.repeat)
+        reasons = failures(result, args.budget)
+        failed = failed or bool(reasons)
+
+        results.append(result)
+        print_result(result, reasons, baseline.get(name))
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump({
+                "environment": environment(),
+                "config": {"repeat": args.repeat},
+                "results": [asdict(result) for result in results],
+            }, file, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,22 @@
+import argparse
+import time
 from collections import deque
-from typing import Final
+from typing import Final, Union
 
 import pyxel as px
 from dotenv import load_dotenv
 from loguru import logger
 
-load_dotenv()
-
 from src.helper.vec import Vec2
+from src.simulation import checkpoint
+from src.simulation.delta_log import Replay
+from src.simulation.fast_forward import FastForward
 from src.simulation.garden import Garden
+from src.simulation.metrics import MetricsRecorder
 from src.widgets.garden_widget import GardenWidget
 from src.widgets.image import Image
 from src.widgets.label import Label
+from src.widgets.profiler_hud import ProfilerHud
 
 
 class App:
@@ -20,17 +25,38 @@ class App:
     __FPS = 30
 
     __GARDEN_BORDER: Final = px.COLOR_WHITE
-    __GARDEN_SIZE: Final = (70, 100)
+    __GARDEN_SIZE: Final = (68, 300)
     __GARDEN_POSITION: Final = Vec2(30, 30)
+    __GARDEN_VIEW: Final = (400, 272)
+    # pixels the view moves per frame while an arrow key is held
+    __PAN_SPEED: Final = 8
+    __CHECKPOINT_PATH: Final = "garden.npz"
+    __METRICS_PATH: Final = "metrics.csv"
+    # part of every frame the simulation may take when fast-forwarding, the rest is left for drawing
+    __SIMULATION_BUDGET: Final = 0.6 / __FPS
 
     logger.info(f"App: window size: {__WIDTH}x{__HEIGHT}")
     logger.info(f"App: FPS: {__FPS}")
 
-    def __init__(self):
+    def __init__(self, replay_path: Union[str, None] = None):
+        """`replay_path` - play back this delta log instead of simulating a garden"""
         px.init(self.__WIDTH, self.__HEIGHT, quit_key=None, title="Gravity", display_scale=2, fps=self.__FPS)
         px.load("./res.pyxres")
 
-        self.w_garden = GardenWidget(Garden(self.__GARDEN_SIZE, self.__GARDEN_BORDER), self.__GARDEN_POSITION)
+        self.metrics = MetricsRecorder()
+        self.replay: Union[Replay, None] = None
+        if replay_path is not None:
+            self.replay = Replay(replay_path)
+            px.mouse(True)
+
+        garden = self.__recorded(Garden(self.__GARDEN_SIZE)) if self.replay is None else self.replay
+        self.w_garden = GardenWidget(garden, self.__GARDEN_POSITION, self.__GARDEN_BORDER, self.__GARDEN_VIEW)
+        # the frame around the garden never moves, its (x, y, width, height) rectangles are worked out once
+        position, size = self.w_garden.position, Vec2(*self.w_garden.size)
+        self.__frame = ((*(position - Vec2(15, 15)), *(size + Vec2(30, 45))),
+                        (*(position - Vec2(16, 14)), *(size + Vec2(32, 43))))
+        # replay timeline between the arrows below the garden, (x, y, width, height)
+        self.__timeline = (position.x + 12, position.y + size.y + 5, size.x - 24, 3)
         self.garden_draw_modes = deque([
             "draw_plants",
             "draw_energy",
@@ -48,17 +74,38 @@ class App:
         self.l_mode = Label(Vec2(0, -10), [f"Draw mode: {self.garden_draw_mode_names[self.garden_draw_mode]}"],
                             px.COLOR_WHITE, self.w_garden)
 
-        self.l_help = Label(Vec2(15, px.height - 50), [
-            "R - reset garden",
-            "T - switch between rendering modes",
-            "F - simulate one step (If paused)",
-            "Space - pase/unpause"
+        if self.replay is None:
+            help_lines = [
+                "R - reset garden",
+                f"S/L - save/load garden ({self.__CHECKPOINT_PATH})",
+                f"M - save metrics ({self.__METRICS_PATH})",
+                "T/H - switch rendering mode, show/hide timings",
+                "-/= - slower/faster simulation",
+            ]
+        else:
+            help_lines = [
+                f"Replaying {replay_path}",
+                "Click/drag the timeline - seek",
+                f"[/] - {self.replay.keyframe_every} steps back/forward, Home/End - first/last step",
+                "T - switch rendering mode",
+                "-/= - slower/faster replay",
+            ]
+        self.l_help = Label(Vec2(15, px.height - 66), [
+            *help_lines,
+            "Arrows, Z/X - pan, zoom in/out",
+            "Space/F - pause/unpause, step while paused"
         ], px.COLOR_GRAY)
 
         self.l_size = Label(Vec2(self.w_garden.size[0] - 60, -10),
                             [f"Size: {self.w_garden.garden.size[0]}x{self.w_garden.garden.size[1]}"],
                             px.COLOR_WHITE, self.w_garden)
 
+        self.l_speed = Label(Vec2(self.w_garden.size[0] - 60, self.w_garden.size[1] + 12), [],
+                             px.COLOR_WHITE, self.w_garden)
+
+        self.hud = ProfilerHud(Vec2(2, 2), self.w_garden)
+        self.fast_forward = FastForward(self.__SIMULATION_BUDGET)
+
         self.larrow = Image(8, 8, 16, 0, 0, 0)
         self.rarrow = Image(-8, 8, 16, 0, 0, 0)
 
@@ -74,41 +121,123 @@ class App:
 
         logger.info(f"Render mode changed to {self.garden_draw_mode}")
 
+    def __recorded(self, garden: Garden):
+        """The garden, recording its metrics from scratch"""
+        self.metrics.clear()
+        garden.enable_metrics(self.metrics)
+        return garden
+
     def reset_garden(self):
-        self.w_garden.garden = Garden(self.__GARDEN_SIZE, self.__GARDEN_BORDER)
+        self.w_garden.garden = self.__recorded(Garden(self.__GARDEN_SIZE))
 
         logger.info("Garden reset")
 
+    def save_garden(self):
+        checkpoint.save(self.w_garden.garden, self.__CHECKPOINT_PATH)
+
+    def load_garden(self):
+        try:
+            self.w_garden.garden = self.__recorded(checkpoint.load(self.__CHECKPOINT_PATH))
+        except FileNotFoundError:
+            logger.warning(f"No saved garden at {self.__CHECKPOINT_PATH}")
+
+    def save_metrics(self):
+        self.metrics.save(self.__METRICS_PATH)
+        logger.info(f"Saved {len(self.metrics)} steps of metrics to {self.__METRICS_PATH}")
+
     def toggle_pause(self):
         self.active = not self.active
+        if self.active and self.replay is not None and self.replay.finished:
+            self.replay.seek(self.replay.first_step)
 
         if self.active:
             logger.info("App unpaused")
         else:
             logger.info("App paused")
 
+    def update_speed_label(self):
+        self.l_speed.clear()
+        self.l_speed.add_line(f"Speed: {self.fast_forward.speed}x{'*' if self.fast_forward.limited else ''}")
+        self.l_speed.add_line(f"{self.fast_forward.steps_per_second:.0f} steps/s")
+        if self.replay is not None:
+            self.l_speed.add_line(f"step {self.replay.steps}/{self.replay.last_step}")
+
+    def update_replay(self):
+        """Seeking keys and the timeline, pauses once the replay reaches its last step"""
+        replay = self.replay
+        if px.btnp(px.KEY_LEFTBRACKET, hold=10, repeat=5):
+            replay.seek(replay.steps - replay.keyframe_every)
+        if px.btnp(px.KEY_RIGHTBRACKET, hold=10, repeat=5):
+            replay.seek(replay.steps + replay.keyframe_every)
+        if px.btnp(px.KEY_HOME):
+            replay.seek(replay.first_step)
+        if px.btnp(px.KEY_END):
+            replay.seek(replay.last_step)
+
+        x, y, width, height = self.__timeline
+        if px.btn(px.MOUSE_BUTTON_LEFT) and x <= px.mouse_x < x + width and y - 3 <= px.mouse_y < y + height + 3:
+            fraction = (px.mouse_x - x) / (width - 1)
+            replay.seek(replay.first_step + round(fraction * (replay.last_step - replay.first_step)))
+
+        if self.active and replay.finished:
+            self.toggle_pause()
+
     def update(self):
         if self.active:
-            self.w_garden.update()
+            self.fast_forward.advance(self.w_garden.garden)
+        else:
+            self.fast_forward.pause()
+
+        if self.replay is None:
+            if px.btnp(px.KEY_R):
+                self.reset_garden()
+
+            if px.btnp(px.KEY_S):
+                self.save_garden()
 
-        if px.btnp(px.KEY_R):
-            self.reset_garden()
+            if px.btnp(px.KEY_L):
+                self.load_garden()
+
+            if px.btnp(px.KEY_M):
+                self.save_metrics()
+
+            if px.btnp(px.KEY_H):
+                self.hud.toggle()
+        else:
+            self.update_replay()
 
         if px.btnp(px.KEY_T):
             self.switch_render_mode()
 
+        if px.btnp(px.KEY_Z):
+            self.w_garden.zoom_in()
+
+        if px.btnp(px.KEY_X):
+            self.w_garden.zoom_out()
+
+        self.w_garden.pan(self.__PAN_SPEED * (px.btn(px.KEY_RIGHT) - px.btn(px.KEY_LEFT)),
+                          self.__PAN_SPEED * (px.btn(px.KEY_DOWN) - px.btn(px.KEY_UP)))
+
+        if px.btnp(px.KEY_EQUALS, hold=10, repeat=5):
+            self.fast_forward.faster()
+
+        if px.btnp(px.KEY_MINUS, hold=10, repeat=5):
+            self.fast_forward.slower()
+
         if px.btnp(px.KEY_SPACE):
             self.toggle_pause()
 
         if px.btnp(px.KEY_F, hold=10, repeat=5) and not self.active:
             self.w_garden.update()
 
+        if self.replay is None:
+            self.hud.update(self.w_garden.garden)
+        self.update_speed_label()
+
     def draw(self):
         px.cls(px.COLOR_BLACK)
-        px.rect(*(self.w_garden.position - Vec2(15, 15)).as_tuple,
-                *(Vec2(*self.w_garden.size) + Vec2(30, 45)).as_tuple, px.COLOR_NAVY)
-        px.rect(*(self.w_garden.position - Vec2(16, 14)).as_tuple,
-                *(Vec2(*self.w_garden.size) + Vec2(32, 43)).as_tuple, px.COLOR_NAVY)
+        for rect in self.__frame:
+            px.rect(*rect, px.COLOR_NAVY)
 
         if self.w_garden.garden.has_plants:
             px.circb(10, 7, 2, px.COLOR_RED)
@@ -122,18 +251,40 @@ class App:
             px.circ(20, 7, 2, px.COLOR_YELLOW)
             px.circb(30, 7, 2, px.COLOR_GREEN)
 
+        start = time.perf_counter()
         self.w_garden.draw(self.garden_draw_mode)
+        self.hud.record_draw(time.perf_counter() - start)
+
         self.l_mode.draw()
         self.l_help.draw()
         self.l_size.draw()
+        self.l_speed.draw()
+        self.hud.draw()
         self.larrow.draw(self.w_garden.position.x,
                          self.w_garden.position.y + self.w_garden.size[1] + 2)
         self.rarrow.draw(self.w_garden.position.x + self.w_garden.size[0] - 8,
                          self.w_garden.position.y + self.w_garden.size[1] + 2)
+        if self.replay is not None:
+            self.draw_timeline()
+
+    def draw_timeline(self):
+        x, y, width, height = self.__timeline
+        replay = self.replay
+        progress = (replay.steps - replay.first_step) / max(replay.last_step - replay.first_step, 1)
+
+        px.rect(x, y, width, height, px.COLOR_NAVY)
+        px.rect(x, y, round(progress * width), height, px.COLOR_GRAY)
+        px.rect(x + round(progress * (width - 1)), y - 2, 1, height + 4, px.COLOR_WHITE)
 
 
 def main():
-    app = App()
+    parser = argparse.ArgumentParser(description="GardenSim")
+    parser.add_argument("--replay", default=None,
+                        help="play back a delta log written by `python -m src.simulation run --deltas`")
+    args = parser.parse_args()
+
+    load_dotenv()
+    app = App(args.replay)
     app.run()
 
 
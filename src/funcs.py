@@ -1,4 +1,5 @@
 import random as rnd
+from typing import Callable
 
 from src.types import Number
 
@@ -10,11 +11,11 @@ def clamp(number: Number, min_val: Number, max_val: Number):
     return max(min(number, max_val), min_val)
 
 
-def decide(probability: float):
+def decide(probability: float, random: Callable[[], float] = rnd.random):
     if not 0.0 <= probability <= 1.0:
         raise ValueError("Required: 0.0 <= probability <= 1.0:")
 
-    return rnd.random() < probability
+    return random() < probability
 
 
 def linear_remap(value: Number,
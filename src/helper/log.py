@@ -0,0 +1,57 @@
+from typing import Any, Final, List, Tuple
+
+
+def _ignore(*args: Any, **kwargs: Any):
+    pass
+
+
+class LazyLogger:
+    """
+    Stands in for loguru's logger and imports loguru only once something is logged, so that importing the simulation
+    stays cheap. `disable` and `enable` are passed on once loguru is imported; while the whole `src` package is
+    disabled, log calls are dropped without importing it at all. Meant for modules within `src` only
+    """
+
+    __PACKAGE: Final = "src"
+    __LEVELS: Final = ("trace", "debug", "info", "success", "warning", "error", "critical", "exception", "log")
+
+    def __init__(self):
+        self.__logger = None
+        self.__quiet = False
+        # (name, enabled) calls waiting for loguru
+        self.__pending: List[Tuple[str, bool]] = []
+
+    def __loguru(self):
+        if self.__logger is None:
+            from loguru import logger
+
+            for name, enabled in self.__pending:
+                (logger.enable if enabled else logger.disable)(name)
+            self.__pending.clear()
+            self.__logger = logger
+
+        return self.__logger
+
+    def __toggle(self, name: str, enabled: bool):
+        if name == self.__PACKAGE:
+            self.__quiet = not enabled
+
+        if self.__logger is None:
+            self.__pending.append((name, enabled))
+        else:
+            (self.__logger.enable if enabled else self.__logger.disable)(name)
+
+    def disable(self, name: str):
+        self.__toggle(name, False)
+
+    def enable(self, name: str):
+        self.__toggle(name, True)
+
+    def __getattr__(self, name: str):
+        if self.__quiet and name in self.__LEVELS:
+            return _ignore
+
+        return getattr(self.__loguru(), name)
+
+
+logger: Final = LazyLogger()
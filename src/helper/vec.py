@@ -1,18 +1,27 @@
 import math
-from dataclasses import dataclass
+from operator import itemgetter
 from typing import Any
 
 from src.types import Number
 
 
-@dataclass(frozen=True)
-class Vec2:
-    x: Number
-    y: Number
+class Vec2(tuple):
+    """
+    Immutable 2D vector. A tuple underneath, so that building one is a single allocation
+    and it unpacks straight into drawing calls: `px.rect(*position, *size, color)`
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, x: Number, y: Number):
+        return tuple.__new__(cls, (x, y))
+
+    x = property(itemgetter(0))
+    y = property(itemgetter(1))
 
     @property
     def as_tuple(self):
-        return (self.x, self.y)
+        return self
 
     @staticmethod
     def __is_vector(other: Any):
@@ -21,36 +30,45 @@ class Vec2:
 
     @staticmethod
     def __is_scalar(other: Any):
-        if not isinstance(other, Number):
+        if not isinstance(other, (int, float)):
             raise TypeError(f"Required: type(scalar) = float | int; Got: {type(other) = }")
 
     def __add__(self, other: 'Vec2'):
-        self.__is_vector(other)
-        return Vec2(self.x + other.x, self.y + other.y)
+        if type(other) is not Vec2:
+            self.__is_vector(other)
+        return tuple.__new__(Vec2, (self[0] + other[0], self[1] + other[1]))
 
     def __sub__(self, other: 'Vec2'):
-        self.__is_vector(other)
-        return Vec2(self.x - other.x, self.y - other.y)
+        if type(other) is not Vec2:
+            self.__is_vector(other)
+        return tuple.__new__(Vec2, (self[0] - other[0], self[1] - other[1]))
 
     def __mul__(self, scalar: Number):
-        self.__is_scalar(scalar)
-        return Vec2(self.x * scalar, self.y * scalar)
+        if type(scalar) is not int and type(scalar) is not float:
+            self.__is_scalar(scalar)
+        return tuple.__new__(Vec2, (self[0] * scalar, self[1] * scalar))
 
     def __truediv__(self, scalar: Number):
-        self.__is_scalar(scalar)
-        return Vec2(self.x / scalar, self.y / scalar)
+        if type(scalar) is not int and type(scalar) is not float:
+            self.__is_scalar(scalar)
+        return tuple.__new__(Vec2, (self[0] / scalar, self[1] / scalar))
 
     def __rmul__(self, scalar: Number):
         return self.__mul__(scalar)
 
     def __neg__(self):
-        return Vec2(-self.x, -self.y)
+        return tuple.__new__(Vec2, (-self[0], -self[1]))
 
     def __eq__(self, other: Any):
         if not isinstance(other, Vec2):
             return False
 
-        return self.x == other.x and self.y == other.y
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other: Any):
+        return not self.__eq__(other)
+
+    __hash__ = tuple.__hash__
 
     def __str__(self):
         return f"{{{self.x}, {self.y}}}"
@@ -58,6 +76,9 @@ class Vec2:
     def __repr__(self):
         return f"Vec2({self.x}, {self.y})"
 
+    def __getnewargs__(self):
+        return tuple(self)
+
     @property
     def length(self):
         return math.sqrt(self.x ** 2 + self.y ** 2)
@@ -0,0 +1,283 @@
+import argparse
+import csv
+import dataclasses
+import os
+import sys
+from typing import TYPE_CHECKING
+
+from src.helper.log import logger
+
+if TYPE_CHECKING:
+    from src.simulation import headless
+
+
+def parse_size(value: str):
+    try:
+        width, height = map(int, value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Required: WIDTHxHEIGHT; Got: {value}")
+
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"Required: width > 0 and height > 0; Got: {value}")
+
+    return width, height
+
+
+def parse_metrics_path(value: str):
+    if os.path.splitext(value)[1].lower() not in (".csv", ".npz"):
+        raise argparse.ArgumentTypeError(f"Required: path ending in .csv or .npz; Got: {value}")
+
+    return value
+
+
+def parse_param(value: str, separator: str):
+    """NAME=VALUES of a GardenConfig field as (name, [values]), VALUES split at `separator`"""
+    from src.simulation.config import GardenConfig
+
+    name, _, values = value.partition("=")
+    types = GardenConfig.field_types()
+    if name not in types:
+        raise argparse.ArgumentTypeError(f"Required: NAME in ({', '.join(types)}); Got: {name}")
+
+    try:
+        return name, [types[name](item) for item in values.split(separator)]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Required: {types[name].__name__} values; Got: {value}")
+
+
+def parse_grid(value: str):
+    return parse_param(value, ",")
+
+
+def parse_range(value: str):
+    name, values = parse_param(value, ":")
+    if len(values) != 2 or values[0] > values[1]:
+        raise argparse.ArgumentTypeError(f"Required: NAME=LOW:HIGH with LOW <= HIGH; Got: {value}")
+
+    return name, tuple(values)
+
+
+def print_stats(stats: 'headless.RunStats', prefix: str = "step"):
+    print(f"{prefix} {stats.steps}: {stats.elapsed:.2f}s, {stats.steps_per_second:.1f} steps/sec"
+          f"{', extinct' if stats.extinct else ''}")
+
+
+def command_run(args: argparse.Namespace):
+    # imported here so that --help and argument errors do not pay for importing the simulation
+    from src.simulation import checkpoint, headless
+    from src.simulation.array_garden import ArrayGarden
+    from src.simulation.backends import BACKENDS
+    from src.simulation.events import BinaryFileSink, EventLevel, LoggerSink
+    from src.simulation.metrics import MetricsRecorder
+
+    if args.resume is not None:
+        garden = checkpoint.load(args.resume, args.backend)
+        print(f"resumed {args.resume} at step {garden.steps}")
+    else:
+        width, height = args.size
+        garden = BACKENDS[args.backend or "object"]((height, width), args.seed, args.chunk_width)
+
+    if args.strips:
+        if not isinstance(garden, ArrayGarden):
+            sys.exit("Required: --backend array for --strips")
+        garden.enable_parallel(args.strips, args.workers)
+
+    garden.events.configure(EventLevel[args.event_level.upper()])
+    if args.events is not None:
+        garden.events.add_sink(BinaryFileSink(args.events))
+    if args.verbose:
+        garden.events.add_sink(LoggerSink())
+    if args.metrics is not None:
+        garden.enable_metrics(MetricsRecorder(args.metrics_capacity, args.metrics_every))
+    if args.deltas is not None:
+        garden.enable_delta_log(args.deltas, args.keyframe_every)
+
+    def save(to_save):
+        checkpoint.save(to_save, args.checkpoint)
+
+    try:
+        stats = headless.run(garden, args.steps,
+                             stop_when_extinct=args.stop_when_extinct,
+                             report_every=args.report_every, report=print_stats,
+                             checkpoint_every=args.checkpoint_every if args.checkpoint else 0, checkpoint=save)
+
+        if args.checkpoint:
+            save(garden)
+    finally:
+        if isinstance(garden, ArrayGarden):
+            garden.disable_parallel()
+        garden.disable_delta_log()
+        garden.events.close()
+
+    if args.metrics is not None:
+        garden.metrics.save(args.metrics)
+    print_stats(stats, "finished after")
+
+
+def command_ensemble(args: argparse.Namespace):
+    from src.simulation.ensemble import GardenSummary, run_ensemble
+
+    width, height = args.size
+    writer = None
+    output = open(args.csv, "w", newline="") if args.csv else None
+
+    try:
+        if output is not None:
+            writer = csv.DictWriter(output, GardenSummary.field_names())
+            writer.writeheader()
+
+        summaries = []
+        for summary in run_ensemble((height, width), args.gardens, args.steps, args.seed, args.workers, args.backend,
+                                    not args.keep_running, quiet=not args.verbose):
+            summaries.append(summary)
+            print(f"garden {summary.index} (seed {summary.seed}): survived {summary.survival_time} steps, "
+                  f"peak {summary.peak_plants} plants, final stems/bulbs/seeds "
+                  f"{summary.stems}/{summary.bulbs}/{summary.seeds}, {summary.elapsed:.2f}s")
+
+            if writer is not None:
+                writer.writerow(dataclasses.asdict(summary))
+    finally:
+        if output is not None:
+            output.close()
+
+    if summaries:
+        survival = [summary.survival_time for summary in summaries]
+        print(f"{len(summaries)} gardens: survival min/mean/max "
+              f"{min(survival)}/{sum(survival) / len(survival):.1f}/{max(survival)}")
+
+
+def command_sweep(args: argparse.Namespace):
+    from src.simulation.config import default_config
+    from src.simulation.sweep import SweepResult, grid_points, random_points, run_sweep
+
+    if args.random:
+        points = random_points({**dict(args.grid), **dict(args.random)}, args.samples, args.seed)
+    else:
+        points = grid_points(dict(args.grid))
+
+    try:
+        for point in points:
+            default_config().replace(**point)
+    except ValueError as error:
+        sys.exit(str(error))
+    param_names = list(points[0]) if points else []
+
+    width, height = args.size
+    writer = None
+    output = open(args.csv, "w", newline="") if args.csv else None
+
+    try:
+        if output is not None:
+            writer = csv.DictWriter(output, SweepResult.field_names(param_names))
+            writer.writeheader()
+
+        results = []
+        for result in run_sweep(points, (height, width), args.steps, args.replicates, args.seed, args.workers,
+                                args.backend, args.plateau_window, args.plateau_every, args.plateau_tolerance,
+                                quiet=not args.verbose):
+            results.append(result)
+            print(f"point {result.point} (seed {result.seed}): stopped at step {result.steps} ({result.stop}), "
+                  f"survived {result.survival_time}, peak {result.peak_plants} plants, {result.elapsed:.2f}s")
+
+            if writer is not None:
+                writer.writerow(result.row())
+    finally:
+        if output is not None:
+            output.close()
+
+    # one line per point, longest surviving first
+    by_point = {}
+    for result in results:
+        by_point.setdefault(result.point, []).append(result)
+
+    for point, point_results in sorted(by_point.items(),
+                                       key=lambda item: -sum(result.survival_time for result in item[1])):
+        survival = sum(result.survival_time for result in point_results) / len(point_results)
+        extinct = sum(result.stop == "extinct" for result in point_results)
+        params = ", ".join(f"{name}={value}" for name, value in points[point].items())
+        print(f"{params or 'defaults'}: mean survival {survival:.1f}, extinct {extinct}/{len(point_results)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.simulation", description="Headless GardenSim")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p_run = subparsers.add_parser("run", help="simulate a single garden without rendering")
+    p_run.add_argument("--size", type=parse_size, default=(100, 70), help="garden size as WIDTHxHEIGHT")
+    p_run.add_argument("--backend", choices=("object", "array"), default=None,
+                       help="grid storage backend, object by default or the saved one when resuming")
+    p_run.add_argument("--chunk-width", type=int, default=None,
+                       help="store the garden in column chunks of this width, allocated only where there are cells")
+    p_run.add_argument("--strips", type=int, default=0,
+                       help="update the cells of an array garden in this many vertical strips in parallel")
+    p_run.add_argument("--workers", type=int, default=None, help="worker processes for --strips, all cores by default")
+    p_run.add_argument("--steps", type=int, default=1000, help="number of steps to simulate")
+    p_run.add_argument("--seed", type=int, default=None, help="garden seed, random by default")
+    p_run.add_argument("--report-every", type=int, default=0, help="print throughput every N steps")
+    p_run.add_argument("--resume", default=None, help="continue the garden saved in this checkpoint")
+    p_run.add_argument("--checkpoint", default=None, help="save the garden to this .npz file when finished")
+    p_run.add_argument("--checkpoint-every", type=int, default=0, help="also save the garden every N steps")
+    p_run.add_argument("--events", default=None, help="write simulation events to this binary file")
+    p_run.add_argument("--event-level", choices=("debug", "info"), default="info",
+                       help="debug also records mutations and seed landings")
+    p_run.add_argument("--metrics", type=parse_metrics_path, default=None,
+                       help="record population metrics and save them to this .csv or .npz file when finished")
+    p_run.add_argument("--metrics-every", type=int, default=1, help="record metrics every N steps")
+    p_run.add_argument("--metrics-capacity", type=int, default=65536,
+                       help="number of metric rows kept, older ones are overwritten")
+    p_run.add_argument("--deltas", default=None,
+                       help="log every tile change to this file, to be replayed with `python main.py --replay`")
+    p_run.add_argument("--keyframe-every", type=int, default=500,
+                       help="also log the whole grid every N steps, replays seek from the keyframe before a step")
+    p_run.add_argument("--stop-when-extinct", action="store_true", help="stop once no plants or seeds are left")
+    p_run.add_argument("--verbose", action="store_true", help="keep simulation logging enabled")
+    p_run.set_defaults(handler=command_run)
+
+    p_ensemble = subparsers.add_parser("ensemble", help="simulate many independent gardens in parallel")
+    p_ensemble.add_argument("--size", type=parse_size, default=(100, 70), help="garden size as WIDTHxHEIGHT")
+    p_ensemble.add_argument("--backend", choices=("object", "array"), default="object", help="grid storage backend")
+    p_ensemble.add_argument("--gardens", type=int, default=8, help="number of gardens")
+    p_ensemble.add_argument("--steps", type=int, default=1000, help="maximum number of steps per garden")
+    p_ensemble.add_argument("--workers", type=int, default=None, help="worker processes, all cores by default")
+    p_ensemble.add_argument("--seed", type=int, default=0, help="ensemble seed, garden seeds are derived from it")
+    p_ensemble.add_argument("--keep-running", action="store_true", help="do not stop gardens that went extinct")
+    p_ensemble.add_argument("--csv", default=None, help="also write the summaries to this CSV file")
+    p_ensemble.add_argument("--verbose", action="store_true", help="keep simulation logging enabled")
+    p_ensemble.set_defaults(handler=command_ensemble)
+
+    p_sweep = subparsers.add_parser("sweep", help="run gardens over a grid or a random sample of config values")
+    p_sweep.add_argument("--grid", type=parse_grid, action="append", default=[], metavar="NAME=V1,V2,...",
+                         help="values of a GardenConfig field, every combination is run")
+    p_sweep.add_argument("--random", type=parse_range, action="append", default=[], metavar="NAME=LOW:HIGH",
+                         help="range of a GardenConfig field; switches to --samples random points, "
+                              "--grid values are then chosen from")
+    p_sweep.add_argument("--samples", type=int, default=16, help="number of random points")
+    p_sweep.add_argument("--replicates", type=int, default=1, help="gardens per point, the same seeds for every point")
+    p_sweep.add_argument("--size", type=parse_size, default=(100, 70), help="garden size as WIDTHxHEIGHT")
+    p_sweep.add_argument("--backend", choices=("object", "array"), default="object", help="grid storage backend")
+    p_sweep.add_argument("--steps", type=int, default=5000, help="maximum number of steps per garden")
+    p_sweep.add_argument("--workers", type=int, default=None, help="worker processes, all cores by default")
+    p_sweep.add_argument("--seed", type=int, default=0, help="sweep seed, garden seeds and random points derive from it")
+    p_sweep.add_argument("--plateau-window", type=int, default=20,
+                         help="stop a garden once its population stayed flat for this many samples, 0 never stops")
+    p_sweep.add_argument("--plateau-every", type=int, default=50, help="steps between population samples")
+    p_sweep.add_argument("--plateau-tolerance", type=float, default=0.05,
+                         help="largest spread of plants and occupied tiles over the window, relative to their mean")
+    p_sweep.add_argument("--csv", default=None, help="also write the results to this CSV file")
+    p_sweep.add_argument("--verbose", action="store_true", help="keep simulation logging enabled")
+    p_sweep.set_defaults(handler=command_sweep)
+
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logger.disable("src")
+
+    # read by `default_config` when the first garden is created
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+from typing import Dict, Final, List, Tuple, Union
+
+import numpy as np
+from numpy import typing as npt
+
+from src.helper.log import logger
+from src.simulation.cell import Bulb, Stem, Seed, Cell
+from src.simulation.chunks import ChunkedLayer, gather, layer_from
+from src.simulation.config import GardenConfig
+from src.simulation.garden import BaseGarden
+from src.simulation.events import EventKind
+from src.simulation.genome import Genome
+from src.simulation.kinds import CellKind, EMPTY, STEM, BULB, SEED
+from src.simulation.plant import Plant
+from src.simulation.rng import RandomSeed
+from src.simulation.state import GardenState
+from src.simulation.strips import LAYERS, NO_GENOME, NO_SPRITE, StripPool, StripResult, StripTask
+from src.simulation.sprites import BLANK_SPRITE, STEM_SPRITES, BULB_SPRITES, SEED_SPRITE
+
+
+class ArrayGarden(BaseGarden):
+    """
+    Garden backend storing the grid as typed arrays instead of Cell instances.
+    Cells returned by `get_cell` are detached snapshots, cells passed to `place_cell` are copied into the arrays
+    """
+
+    __NO_GENOME = NO_GENOME
+    # (dx, dy) of the tiles a bulb grows into, in the order of its genes
+    __GROWTH: Final = tuple((delta.x, delta.y) for delta in Bulb.POS_DELTAS)
+
+    def _init_empty(self, size: Tuple[int, int], seed: RandomSeed, chunk_width: Union[int, None],
+                    config: Union[GardenConfig, None]):
+        super()._init_empty(size, seed, chunk_width, config)
+        self.__energy: Union[npt.NDArray[np.int32], ChunkedLayer] = self._new_layer(np.int32)
+        self.__genome_ids: Union[npt.NDArray[np.int32], ChunkedLayer] = self._new_layer(np.int32, self.__NO_GENOME)
+        self.__chromosomes: Union[npt.NDArray[np.uint8], ChunkedLayer] = self._new_layer(np.uint8)
+
+        self.__strip_pool: Union[StripPool, None] = None
+        self.__strips: List[Tuple[int, int]] = []
+
+    def __clear(self, x: int, y: int):
+        genome_id = int(self.__genome_ids[y, x])
+        if genome_id != self.__NO_GENOME:
+            self._genomes.release(genome_id)
+
+        self._set_tile(x, y, EMPTY, BLANK_SPRITE)
+        self.__energy[y, x] = 0
+        self.__genome_ids[y, x] = self.__NO_GENOME
+        self.__chromosomes[y, x] = 0
+
+    def __set(self, x: int, y: int, kind: CellKind, sprite: int,
+              plant_id: int = BaseGarden.NO_PLANT, energy: int = 0, genome_id: int = __NO_GENOME, chromosome: int = 0):
+        if genome_id != self.__NO_GENOME:
+            self._genomes.acquire(genome_id)
+
+        # empty tiles hold no energy, genome or chromosome, only occupied ones need clearing first
+        if self._kinds[y, x] != EMPTY:
+            self.__clear(x, y)
+
+        self._set_tile(x, y, kind, sprite, plant_id)
+        self.__energy[y, x] = energy
+        self.__genome_ids[y, x] = genome_id
+        self.__chromosomes[y, x] = chromosome
+
+    def place_cell(self, cell: Cell, x: int, y: int):
+        x = self._tile_x(x)
+        if self._kinds[y, x] != CellKind.EMPTY:
+            logger.error(f"Grid at ({y}, {x}) is not empty")
+
+        if type(cell) is Stem:
+            self.__set(x, y, CellKind.STEM, cell.sprite, self._plant_id_of(cell))
+        elif type(cell) is Bulb:
+            cell: Bulb
+            self.__set(x, y, CellKind.BULB, cell.sprite, self._plant_id_of(cell), cell.energy,
+                       self._genomes.intern(cell.genome.data), cell.genome.active_index)
+        elif type(cell) is Seed:
+            cell: Seed
+            self.__set(x, y, CellKind.SEED, cell.sprite, self.NO_PLANT, cell.energy,
+                       self._genomes.intern(cell.genome.data), cell.genome.active_index)
+        else:
+            raise TypeError(f"Required: type(cell) = Stem | Bulb | Seed; Got: {type(cell) = }")
+
+    def remove_cell(self, x: int, y: int):
+        x = self._tile_x(x)
+        if self._kinds[y, x] == CellKind.EMPTY:
+            logger.warning(f"Grid at ({y}, {x}) is already empty")
+
+        self.__clear(x, y)
+
+    def __genome_at(self, x: int, y: int):
+        return Genome(self._genomes.genes(int(self.__genome_ids[y, x])), int(self.__chromosomes[y, x]), shared=True)
+
+    def get_cell(self, x: int, y: int):
+        x = self._tile_x(x)
+        if not self.is_within(x, y):
+            return None
+
+        kind = self._kinds[y, x]
+        sprite = int(self._sprites[y, x])
+
+        if kind == CellKind.STEM:
+            return Stem(self.get_plant(x, y), self, sprite)
+        if kind == CellKind.BULB:
+            return Bulb(self.__genome_at(x, y), int(self.__energy[y, x]), self, self.get_plant(x, y), sprite)
+        if kind == CellKind.SEED:
+            return Seed(self.__genome_at(x, y), int(self.__energy[y, x]), self, sprite)
+
+        return None
+
+    def _tile_state(self):
+        energy, genome_index, chromosome, genomes = self._empty_tile_state()
+
+        genome_ids = np.asarray(self.__genome_ids)
+        has_genome = genome_ids != self.__NO_GENOME
+        used = np.unique(genome_ids[has_genome])
+        if len(used) == 0:
+            return energy, genome_index, chromosome, genomes
+
+        energy[has_genome] = np.asarray(self.__energy)[has_genome]
+        chromosome[has_genome] = np.asarray(self.__chromosomes)[has_genome]
+        genomes, inverse = self._unique_genomes(np.stack([self._genomes.genes(i) for i in used.tolist()]))
+        genome_index[has_genome] = inverse[np.searchsorted(used, genome_ids[has_genome])]
+
+        return energy, genome_index, chromosome, genomes
+
+    def _load_tiles(self, state: GardenState, genome_ids: npt.NDArray[np.int32]):
+        has_genome = state.genome_index != self.__NO_GENOME
+        pool_ids = np.full(state.genome_index.shape, self.__NO_GENOME, np.int32)
+        pool_ids[has_genome] = genome_ids[state.genome_index[has_genome]]
+
+        self.__energy = layer_from(state.energy, self._chunk_width, np.int32)
+        self.__genome_ids = layer_from(pool_ids, self._chunk_width, np.int32, self.__NO_GENOME)
+        self.__chromosomes = layer_from(state.chromosome, self._chunk_width, np.uint8)
+
+    def update_energy(self):
+        light = self.light
+
+        for x0, x1 in self.occupied_regions():
+            bulbs = self._kinds[:, x0:x1] == CellKind.BULB
+            if bulbs.any():
+                self.__energy[:, x0:x1] = self.__energy[:, x0:x1] + Bulb.ENERGY_GAIN * light[:, x0:x1] * bulbs
+
+        self._exchange_plant_energy()
+
+    def __grow_bulb(self, x: int, y: int, plant_id: int, genome_id: int, chromosome: int):
+        kinds = self._kinds
+        height, width = kinds.shape
+        genes = self._genomes.genes(genome_id)[chromosome].tolist()
+
+        for (dx, dy), (dna, active) in zip(self.__GROWTH, genes):
+            target_x, target_y = (x + dx) % width, y + dy
+            if not active or not 0 <= target_y < height or kinds[target_y, target_x] != EMPTY:
+                continue
+
+            self.__set(target_x, target_y, BULB, self._random.choice(BULB_SPRITES), plant_id, 1, genome_id, dna)
+
+        sprite = self._random.choice(STEM_SPRITES)
+        self._plants.get(plant_id).increase_capacity()
+        self.__set(x, y, STEM, sprite, plant_id)
+
+    def __update_seed(self, x: int, y: int, sprite: int, energy: int, genome_id: int, chromosome: int):
+        height = self._kinds.shape[0]
+        if y + 1 < height and self._kinds[y + 1, x] == EMPTY:
+            self.__set(x, y + 1, SEED, sprite, self.NO_PLANT, energy, genome_id, chromosome)
+            self.__clear(x, y)
+            return
+
+        if y + 1 == height and energy != 0:
+            plant_id = self.add_plant(Plant(energy, self._config))
+            self.__set(x, y, BULB, self._random.choice(BULB_SPRITES), plant_id, 0, genome_id, chromosome)
+            self._events.emit(EventKind.SEED_LANDING, plant_id, x, y, energy)
+            self._events.emit(EventKind.BIRTH, plant_id, x, y, energy)
+            return
+
+        self._events.emit(EventKind.SEED_LANDING, x=x, y=y, energy=energy)
+        self.__clear(x, y)
+
+    @property
+    def strips(self):
+        """[x0, x1) column ranges updated in parallel, empty unless parallel stepping is enabled"""
+        return list(self.__strips)
+
+    def enable_parallel(self, strips: int, workers: Union[int, None] = None):
+        """
+        Update cells in `strips` vertical strips of about equal width, spread over `workers` processes
+        (one per CPU by default) that share the grid. See `StripUpdate` for what a strip can change on its own.
+
+        Border conflicts are resolved after all strips are done: proposals to grow into a neighbouring strip are
+        applied in row-major order of the growing bulbs, and only to tiles that are still empty at that point.
+        Plants spanning several strips stay single plants, the growth every strip reports for them is summed.
+        Random draws of a strip come from a stream derived from the garden stream, the strip and the step, so
+        results depend on the number of strips but not on the number of workers or their timing
+        """
+        if self._chunk_width is not None:
+            raise ValueError(f"Required: dense storage; Got: chunk_width = {self._chunk_width}")
+
+        width = self._kinds.shape[1]
+        if not 1 <= strips <= width:
+            raise ValueError(f"Required: 1 <= strips <= {width}; Got: {strips}")
+
+        self.disable_parallel()
+
+        self.__strips = [(index * width // strips, (index + 1) * width // strips) for index in range(strips)]
+        self.__strip_pool = StripPool(dict(zip(LAYERS, self.__layers())), workers)
+        self.__set_layers(self.__strip_pool.layers[name] for name in LAYERS)
+
+    def disable_parallel(self):
+        if self.__strip_pool is None:
+            return
+
+        self.__set_layers(np.array(layer) for layer in self.__layers())
+        self.__strip_pool.close()
+        self.__strip_pool = None
+        self.__strips = []
+
+    def __layers(self):
+        return (self._kinds, self._sprites, self._plant_ids, self.__energy, self.__genome_ids, self.__chromosomes)
+
+    def __set_layers(self, layers):
+        (self._kinds, self._sprites, self._plant_ids,
+         self.__energy, self.__genome_ids, self.__chromosomes) = layers
+
+    def __strip_tasks(self):
+        seed = self._random.randbelow(2 ** 31)
+        growing = (self._kinds == CellKind.BULB) & (self.__energy >= self._config.energy_to_grow)
+
+        tasks = []
+        for index, (x0, x1) in enumerate(self.__strips):
+            genome_ids = np.unique(self.__genome_ids[:, x0:x1][growing[:, x0:x1]]).tolist()
+            genomes = {genome_id: self._genomes.genes(genome_id) for genome_id in genome_ids}
+            tasks.append(StripTask(index, x0, x1, (seed, index), genomes, self._config.energy_to_grow))
+
+        return tasks
+
+    def __merge_strips(self, results: List[StripResult]):
+        genome_refs: Dict[int, int] = {}
+
+        for result in results:
+            for y, x, kind, plant_id in result.touched:
+                self._tile_changed(x, y, kind, plant_id, int(self._kinds[y, x]), int(self._plant_ids[y, x]))
+
+            for plant_id, grown in result.grown.items():
+                plant = self._plants.get(plant_id)
+                for _ in range(grown):
+                    plant.increase_capacity()
+
+            for genome_id, delta in result.genome_refs.items():
+                genome_refs[genome_id] = genome_refs.get(genome_id, 0) + delta
+
+        for result in results:
+            for y, x, energy, sprite in result.landings:
+                if sprite == NO_SPRITE:
+                    self._events.emit(EventKind.SEED_LANDING, x=x, y=y, energy=energy)
+                    continue
+
+                plant_id = self.add_plant(Plant(energy, self._config))
+                self.__set(x, y, BULB, sprite, plant_id, 0,
+                           int(self.__genome_ids[y, x]), int(self.__chromosomes[y, x]))
+                self._events.emit(EventKind.SEED_LANDING, plant_id, x, y, energy)
+                self._events.emit(EventKind.BIRTH, plant_id, x, y, energy)
+
+        border = sorted((proposal for result in results for proposal in result.border),
+                        key=lambda proposal: (proposal[0], proposal[1]))
+        for _, _, x, y, sprite, plant_id, genome_id, chromosome in border:
+            if self._kinds[y, x] == EMPTY:
+                self.__set(x, y, BULB, sprite, plant_id, 1, genome_id, chromosome)
+
+        # applied last, so that no genome is released while a border proposal or a landing may still refer to it
+        for genome_id, delta in genome_refs.items():
+            if delta > 0:
+                self._genomes.acquire(genome_id, delta)
+            elif delta < 0:
+                self._genomes.release(genome_id, -delta)
+
+    def update_cells(self):
+        if self.__strip_pool is not None:
+            self.__merge_strips(self.__strip_pool.run(self.__strip_tasks()))
+            return
+
+        cells = self._updatable_snapshot()
+        if not cells:
+            return
+
+        # cells only grow and fall into empty tiles, so every cell of the snapshot still holds what it held when the
+        # pass started once its turn comes, and all of it can be read up front. Bulbs short of energy stay as they are
+        ys, xs = np.array(cells, np.intp).T
+        kinds = gather(self._kinds, ys, xs)
+        energy = gather(self.__energy, ys, xs)
+        changing = (kinds == SEED) | (energy >= self._config.energy_to_grow)
+        ys, xs = ys[changing], xs[changing]
+
+        for y, x, kind, cell_energy, sprite, plant_id, genome_id, chromosome in zip(
+                ys.tolist(), xs.tolist(), kinds[changing].tolist(), energy[changing].tolist(),
+                *(gather(layer, ys, xs).tolist()
+                  for layer in (self._sprites, self._plant_ids, self.__genome_ids, self.__chromosomes))):
+            if kind == BULB:
+                self.__grow_bulb(x, y, plant_id, genome_id, chromosome)
+            else:
+                self.__update_seed(x, y, sprite, cell_energy, genome_id, chromosome)
+
+    def update_dead_plants(self):
+        dead, cells = self._dead_plants()
+
+        for x, y in cells:
+            if self._kinds[y, x] != BULB or self.__energy[y, x] == 0:
+                self.__clear(x, y)
+                continue
+
+            genome_id = int(self.__genome_ids[y, x])
+            if self._random.decide(self._config.mutation_chance):
+                genome = Genome(self._genomes.genes(genome_id), shared=True)
+                self._mutate(genome)
+                genome_id = self._genomes.intern(genome.data, genome_id)
+                self._events.emit(EventKind.MUTATION, int(self._plant_ids[y, x]), x, y, self._config.mutation_rate)
+
+            self.__set(x, y, SEED, SEED_SPRITE, self.NO_PLANT, self._config.initial_energy, genome_id)
+
+        for plant_id in dead:
+            self._plants.remove(plant_id)
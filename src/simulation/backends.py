@@ -0,0 +1,9 @@
+from typing import Final, Dict, Type
+
+from src.simulation.array_garden import ArrayGarden
+from src.simulation.garden import BaseGarden, Garden
+
+BACKENDS: Final[Dict[str, Type[BaseGarden]]] = {
+    "object": Garden,
+    "array": ArrayGarden,
+}
@@ -1,24 +1,26 @@
-import os
-import random as rnd
 from abc import ABC, abstractmethod
-from typing import Final, TYPE_CHECKING
-
-from loguru import logger
+from typing import Final, TYPE_CHECKING, Union
 
+from src.helper.log import logger
 from src.helper.vec import Vec2
-from src.simulation import garden as gd
+from src.simulation.events import EventKind
 from src.simulation.genome import Genome
-from src.widgets.image import Image
+from src.simulation.kinds import CellKind
+from src.simulation.plant import Plant
+from src.simulation.rng import default_stream
+from src.simulation.sprites import BLANK_SPRITE, STEM_SPRITES, BULB_SPRITES, SEED_SPRITE
 
 if TYPE_CHECKING:
-    from src.simulation.garden import Garden, Plant
+    from src.simulation.garden import BaseGarden
 
 
 class Cell(ABC):
-    def __init__(self, garden: 'Garden' = None, plant: 'Plant' = None):
-        self._image = Image(4, 4, 0, 0, 0)
-        self._energy_consumption = 0
-        self._energy_gain = 0
+    KIND: CellKind = CellKind.EMPTY
+    ENERGY_CONSUMPTION: int = 0
+    ENERGY_GAIN: int = 0
+
+    def __init__(self, garden: 'BaseGarden' = None, plant: 'Plant' = None):
+        self._sprite = BLANK_SPRITE
         self._garden = garden
         self._plant = plant
 
@@ -37,11 +39,15 @@ class Cell(ABC):
         return self._plant
 
     @property
-    def image(self):
-        return self._image
+    def sprite(self):
+        return self._sprite
+
+    @property
+    def _random(self):
+        return default_stream if self._garden is None else self._garden.random
 
     @garden.setter
-    def garden(self, value: 'Garden'):
+    def garden(self, value: 'BaseGarden'):
         self._garden = value
 
     @plant.setter
@@ -62,56 +68,49 @@ class Cell(ABC):
 
 
 class Stem(Cell):
-    __IMAGES: Final = (
-        Image(4, 4, 4, 0, 0),
-        Image(4, 4, 8, 0, 0),
-        Image(4, 4, 12, 0, 0),
-        Image(4, 4, 0, 4, 0),
-        Image(4, 4, 4, 4, 0),
-        Image(4, 4, 8, 4, 0),
-        Image(4, 4, 12, 4, 0),
-    )
-
-    def __init__(self, plant: 'Plant' = None):
-        super().__init__(plant=plant)
-        self._image = rnd.choice(self.__IMAGES)
-        self._energy_consumption = 30
-        self._energy_gain = 10
+    KIND: Final = CellKind.STEM
+    ENERGY_CONSUMPTION: Final = 30
+    ENERGY_GAIN: Final = 10
+
+    __SPRITES: Final = STEM_SPRITES
+
+    def __init__(self, plant: 'Plant' = None, garden: 'BaseGarden' = None, sprite: Union[int, None] = None):
+        super().__init__(garden, plant)
+        self._sprite = self._random.choice(self.__SPRITES) if sprite is None else sprite
 
     def produce_energy(self, multiplier: int):
-        self.plant.add_energy(self._energy_gain * multiplier)
+        self.plant.add_energy(self.ENERGY_GAIN * multiplier)
 
     def consume_energy(self):
-        self.plant.take_energy(self._energy_consumption)
+        self.plant.take_energy(self.ENERGY_CONSUMPTION)
 
     def update(self, x: int, y: int):
         pass
 
 
 class Bulb(Cell):
-    __POS_DELTAS: Final = (Vec2(0, -1), Vec2(0, 1), Vec2(-1, 0), Vec2(1, 0))
-    __IMAGES: Final = (
-        Image(4, 4, 4, 8, 0),
-        Image(4, 4, 8, 8, 0),
-        Image(4, 4, 12, 8, 0)
-    )
+    KIND: Final = CellKind.BULB
+    ENERGY_CONSUMPTION: Final = 40
+    ENERGY_GAIN: Final = 2
+    POS_DELTAS: Final = (Vec2(0, -1), Vec2(0, 1), Vec2(-1, 0), Vec2(1, 0))
 
-    __ENERGY_TO_GROW: Final = int(os.getenv("BULB_ENERGY_TO_GROW"))
+    __SPRITES: Final = BULB_SPRITES
 
-    logger.info(f"Bulb: energy_to_grow: {__ENERGY_TO_GROW}")
-
-    def __init__(self, genome: Genome, energy: int = 0, garden: 'Garden' = None, plant: 'Plant' = None):
+    def __init__(self, genome: Genome, energy: int = 0, garden: 'BaseGarden' = None, plant: 'Plant' = None,
+                 sprite: Union[int, None] = None):
         super().__init__(garden, plant)
-        self._image = rnd.choice(self.__IMAGES)
-        self._energy_consumption = 40
-        self._energy_gain = 2
+        self._sprite = self._random.choice(self.__SPRITES) if sprite is None else sprite
 
         self.__genome = genome
         self.__energy = energy
 
-        for chromosome in self.__genome.chromosomes:
-            if chromosome.size != len(self.__POS_DELTAS):
-                logger.error(f"len(directions): {len(self.__POS_DELTAS)} != chromosome.size: {chromosome.size}")
+        if self.__genome.chromosome_length != len(self.POS_DELTAS):
+            logger.error(f"len(directions): {len(self.POS_DELTAS)} != "
+                         f"chromosome_length: {self.__genome.chromosome_length}")
+
+    @property
+    def genome(self):
+        return self.__genome
 
     @property
     def copy_of_genome(self):
@@ -122,38 +121,44 @@ class Bulb(Cell):
         return self.__energy
 
     def produce_energy(self, multiplier: int):
-        self.__energy += self._energy_gain * multiplier
+        self.__energy += self.ENERGY_GAIN * multiplier
 
     def consume_energy(self):
-        self.plant.take_energy(self._energy_consumption)
+        self.plant.take_energy(self.ENERGY_CONSUMPTION)
 
     def update(self, x: int, y: int):
-        if self.__energy < self.__ENERGY_TO_GROW:
+        if self.__energy < self.garden.config.energy_to_grow:
             return
 
-        for delta, dna in zip(self.__POS_DELTAS, self.__genome.chromosome.genes):
-            if not self.garden.is_available(x + delta.x, y + delta.y) or not dna.active:
+        for delta, (dna, active) in zip(self.POS_DELTAS, self.__genome.genes()):
+            if not self.garden.is_available(x + delta.x, y + delta.y) or not active:
                 continue
 
             bulb = Bulb(self.copy_of_genome, 1, self.garden, self.plant)
-            bulb.__genome.set_active_gene(dna.dna)
+            bulb.__genome.set_active_gene(dna)
 
             self.garden.place_cell(bulb, x + delta.x, y + delta.y)
 
-        stem = Stem(self.plant)
+        stem = Stem(self.plant, self.garden)
         self.plant.increase_capacity()
         self.garden.replace_cell(stem, x, y)
 
 
 class Seed(Cell):
-    __IMAGES: Final = Image(4, 4, 0, 8, 0)
+    KIND: Final = CellKind.SEED
 
-    def __init__(self, genome: Genome, energy: int, garden: 'Garden' = None):
+    __SPRITE: Final = SEED_SPRITE
+
+    def __init__(self, genome: Genome, energy: int, garden: 'BaseGarden' = None, sprite: Union[int, None] = None):
         super().__init__(garden)
-        self._image = self.__IMAGES
+        self._sprite = self.__SPRITE if sprite is None else sprite
         self.__genome = genome
         self.__energy = energy
 
+    @property
+    def genome(self):
+        return self.__genome
+
     @property
     def energy(self):
         return self.__energy
@@ -171,10 +176,13 @@ class Seed(Cell):
             return
 
         if not self.garden.is_within(x, y + 1) and self.energy != 0:
-            bulb = Bulb(self.__genome, 0, self.garden, gd.Plant(self.energy))
+            bulb = Bulb(self.__genome, 0, self.garden, Plant(self.energy, self.garden.config))
 
             self.garden.replace_cell(bulb, x, y)
-            self.garden.add_plant(bulb.plant)
+            plant_id = self.garden.add_plant(bulb.plant)
+            self.garden.events.emit(EventKind.SEED_LANDING, plant_id, x, y, self.energy)
+            self.garden.events.emit(EventKind.BIRTH, plant_id, x, y, self.energy)
             return
 
+        self.garden.events.emit(EventKind.SEED_LANDING, x=x, y=y, energy=self.energy)
         self.garden.remove_cell(x, y)
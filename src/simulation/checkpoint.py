@@ -0,0 +1,70 @@
+import json
+import os
+from dataclasses import fields
+from typing import Final, Union
+
+import numpy as np
+
+from src.helper.log import logger
+from src.simulation.backends import BACKENDS
+from src.simulation.garden import BaseGarden
+from src.simulation.state import GardenState
+
+FORMAT_VERSION: Final = 3
+
+# fields missing from files of older versions, with the value they had implicitly
+_DEFAULTS: Final = {"chunk_width": 0, "config": "null"}
+
+
+def backend_name(garden: BaseGarden):
+    for name, backend in BACKENDS.items():
+        if type(garden) is backend:
+            return name
+
+    raise TypeError(f"Required: type(garden) in BACKENDS; Got: {type(garden) = }")
+
+
+def save(garden: BaseGarden, path: Union[str, os.PathLike], compress: bool = False):
+    """
+    Write the whole garden to an .npz file.
+    The file is written next to `path` first and then moved over it, so an interrupted save keeps the old checkpoint
+    """
+    state = garden.state()
+
+    arrays = {field.name: getattr(state, field.name) for field in fields(GardenState)}
+    arrays["rng_state"] = np.array(json.dumps(state.rng_state))
+    arrays["config"] = np.array(json.dumps(state.config))
+    arrays["backend"] = np.array(backend_name(garden))
+    arrays["version"] = np.array(FORMAT_VERSION)
+
+    temporary = f"{os.fspath(path)}.tmp"
+    with open(temporary, "wb") as file:
+        (np.savez_compressed if compress else np.savez)(file, **arrays)
+    os.replace(temporary, path)
+
+    logger.info(f"Garden@{id(garden)} saved to {path} at step {state.steps}")
+
+
+def load(path: Union[str, os.PathLike], backend: Union[str, None] = None) -> BaseGarden:
+    """Garden saved by `save`, on the backend it was saved from unless another one is given"""
+    with np.load(path, allow_pickle=False) as data:
+        version = int(data["version"])
+        if not 1 <= version <= FORMAT_VERSION:
+            raise ValueError(f"Required: checkpoint version <= {FORMAT_VERSION}; Got: {version}")
+
+        backend = str(data["backend"]) if backend is None else backend
+        if backend not in BACKENDS:
+            raise ValueError(f"Required: backend in {tuple(BACKENDS)}; Got: {backend}")
+
+        values = {field.name: data[field.name] if field.name in data else _DEFAULTS[field.name]
+                  for field in fields(GardenState)}
+
+    values["steps"] = int(values["steps"])
+    values["next_plant_id"] = int(values["next_plant_id"])
+    values["chunk_width"] = int(values["chunk_width"])
+    values["rng_state"] = json.loads(str(values["rng_state"]))
+    values["config"] = json.loads(str(values["config"]))
+
+    garden = BACKENDS[backend].from_state(GardenState(**values))
+    logger.info(f"Garden@{id(garden)} loaded from {path} at step {garden.steps}")
+    return garden
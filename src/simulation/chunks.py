@@ -0,0 +1,221 @@
+from typing import Any, Dict, Tuple, Union
+
+import numpy as np
+from numpy import typing as npt
+
+
+class ChunkedLayer:
+    """
+    (height, width) array split into column chunks of `chunk_width`.
+    A chunk is allocated by the first write of a value other than `fill` and released once it holds only `fill` again.
+    Scalar [y, x] indexing and [:, x0:x1] slices within one chunk behave like on a numpy array,
+    slices are read-only views and are written back by assigning to the same slice
+    """
+
+    def __init__(self, shape: Tuple[int, int], chunk_width: int, dtype: npt.DTypeLike, fill: Any = 0):
+        if chunk_width <= 0:
+            raise ValueError("Required: chunk_width > 0")
+
+        self.__shape = shape
+        self.__chunk_width = chunk_width
+        self.__dtype = np.dtype(dtype)
+        self.__fill = None if self.__dtype == object else self.__dtype.type(fill)
+
+        self.__chunks: Dict[int, npt.NDArray] = {}
+        # number of values other than `fill` in every allocated chunk
+        self.__counts: Dict[int, int] = {}
+        self.__writeable = True
+
+    @property
+    def shape(self):
+        return self.__shape
+
+    @property
+    def size(self):
+        return self.__shape[0] * self.__shape[1]
+
+    @property
+    def ndim(self):
+        return 2
+
+    @property
+    def dtype(self):
+        return self.__dtype
+
+    @property
+    def chunk_width(self):
+        return self.__chunk_width
+
+    @property
+    def chunk_count(self):
+        return -(-self.__shape[1] // self.__chunk_width)
+
+    @property
+    def allocated(self):
+        """Indices of the allocated chunks in ascending order"""
+        return sorted(self.__chunks)
+
+    @property
+    def nbytes(self):
+        return sum(chunk.nbytes for chunk in self.__chunks.values())
+
+    def chunk_bounds(self, index: int):
+        """[x0, x1) columns of a chunk"""
+        return index * self.__chunk_width, min((index + 1) * self.__chunk_width, self.__shape[1])
+
+    def view(self):
+        """Read-only layer sharing the chunks of this one"""
+        view = ChunkedLayer.__new__(ChunkedLayer)
+        view.__dict__.update(self.__dict__)
+        view.__writeable = False
+        return view
+
+    def __count(self, chunk: npt.NDArray):
+        if self.__fill is None:
+            return int(np.count_nonzero(chunk != None))  # noqa: E711, elementwise comparison
+
+        return int(np.count_nonzero(chunk != self.__fill))
+
+    def __region(self, key: Tuple[slice, slice]):
+        rows, columns = key
+        if rows != slice(None) or columns.step not in (None, 1):
+            raise IndexError(f"Required: [:, x0:x1]; Got: {key}")
+
+        x0, x1, _ = columns.indices(self.__shape[1])
+        index = x0 // self.__chunk_width
+        chunk_x0, chunk_x1 = self.chunk_bounds(index)
+        if x1 > chunk_x1:
+            raise IndexError(f"Required: columns within one chunk; Got: {x0}:{x1}, chunk: {chunk_x0}:{chunk_x1}")
+
+        return index, x0 - chunk_x0, x1 - chunk_x0
+
+    def __getitem__(self, key):
+        y, x = key
+        if type(x) is slice:
+            index, x0, x1 = self.__region(key)
+            chunk = self.__chunks.get(index)
+            view = np.full((self.__shape[0], x1 - x0), self.__fill, self.__dtype) if chunk is None else chunk[:, x0:x1]
+            view.flags.writeable = False
+            return view
+
+        if not 0 <= x < self.__shape[1]:
+            raise IndexError(f"Required: 0 <= x < {self.__shape[1]}; Got: {x}")
+
+        index = x // self.__chunk_width
+        chunk = self.__chunks.get(index)
+        return self.__fill if chunk is None else chunk[y, x - index * self.__chunk_width]
+
+    def __setitem__(self, key, value):
+        if not self.__writeable:
+            raise ValueError("Layer is read-only")
+
+        y, x = key
+        if type(x) is slice:
+            self.__set_region(key, value)
+            return
+
+        if not 0 <= x < self.__shape[1]:
+            raise IndexError(f"Required: 0 <= x < {self.__shape[1]}; Got: {x}")
+
+        index = x // self.__chunk_width
+        fill = self.__fill
+        is_fill = value is None if fill is None else value == fill
+        chunk = self.__chunks.get(index)
+        if chunk is None:
+            if is_fill:
+                return
+            chunk = self.__allocate(index)
+
+        local_x = x - index * self.__chunk_width
+        previous = chunk[y, local_x]
+        chunk[y, local_x] = value
+
+        was_fill = previous is None if fill is None else previous == fill
+        if was_fill != is_fill:
+            count = self.__counts[index] + (1 if was_fill else -1)
+            self.__counts[index] = count
+            if count == 0:
+                self.__release(index)
+
+    def __set_region(self, key: Tuple[slice, slice], values: Union[npt.ArrayLike, Any]):
+        index, x0, x1 = self.__region(key)
+        chunk = self.__chunks.get(index)
+        if chunk is None:
+            chunk = self.__allocate(index)
+
+        chunk[:, x0:x1] = values
+        self.__counts[index] = self.__count(chunk)
+        if self.__counts[index] == 0:
+            self.__release(index)
+
+    def __allocate(self, index: int):
+        x0, x1 = self.chunk_bounds(index)
+        chunk = np.full((self.__shape[0], x1 - x0), self.__fill, self.__dtype)
+        self.__chunks[index] = chunk
+        self.__counts[index] = 0
+        return chunk
+
+    def __release(self, index: int):
+        del self.__chunks[index]
+        del self.__counts[index]
+
+    def __array__(self, dtype: npt.DTypeLike = None, copy: Union[bool, None] = None):
+        """Dense copy of the whole layer"""
+        dense = np.full(self.__shape, self.__fill, self.__dtype)
+        for index, chunk in self.__chunks.items():
+            x0, x1 = self.chunk_bounds(index)
+            dense[:, x0:x1] = chunk
+
+        return dense if dtype is None else dense.astype(dtype)
+
+    def load(self, dense: npt.NDArray):
+        """Replace the content with a dense (height, width) array, allocating only chunks that hold other values"""
+        if dense.shape != self.__shape:
+            raise ValueError(f"Required: dense.shape = {self.__shape}; Got: {dense.shape}")
+
+        self.__chunks.clear()
+        self.__counts.clear()
+        for index in range(self.chunk_count):
+            x0, x1 = self.chunk_bounds(index)
+            self[:, x0:x1] = dense[:, x0:x1]
+
+
+def new_layer(shape: Tuple[int, int], chunk_width: Union[int, None], dtype: npt.DTypeLike, fill: Any = 0):
+    """Dense numpy array, or a ChunkedLayer if `chunk_width` is given"""
+    if chunk_width is None:
+        return np.full(shape, fill, dtype)
+
+    return ChunkedLayer(shape, chunk_width, dtype, fill)
+
+
+def layer_from(dense: npt.NDArray, chunk_width: Union[int, None], dtype: npt.DTypeLike, fill: Any = 0):
+    """Copy of a dense array as a layer made by `new_layer`"""
+    if chunk_width is None:
+        return dense.astype(dtype)
+
+    layer = ChunkedLayer(dense.shape, chunk_width, dtype, fill)
+    layer.load(dense)
+    return layer
+
+
+def read_only(layer: Union[npt.NDArray, ChunkedLayer]):
+    view = layer.view()
+    if isinstance(view, np.ndarray):
+        view.flags.writeable = False
+
+    return view
+
+
+def gather(layer: Union[npt.NDArray, ChunkedLayer], ys: npt.NDArray, xs: npt.NDArray) -> npt.NDArray:
+    """Values of `layer` at the tiles (ys, xs), one fancy index per chunk for chunked layers"""
+    if isinstance(layer, np.ndarray):
+        return layer[ys, xs]
+
+    values = np.empty(len(ys), layer.dtype)
+    chunks = xs // layer.chunk_width
+    for index in np.unique(chunks).tolist():
+        x0, x1 = layer.chunk_bounds(index)
+        in_chunk = chunks == index
+        values[in_chunk] = layer[:, x0:x1][ys[in_chunk], xs[in_chunk] - x0]
+
+    return values
@@ -0,0 +1,83 @@
+import os
+from dataclasses import dataclass, fields, replace, asdict
+from functools import lru_cache
+from typing import Final, Mapping
+
+from src.helper.log import logger
+
+
+@dataclass(frozen=True)
+class GardenConfig:
+    """
+    Tunables of a single garden, so that gardens with different settings can run in the same process.
+    Gardens created without one use `default_config`
+    """
+
+    sun_level: int
+    density_factor: int
+    mutation_rate: int
+    mutation_chance: float
+    initial_energy: int
+    # energy a bulb needs to grow
+    energy_to_grow: int
+    # plant ages and energy capacity gained per grown bulb
+    max_age: int
+    energy_per_cell: int
+    # chance of a mutated gene to be active
+    gene_active_chance: float
+
+    def __post_init__(self):
+        for name in ("sun_level", "density_factor", "mutation_rate", "initial_energy", "energy_to_grow", "max_age",
+                     "energy_per_cell"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"Required: {name} >= 0; Got: {getattr(self, name)}")
+
+        for name in ("mutation_chance", "gene_active_chance"):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(f"Required: 0 <= {name} <= 1; Got: {getattr(self, name)}")
+
+    def replace(self, **changes):
+        """Copy with some of the fields changed"""
+        return replace(self, **changes)
+
+    def as_dict(self):
+        return asdict(self)
+
+    @staticmethod
+    def field_types():
+        """Type of every field by name"""
+        return {field.name: field.type for field in fields(GardenConfig)}
+
+    @staticmethod
+    def from_env(environ: Mapping[str, str] = os.environ):
+        """Config read from the variables in ENVIRONMENT"""
+        missing = [variable for variable in ENVIRONMENT.values() if variable not in environ]
+        if missing:
+            raise ValueError(f"Required: environment variables {', '.join(missing)}")
+
+        return GardenConfig(**{name: GardenConfig.field_types()[name](environ[variable])
+                               for name, variable in ENVIRONMENT.items()})
+
+
+# environment variable every field of the default config is read from
+ENVIRONMENT: Final = {
+    "sun_level": "GARDEN_SUN_LEVEL",
+    "density_factor": "GARDEN_DENSITY_FACTOR",
+    "mutation_rate": "GARDEN_MUTATION_RATE",
+    "mutation_chance": "GARDEN_MUTATION_CHANCE",
+    "initial_energy": "GARDEN_INITIAL_ENERGY",
+    "energy_to_grow": "BULB_ENERGY_TO_GROW",
+    "max_age": "PLANT_MAX_AGE",
+    "energy_per_cell": "PLANT_ENERGY_PER_CELL",
+    "gene_active_chance": "GENE_ACTIVE_CHANCE",
+}
+
+
+@lru_cache(maxsize=None)
+def default_config():
+    """Config read from the environment on first use"""
+    config = GardenConfig.from_env()
+    for name, value in config.as_dict().items():
+        logger.info(f"GardenConfig: {name}: {value}")
+
+    return config
@@ -0,0 +1,341 @@
+import json
+import os
+import struct
+import zlib
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Dict, Final, Hashable, List, Set, Tuple, Union
+
+import numpy as np
+
+from src.simulation.config import GardenConfig
+from src.simulation.kinds import CellKind
+from src.simulation.light import column_light
+from src.simulation.plant import PlantRegistry
+
+if TYPE_CHECKING:
+    from src.simulation.garden import BaseGarden
+
+# a tile change: the step it happened in and the new content of the tile
+DELTA_DTYPE: Final = np.dtype([
+    ("step", "<u4"),
+    ("x", "<u2"),
+    ("y", "<u2"),
+    ("kind", np.uint8),
+    ("sprite", np.uint8),
+    ("plant", "<i4"),
+])
+
+MAGIC: Final = b"GSDL\x01"
+
+# length of the JSON header following MAGIC
+_HEADER: Final = struct.Struct("<I")
+# b"K", step, length of the compressed kinds, sprites and plant ids
+_KEYFRAME: Final = struct.Struct("<cQI")
+# b"D", number of DELTA_DTYPE records, step of the first and of the last one
+_DELTAS: Final = struct.Struct("<cIQQ")
+
+
+class DeltaLog:
+    """
+    Binary log of every tile change of a garden, so that runs can be replayed without simulating them.
+    Changes are buffered and written in blocks of DELTA_DTYPE records, stamped with the step they happened in.
+    Blocks hold whole steps only, the buffer is written at the end of the step that fills it up to BUFFER changes,
+    so a log cut short ends on a complete step.
+    Every `keyframe_every` steps the whole grid is written compressed, a replay seeks by applying the changes
+    since the keyframe before the step it seeks to. Attach with `BaseGarden.enable_delta_log`
+    """
+
+    KEYFRAME_EVERY: Final = 500
+    BUFFER: Final = 65536
+
+    def __init__(self, path: Union[str, os.PathLike], garden: 'BaseGarden', keyframe_every: int = KEYFRAME_EVERY):
+        if keyframe_every <= 0:
+            raise ValueError("Required: keyframe_every > 0")
+
+        width, height = garden.size
+        limit = np.iinfo(np.uint16).max + 1
+        if width > limit or height > limit:
+            raise ValueError(f"Required: width and height <= {limit}; Got: {width}x{height}")
+
+        self.__file = open(path, "wb")
+        header = json.dumps({"size": [height, width], "keyframe_every": keyframe_every,
+                             "config": garden.config.as_dict()}).encode()
+        self.__file.write(MAGIC + _HEADER.pack(len(header)) + header)
+
+        self.__keyframe_every = keyframe_every
+        self.__deltas: List[Tuple[int, int, int, int, int, int]] = []
+        self.__keyframe_step = None
+        self.keyframe(garden)
+
+    @property
+    def keyframe_every(self):
+        return self.__keyframe_every
+
+    def tile_changed(self, step: int, x: int, y: int, kind: int, sprite: int, plant_id: int):
+        self.__deltas.append((step, x, y, kind, sprite, plant_id))
+
+    def end_step(self, garden: 'BaseGarden'):
+        """Called once the garden finished a step"""
+        if garden.steps % self.__keyframe_every == 0:
+            self.keyframe(garden)
+        elif len(self.__deltas) >= self.BUFFER:
+            self.flush()
+
+    def keyframe(self, garden: 'BaseGarden'):
+        """Write the whole grid as it is at the current step, unless that step has a keyframe already"""
+        if garden.steps == self.__keyframe_step:
+            return
+
+        self.flush()
+        grid = b"".join(np.asarray(layer, dtype).tobytes()
+                        for layer, dtype in ((garden.kinds, np.uint8), (garden.sprites, np.uint8),
+                                             (garden.plant_ids, "<i4")))
+        grid = zlib.compress(grid, 1)
+        self.__file.write(_KEYFRAME.pack(b"K", garden.steps, len(grid)) + grid)
+        self.__keyframe_step = garden.steps
+
+    def flush(self):
+        """Write the buffered changes, between steps only so that the block ends on a complete step"""
+        if not self.__deltas:
+            return
+
+        deltas = np.array(self.__deltas, DELTA_DTYPE)
+        self.__deltas.clear()
+        self.__file.write(_DELTAS.pack(b"D", len(deltas), int(deltas["step"][0]), int(deltas["step"][-1])))
+        deltas.tofile(self.__file)
+
+    def close(self):
+        self.flush()
+        self.__file.close()
+
+
+class Replay:
+    """
+    A garden as recorded by a DeltaLog, at any step of the run without simulating it.
+    Has the grid properties of a garden, so GardenWidget draws it like one; `update` moves one step forward.
+    A log cut short, by a crash for instance, replays up to its last complete block
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.__file = open(path, "rb")
+        magic = self.__file.read(len(MAGIC))
+        if magic != MAGIC:
+            self.__file.close()
+            raise ValueError(f"Required: delta log starting with {MAGIC!r}; Got: {magic!r}")
+
+        length, = _HEADER.unpack(self.__file.read(_HEADER.size))
+        header = json.loads(self.__file.read(length))
+        self.__config = GardenConfig(**header["config"])
+        self.__keyframe_every = header["keyframe_every"]
+        height, width = header["size"]
+
+        # (step, offset, length) of the keyframes and (first step, last step, offset, count) of the delta blocks
+        self.__keyframes: List[Tuple[int, int, int]] = []
+        self.__blocks: List[Tuple[int, int, int, int]] = []
+        self.__index(os.fstat(self.__file.fileno()).st_size)
+        if not self.__keyframes:
+            self.__file.close()
+            raise ValueError(f"Required: delta log with a keyframe; Got: none in {path}")
+
+        self.__keyframe_steps = [step for step, _, _ in self.__keyframes]
+        self.__block_lasts = [last for _, last, _, _ in self.__blocks]
+        self.__cached_block: Tuple[int, Union[np.ndarray, None]] = (-1, None)
+
+        self.__kinds = np.zeros((height, width), np.uint8)
+        self.__sprites = np.zeros((height, width), np.uint8)
+        self.__plant_ids = np.full((height, width), PlantRegistry.NO_PLANT, np.int32)
+        self.__light: Union[np.ndarray, None] = None
+        # changed tiles per consumer, see `BaseGarden.pop_dirty_tiles`. None after a seek that reloaded the grid
+        self.__dirty_tiles: Dict[Hashable, Union[Set[Tuple[int, int]], None]] = {}
+        self.__step: Union[int, None] = None
+        self.seek(self.first_step)
+
+    def __index(self, file_size: int):
+        offset = self.__file.tell()
+        while True:
+            tag = self.__file.read(1)
+            if tag == b"K" and offset + _KEYFRAME.size <= file_size:
+                self.__file.seek(offset)
+                _, step, length = _KEYFRAME.unpack(self.__file.read(_KEYFRAME.size))
+                end = offset + _KEYFRAME.size + length
+                if end > file_size:
+                    break
+                self.__keyframes.append((step, offset + _KEYFRAME.size, length))
+            elif tag == b"D" and offset + _DELTAS.size <= file_size:
+                self.__file.seek(offset)
+                _, count, first, last = _DELTAS.unpack(self.__file.read(_DELTAS.size))
+                end = offset + _DELTAS.size + count * DELTA_DTYPE.itemsize
+                if end > file_size:
+                    break
+                self.__blocks.append((first, last, offset + _DELTAS.size, count))
+            else:
+                break
+
+            offset = end
+            self.__file.seek(offset)
+
+    def close(self):
+        self.__file.close()
+
+    @property
+    def config(self):
+        """Config of the recorded garden"""
+        return self.__config
+
+    @property
+    def keyframe_every(self):
+        return self.__keyframe_every
+
+    @property
+    def first_step(self):
+        return self.__keyframe_steps[0]
+
+    @property
+    def last_step(self):
+        """Last step the log holds the whole grid of"""
+        last = self.__keyframe_steps[-1]
+        return max(last, self.__block_lasts[-1] + 1) if self.__blocks else last
+
+    @property
+    def steps(self):
+        """Step currently replayed"""
+        return self.__step
+
+    @property
+    def finished(self):
+        return self.__step == self.last_step
+
+    @property
+    def size(self):
+        height, width = self.__kinds.shape
+        return width, height
+
+    @property
+    def kinds(self):
+        return self.__read_only(self.__kinds)
+
+    @property
+    def sprites(self):
+        return self.__read_only(self.__sprites)
+
+    @property
+    def plant_ids(self):
+        return self.__read_only(self.__plant_ids)
+
+    @property
+    def light(self):
+        if self.__light is None:
+            self.__light = column_light(self.__kinds, self.__config.sun_level, self.__config.density_factor)
+            self.__light.flags.writeable = False
+
+        return self.__light
+
+    @property
+    def sun_level(self):
+        return self.__config.sun_level
+
+    @property
+    def density_factor(self):
+        return self.__config.density_factor
+
+    @property
+    def has_plants(self):
+        return bool((self.__plant_ids != PlantRegistry.NO_PLANT).any())
+
+    def cell_counts(self):
+        """Number of tiles of every CellKind"""
+        counts = np.bincount(self.__kinds.ravel(), minlength=len(CellKind))
+        return {kind: int(counts[kind]) for kind in CellKind}
+
+    def occupied_regions(self):
+        return [(0, self.__kinds.shape[1])]
+
+    def pop_dirty_tiles(self, consumer: Hashable):
+        """
+        (x, y) of tiles changed since the previous call of `consumer`.
+        None on its first call and after a seek that reloaded the whole grid
+        """
+        dirty = self.__dirty_tiles.get(consumer)
+        self.__dirty_tiles[consumer] = set()
+        return dirty
+
+    def untrack_dirty_tiles(self, consumer: Hashable):
+        self.__dirty_tiles.pop(consumer, None)
+
+    @staticmethod
+    def __read_only(layer: np.ndarray):
+        view = layer.view()
+        view.flags.writeable = False
+        return view
+
+    def update(self):
+        """Move one step forward, nothing once the last step is reached"""
+        if not self.finished:
+            self.seek(self.__step + 1)
+
+    def seek(self, step: int):
+        """Move to `step`, clamped to the recorded steps, from the current step or from the keyframe before it"""
+        step = min(max(step, self.first_step), self.last_step)
+        keyframe = bisect_right(self.__keyframe_steps, step) - 1
+
+        if self.__step is None or not self.__keyframe_steps[keyframe] <= self.__step <= step:
+            self.__load_keyframe(keyframe)
+
+        self.__apply(self.__deltas(self.__step, step))
+        self.__step = step
+
+    def __load_keyframe(self, index: int):
+        step, offset, length = self.__keyframes[index]
+        self.__file.seek(offset)
+        grid = zlib.decompress(self.__file.read(length))
+
+        tiles = self.__kinds.size
+        self.__kinds.flat = np.frombuffer(grid, np.uint8, tiles)
+        self.__sprites.flat = np.frombuffer(grid, np.uint8, tiles, tiles)
+        self.__plant_ids.flat = np.frombuffer(grid, "<i4", tiles, 2 * tiles)
+        self.__light = None
+        self.__dirty_tiles = dict.fromkeys(self.__dirty_tiles)
+        self.__step = step
+
+    def __block(self, index: int):
+        cached, records = self.__cached_block
+        if cached != index:
+            _, _, offset, count = self.__blocks[index]
+            self.__file.seek(offset)
+            records = np.fromfile(self.__file, DELTA_DTYPE, count)
+            self.__cached_block = (index, records)
+
+        return records
+
+    def __deltas(self, start: int, stop: int):
+        """Records stamped start <= step < stop, in the order they were written"""
+        parts = []
+        index = bisect_right(self.__block_lasts, start - 1)
+        while index < len(self.__blocks) and self.__blocks[index][0] < stop:
+            records = self.__block(index)
+            steps = records["step"]
+            parts.append(records[np.searchsorted(steps, start):np.searchsorted(steps, stop)])
+            index += 1
+
+        return np.concatenate(parts) if parts else np.zeros(0, DELTA_DTYPE)
+
+    def __apply(self, records: np.ndarray):
+        if len(records) == 0:
+            return
+
+        height, width = self.__kinds.shape
+        tiles = records["y"].astype(np.int64) * width + records["x"]
+        # a tile may change several times, its last change is its content
+        last = len(tiles) - 1 - np.unique(tiles[::-1], return_index=True)[1]
+        records = records[last]
+        x, y = records["x"], records["y"]
+
+        self.__kinds[y, x] = records["kind"]
+        self.__sprites[y, x] = records["sprite"]
+        self.__plant_ids[y, x] = records["plant"]
+        self.__light = None
+
+        tiles = list(zip(x.tolist(), y.tolist()))
+        for dirty in self.__dirty_tiles.values():
+            if dirty is not None:
+                dirty.update(tiles)
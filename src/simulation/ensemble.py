@@ -0,0 +1,94 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from typing import Tuple, List, Union
+
+import numpy as np
+
+from src.helper.log import logger
+from src.simulation.backends import BACKENDS
+from src.simulation.kinds import CellKind
+
+
+@dataclass(frozen=True)
+class GardenSpec:
+    index: int
+    seed: int
+    size: Tuple[int, int]
+    steps: int
+    backend: str = "object"
+    stop_when_extinct: bool = True
+
+
+@dataclass(frozen=True)
+class GardenSummary:
+    index: int
+    seed: int
+    # steps actually simulated, fewer than the `max_steps` asked for when the garden went extinct first
+    steps: int
+    max_steps: int
+    survival_time: int
+    peak_plants: int
+    plants: int
+    stems: int
+    bulbs: int
+    seeds: int
+    elapsed: float
+
+    @staticmethod
+    def field_names():
+        return [field.name for field in fields(GardenSummary)]
+
+
+def spawn_seeds(seed: int, count: int):
+    """Independent, reproducible seeds for `count` gardens derived from one ensemble seed"""
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(count)]
+
+
+def run_garden(spec: GardenSpec):
+    start = time.perf_counter()
+    garden = BACKENDS[spec.backend](spec.size, spec.seed)
+    survival_time = 0
+    peak_plants = 0
+
+    for step in range(1, spec.steps + 1):
+        if spec.stop_when_extinct and garden.is_extinct:
+            break
+
+        garden.update()
+
+        peak_plants = max(peak_plants, len(garden.plants))
+        if not garden.is_extinct:
+            survival_time = step
+
+    counts = garden.cell_counts()
+    return GardenSummary(spec.index, spec.seed, garden.steps, spec.steps, survival_time, peak_plants,
+                         len(garden.plants), counts[CellKind.STEM], counts[CellKind.BULB], counts[CellKind.SEED],
+                         time.perf_counter() - start)
+
+
+def init_worker(quiet: bool):
+    """Initializer of the worker processes of ensembles and sweeps, `quiet` silences the simulation's logs"""
+    if quiet:
+        logger.disable("src")
+
+
+def run_ensemble(size: Tuple[int, int], count: int, steps: int, seed: int = 0,
+                 workers: Union[int, None] = None, backend: str = "object", stop_when_extinct: bool = True,
+                 quiet: bool = True):
+    """
+    Run `count` independent gardens in a process pool.
+    Summaries are yielded as soon as each garden finishes, in completion order
+    """
+    if count < 0:
+        raise ValueError("Required: count >= 0")
+    if backend not in BACKENDS:
+        raise ValueError(f"Required: backend in {tuple(BACKENDS)}; Got: {backend}")
+
+    specs: List[GardenSpec] = [GardenSpec(index, garden_seed, size, steps, backend, stop_when_extinct)
+                               for index, garden_seed in enumerate(spawn_seeds(seed, count))]
+
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(quiet,)) as executor:
+        futures = [executor.submit(run_garden, spec) for spec in specs]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from typing import Final, List, Sequence, Tuple, Union
+
+import numpy as np
+from numpy import typing as npt
+
+from src.simulation.backends import BACKENDS
+from src.simulation.config import GardenConfig, default_config
+from src.simulation.garden import BaseGarden
+from src.simulation.rng import RandomSeed
+
+
+@dataclass(frozen=True)
+class Observation:
+    """Grids of K gardens stacked along the first axis, arrays of its own that later steps do not change"""
+
+    # (K,) steps done by every garden and whether it is extinct
+    steps: npt.NDArray[np.int64]
+    extinct: npt.NDArray[np.bool_]
+    # (K, height, width) CellKind and light of every tile
+    kinds: npt.NDArray[np.uint8]
+    light: npt.NDArray[np.uint8]
+    # (K, height, width) id of the plant of every tile, NO_PLANT for tiles without one
+    plant_ids: npt.NDArray[np.int32]
+
+
+class GardenEnv:
+    """
+    K gardens of the same size and config advanced together, observed as stacked arrays copied straight from the
+    grid layers of the gardens, without a Python object per tile
+    """
+
+    NO_PLANT: Final = BaseGarden.NO_PLANT
+
+    def __init__(self, size: Tuple[int, int], backend: str = "object", config: Union[GardenConfig, None] = None,
+                 chunk_width: Union[int, None] = None):
+        """`size` - (height, width) of every garden"""
+        if backend not in BACKENDS:
+            raise ValueError(f"Required: backend in {tuple(BACKENDS)}; Got: {backend}")
+
+        self.__config = default_config() if config is None else config
+        limit = np.iinfo(np.uint8).max
+        if self.__config.sun_level > limit:
+            raise ValueError(f"Required: sun_level <= {limit} for uint8 light; Got: {self.__config.sun_level}")
+
+        self.__size = size
+        self.__backend = backend
+        self.__chunk_width = chunk_width
+        self.__gardens: List[BaseGarden] = []
+
+    @property
+    def gardens(self):
+        """Gardens of the last `reset`"""
+        return tuple(self.__gardens)
+
+    def __len__(self):
+        return len(self.__gardens)
+
+    def reset(self, seeds: Sequence[RandomSeed]):
+        """
+        Replace the gardens with a new one for every seed, see `ensemble.spawn_seeds`.
+        Returns the observation of the new gardens
+        """
+        self.__gardens = [BACKENDS[self.__backend](self.__size, seed, self.__chunk_width, self.__config)
+                          for seed in seeds]
+        return self.observe()
+
+    def step(self, steps: int = 1):
+        """Advance every garden by `steps` steps, extinct ones included. Returns the observation after them"""
+        if steps < 0:
+            raise ValueError("Required: steps >= 0")
+
+        for garden in self.__gardens:
+            for _ in range(steps):
+                garden.update()
+
+        return self.observe()
+
+    def stream(self, steps: int, every: int = 1):
+        """Observations every `every` steps, then after the last of `steps` steps if that one is not a multiple"""
+        if steps < 0 or every <= 0:
+            raise ValueError("Required: steps >= 0 and every > 0")
+
+        for done in range(0, steps, every):
+            yield self.step(min(every, steps - done))
+
+    def observe(self):
+        count = len(self.__gardens)
+        kinds = np.empty((count, *self.__size), np.uint8)
+        light = np.empty((count, *self.__size), np.uint8)
+        plant_ids = np.empty((count, *self.__size), np.int32)
+
+        for index, garden in enumerate(self.__gardens):
+            kinds[index] = np.asarray(garden.kinds)
+            light[index] = np.asarray(garden.light)
+            plant_ids[index] = np.asarray(garden.plant_ids)
+
+        return Observation(np.fromiter((garden.steps for garden in self.__gardens), np.int64, count),
+                           np.fromiter((garden.is_extinct for garden in self.__gardens), np.bool_, count),
+                           kinds, light, plant_ids)
@@ -0,0 +1,197 @@
+import os
+from enum import IntEnum
+from typing import Dict, Final, List, Protocol, Union
+
+import numpy as np
+from numpy import typing as npt
+
+from src.helper.log import logger
+
+
+class EventKind(IntEnum):
+    BIRTH = 0
+    DEATH = 1
+    MUTATION = 2
+    SEED_LANDING = 3
+
+
+class EventLevel(IntEnum):
+    DEBUG = 10
+    INFO = 20
+
+
+KIND_LEVELS: Final = {
+    EventKind.BIRTH: EventLevel.INFO,
+    EventKind.DEATH: EventLevel.INFO,
+    EventKind.MUTATION: EventLevel.DEBUG,
+    EventKind.SEED_LANDING: EventLevel.DEBUG,
+}
+
+# x and y are -1 for events not tied to a tile, plant is 0 for events without a plant.
+# birth: energy of the new plant; death: energy and age of the plant; mutation: the parent plant and the number of
+# mutations in `energy`; seed landing: the plant it grew into, if any, and the energy of the seed
+EVENT_DTYPE: Final = np.dtype([
+    ("step", np.int64),
+    ("kind", np.uint8),
+    ("plant", np.int32),
+    ("x", np.int32),
+    ("y", np.int32),
+    ("energy", np.int64),
+    ("age", np.int32),
+])
+
+
+class EventSink(Protocol):
+    def write(self, events: npt.NDArray) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class EventStream:
+    """
+    Simulation events kept in a fixed size ring buffer of EVENT_DTYPE records.
+    Events below `level` or skipped by sampling are dropped before anything is stored or formatted.
+    Sinks receive every stored event in chunks, at the latest before the ring would overwrite it
+    """
+
+    CAPACITY: Final = 4096
+
+    def __init__(self, capacity: int = CAPACITY, level: EventLevel = EventLevel.DEBUG,
+                 sample: Union[Dict[EventKind, int], None] = None):
+        if capacity <= 0:
+            raise ValueError("Required: capacity > 0")
+
+        self.__buffer = np.zeros(capacity, EVENT_DTYPE)
+        self.__head = 0
+        self.__flushed = 0
+        self.__step = 0
+        self.__sinks: List[EventSink] = []
+
+        # keep every n-th event of a kind, 0 drops the kind
+        self.__rates = [1] * len(EventKind)
+        self.__counters = [0] * len(EventKind)
+        self.configure(level, sample)
+
+    @property
+    def capacity(self):
+        return len(self.__buffer)
+
+    @property
+    def emitted(self):
+        """Number of events stored since the stream was created"""
+        return self.__head
+
+    def configure(self, level: EventLevel = EventLevel.DEBUG, sample: Union[Dict[EventKind, int], None] = None):
+        """Keep kinds at or above `level`, and only every n-th event of the kinds in `sample`"""
+        sample = {} if sample is None else sample
+        for kind in EventKind:
+            rate = sample.get(kind, 1)
+            if rate < 0:
+                raise ValueError(f"Required: sample rate >= 0; Got: {kind.name}: {rate}")
+
+            self.__rates[kind] = rate if KIND_LEVELS[kind] >= level else 0
+            self.__counters[kind] = 0
+
+    def add_sink(self, sink: EventSink):
+        """Sinks added late receive the events the ring still holds, older ones are gone"""
+        self.__flushed = max(self.__flushed, self.__head - len(self.__buffer))
+        self.__sinks.append(sink)
+
+    def remove_sink(self, sink: EventSink):
+        self.flush()
+        self.__sinks.remove(sink)
+
+    def set_step(self, step: int):
+        self.__step = step
+
+    def emit(self, kind: EventKind, plant: int = 0, x: int = -1, y: int = -1, energy: int = 0, age: int = 0):
+        rate = self.__rates[kind]
+        if rate == 0:
+            return
+        if rate != 1:
+            self.__counters[kind] += 1
+            if self.__counters[kind] % rate:
+                return
+
+        if self.__sinks and self.__head - self.__flushed >= len(self.__buffer):
+            self.flush()
+
+        self.__buffer[self.__head % len(self.__buffer)] = (self.__step, kind, plant, x, y, energy, age)
+        self.__head += 1
+
+    def __since(self, start: int):
+        """Events from the `start`-th on, oldest first; they must still be in the ring"""
+        first, last = start % len(self.__buffer), self.__head % len(self.__buffer)
+        if self.__head - start == 0:
+            return self.__buffer[:0].copy()
+        if first < last:
+            return self.__buffer[first:last].copy()
+
+        return np.concatenate((self.__buffer[first:], self.__buffer[:last]))
+
+    def recent(self, count: Union[int, None] = None):
+        """Copy of the last `count` stored events, all the ring holds by default, oldest first"""
+        available = min(self.__head, len(self.__buffer))
+        count = available if count is None else min(count, available)
+        return self.__since(self.__head - count)
+
+    def flush(self):
+        if self.__head == self.__flushed:
+            return
+
+        events = self.__since(self.__flushed)
+        for sink in self.__sinks:
+            sink.write(events)
+        self.__flushed = self.__head
+
+    def close(self):
+        self.flush()
+        for sink in self.__sinks:
+            sink.close()
+        self.__sinks.clear()
+
+
+class BinaryFileSink:
+    """Appends raw EVENT_DTYPE records to a file, read them back with `read_events`"""
+
+    MAGIC: Final = b"GSEV\x01"
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.__file = open(path, "wb")
+        self.__file.write(self.MAGIC)
+
+    def write(self, events: npt.NDArray):
+        events.tofile(self.__file)
+
+    def close(self):
+        self.__file.close()
+
+
+def read_events(path: Union[str, os.PathLike]):
+    with open(path, "rb") as file:
+        magic = file.read(len(BinaryFileSink.MAGIC))
+        if magic != BinaryFileSink.MAGIC:
+            raise ValueError(f"Required: event file starting with {BinaryFileSink.MAGIC!r}; Got: {magic!r}")
+
+        return np.fromfile(file, EVENT_DTYPE)
+
+
+class LoggerSink:
+    """Formats events as log lines, only the events that reach the sink are ever formatted"""
+
+    def write(self, events: npt.NDArray):
+        for step, kind, plant, x, y, energy, age in events.tolist():
+            kind = EventKind(kind)
+            if kind == EventKind.BIRTH:
+                logger.info("step {}: plant #{} born at ({}, {}). energy: {}", step, plant, x, y, energy)
+            elif kind == EventKind.DEATH:
+                logger.info("step {}: plant #{} is dead. age: {}, energy: {}", step, plant, age, energy)
+            elif kind == EventKind.MUTATION:
+                logger.debug("step {}: seed of plant #{} at ({}, {}) mutated {} times", step, plant, x, y, energy)
+            else:
+                logger.debug("step {}: seed landed at ({}, {}). plant: #{}, energy: {}", step, x, y, plant, energy)
+
+    def close(self):
+        pass
@@ -0,0 +1,88 @@
+import time
+from typing import Final
+
+from src.simulation.garden import BaseGarden
+
+
+class FastForward:
+    """
+    Advances a garden by `speed` steps per frame, as far as a time budget per frame allows.
+    When steps get slower than the budget, fewer steps run per frame, so frames keep coming at the same rate
+    """
+
+    SPEEDS: Final = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+    # weight of the newest frame in the displayed steps per second
+    __SMOOTHING: Final = 0.1
+
+    def __init__(self, budget: float, speed: int = 1):
+        """`budget` - seconds of every frame that may be spent on simulation"""
+        if budget <= 0:
+            raise ValueError("Required: budget > 0")
+        if speed not in self.SPEEDS:
+            raise ValueError(f"Required: speed in {self.SPEEDS}; Got: {speed}")
+
+        self.__budget = budget
+        self.__speed_index = self.SPEEDS.index(speed)
+        self.__steps = 0
+        self.__steps_per_second = 0.0
+        self.__last_frame = None
+
+    @property
+    def speed(self):
+        """Target number of steps per frame"""
+        return self.SPEEDS[self.__speed_index]
+
+    @property
+    def steps(self):
+        """Number of steps done in the last frame"""
+        return self.__steps
+
+    @property
+    def limited(self):
+        """Whether the budget cut the last frame short of `speed` steps"""
+        return 0 < self.__steps < self.speed
+
+    @property
+    def steps_per_second(self):
+        return self.__steps_per_second
+
+    def faster(self):
+        self.__speed_index = min(self.__speed_index + 1, len(self.SPEEDS) - 1)
+
+    def slower(self):
+        self.__speed_index = max(self.__speed_index - 1, 0)
+
+    def advance(self, garden: BaseGarden):
+        """Run the steps of one frame, at least one of them. Returns the number of steps done"""
+        start = time.perf_counter()
+        deadline = start + self.__budget
+        self.__measure(start)
+
+        steps = 0
+        while steps < self.speed:
+            garden.update()
+            steps += 1
+
+            if time.perf_counter() >= deadline:
+                break
+
+        self.__steps = steps
+        return steps
+
+    def pause(self):
+        """Call while no frames are advanced, so that the pause does not count as a slow frame"""
+        self.__steps = 0
+        self.__steps_per_second = 0.0
+        self.__last_frame = None
+
+    def __measure(self, now: float):
+        """Steps of the previous frame per second of wall time until this one, drawing included"""
+        if self.__last_frame is not None and now > self.__last_frame:
+            rate = self.__steps / (now - self.__last_frame)
+            if self.__steps_per_second == 0:
+                self.__steps_per_second = rate
+            else:
+                self.__steps_per_second += (rate - self.__steps_per_second) * self.__SMOOTHING
+
+        self.__last_frame = now
@@ -1,280 +1,639 @@
-import math
 import os
-from typing import Final, Tuple, Union
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Final, Hashable, Tuple, Union, Set
 
 import numpy as np
-import pyxel as px
-from loguru import logger
 from numpy import typing as npt
 
-from src.funcs import clamp, linear_remap, decide
-from src.helper.vec import Vec2
+from src.helper.log import logger
 from src.simulation.cell import Bulb, Stem, Seed, Cell
+from src.simulation.config import GardenConfig, default_config
+from src.simulation.chunks import ChunkedLayer, new_layer, layer_from, read_only
+from src.simulation.delta_log import DeltaLog
+from src.simulation.events import EventKind, EventStream
 from src.simulation.genome import Genome
+from src.simulation.genome_pool import GenomePool
+from src.simulation.kinds import CellKind, EMPTY, BULB, SEED
+from src.simulation.light import column_light
+from src.simulation.metrics import MetricsRecorder
+from src.simulation.plant import Plant, PlantRegistry
+from src.simulation.profiling import StepProfile
+from src.simulation.rng import RandomStream, RandomSeed
+from src.simulation.sprites import BLANK_SPRITE
+from src.simulation.state import GardenState
+
+
+class BaseGarden(ABC):
+    _GENOME_SIZE: Final = 16
+    _CHROMOSOME_LENGTH: Final = 4
+
+    __UPDATABLE: Final = (BULB, SEED)
+    __HAS_PLANT: Final = (CellKind.BULB, CellKind.STEM)
+
+    NO_PLANT: Final = PlantRegistry.NO_PLANT
+
+    UPDATE_PHASES: Final = ("update_energy", "update_cells", "update_plants_age", "update_dead_plants")
+
+    def __init__(self, size: Tuple[int, int], seed: RandomSeed = None, chunk_width: Union[int, None] = None,
+                 config: Union[GardenConfig, None] = None):
+        """
+        With `chunk_width` the grid is stored in column chunks of that width, allocated only once they hold cells,
+        and update passes skip empty chunks. Meant for very wide gardens with little life in them.
+        `config` - tunables of this garden, `default_config` by default
+        """
+        self._init_empty(size, seed, chunk_width, config)
+        self._place_initial_seed()
+
+    def _init_empty(self, size: Tuple[int, int], seed: RandomSeed, chunk_width: Union[int, None],
+                    config: Union[GardenConfig, None]):
+        """Set up an empty garden without the initial seed, `from_state` fills it in from the state"""
+        self._config = default_config() if config is None else config
+        self._random = RandomStream(seed)
+        self._chunk_width = chunk_width
+        self._region_width = size[1] if chunk_width is None else chunk_width
+
+        self._kinds: Union[npt.NDArray[np.uint8], ChunkedLayer] = new_layer(size, chunk_width, np.uint8)
+        self._sprites: Union[npt.NDArray[np.uint8], ChunkedLayer] = self._new_layer(np.uint8)
+        self._plant_ids: Union[npt.NDArray[np.int32], ChunkedLayer] = self._new_layer(np.int32, self.NO_PLANT)
+        self._plants = PlantRegistry()
+        self._genomes = GenomePool()
+        self._light: Union[npt.NDArray[np.int32], ChunkedLayer] = self._new_layer(np.int32)
+        # regions whose light is out of date, see `occupied_regions`
+        self._stale_light: Set[int] = set()
+        # (x, y) of the tiles changed since the last `pop_dirty_tiles` call of every consumer
+        self._dirty_tiles: Dict[Hashable, Set[Tuple[int, int]]] = {}
+        self._updatable: Set[Tuple[int, int]] = set()
+        # tiles of every CellKind, kept up to date by `_tile_changed`
+        self._kind_counts = [0] * len(CellKind)
+        self._kind_counts[EMPTY] = self._kinds.size
+        # energy of the plants and number of living plants of every age, tallied by `update_plants_age`
+        self._plant_energy = 0
+        self._age_counts = [0] * (self._config.max_age + 2)
+        self._steps = 0
+        self._profile: Union[StepProfile, None] = None
+        self._metrics: Union[MetricsRecorder, None] = None
+        self._delta_log: Union[DeltaLog, None] = None
+        self._events = EventStream()
+
+    def _new_layer(self, dtype: npt.DTypeLike, fill=0):
+        """Grid sized layer in the storage mode of the garden"""
+        return new_layer(self._kinds.shape, self._chunk_width, dtype, fill)
+
+    def _place_initial_seed(self):
+        mid_y, mid_x = map(lambda i: i // 2, self._kinds.shape)
+        initial_seed = Seed(Genome.random(self._GENOME_SIZE, self._CHROMOSOME_LENGTH, self._random,
+                                          self._config.gene_active_chance),
+                            self._config.initial_energy, self)
+
+        self.place_cell(initial_seed, mid_x, mid_y)
+
+        logger.info(f"{self.__class__.__qualname__}@{id(self)} created. size: {self._kinds.shape}, "
+                    f"genome: {self._GENOME_SIZE}x{self._CHROMOSOME_LENGTH}")
 
+    @property
+    def config(self):
+        return self._config
 
-class Plant:
-    __MAX_AGE: Final = int(os.getenv("PLANT_MAX_AGE"))
-    __ENERGY_PER_CELL: Final = int(os.getenv("PLANT_ENERGY_PER_CELL"))
-
-    logger.info(f"Plant: max_age: {__MAX_AGE}")
-    logger.info(f"Plant: energy_per_cell: {__ENERGY_PER_CELL}")
+    @property
+    def size(self):
+        height, width = self._kinds.shape
+        return width, height
 
-    def __init__(self, energy: int):
-        self.__age = 0
-        self.__energy = energy
-        self.__energy_capacity = energy
-        self.__alive = True
+    @property
+    def chunk_width(self):
+        """Width of the column chunks the grid is stored in, None for dense storage"""
+        return self._chunk_width
 
-        logger.info(f"Plant@{id(self)} created. energy: {energy}")
+    @property
+    def kinds(self):
+        return read_only(self._kinds)
 
     @property
-    def alive(self):
-        return self.__alive
+    def sprites(self):
+        return read_only(self._sprites)
 
     @property
-    def energy(self):
-        return self.__energy
-
-    def check_alive(self):
-        if self.__energy == 0 or self.__age > self.__MAX_AGE and self.alive:
-            self.__alive = False
-            logger.info(
-                f"Plant@{id(self)} is dead. age: "
-                f"{self.__age}, energy: {self.__energy}, capacity: {self.__energy_capacity}")
-
-    def add_energy(self, amount: int):
-        if not self.alive:
-            return
+    def plant_ids(self):
+        return read_only(self._plant_ids)
 
-        if amount < 0:
-            logger.error(f"Adding negative amount of energy: {amount}")
+    def __region_bounds(self, index: int):
+        x0 = index * self._region_width
+        return x0, min(x0 + self._region_width, self._kinds.shape[1])
 
-        amount = min(amount, self.__energy_capacity - self.__energy)
-        self.__energy += amount
+    def occupied_regions(self):
+        """
+        [x0, x1) column ranges covering every occupied tile, in ascending order.
+        A single range over the whole width for dense storage, the chunks holding cells for chunked storage.
+        Every range lies within one chunk, so `layer[:, x0:x1]` slices work on every grid layer
+        """
+        if self._chunk_width is None:
+            return [(0, self._kinds.shape[1])]
 
-    def take_energy(self, amount: int):
-        if not self.alive:
-            return 0
+        return [self._kinds.chunk_bounds(index) for index in self._kinds.allocated]
 
-        amount = min(amount, self.__energy)
-        self.__energy -= amount
+    @property
+    def plants(self):
+        return self._plants
 
-        self.check_alive()
-        return amount
+    @property
+    def genomes(self):
+        """Genotypes of the bulbs and seeds and their lineage, see `GenomePool`"""
+        return self._genomes
 
-    def increase_capacity(self):
-        if not self.alive:
-            return
+    @property
+    def steps(self):
+        """Number of updates since the garden was created"""
+        return self._steps
 
-        self.__energy_capacity += self.__ENERGY_PER_CELL
+    @property
+    def events(self):
+        """Births, deaths, mutations and seed landings, see `EventStream`"""
+        return self._events
 
-    def update_age(self):
-        if not self.alive:
-            return
+    @property
+    def profile(self):
+        """Timings and tile changes of the last step, None unless profiling is enabled"""
+        return self._profile
 
-        self.check_alive()
-        self.__age += 1
+    def enable_profiling(self):
+        if self._profile is None:
+            self._profile = StepProfile(self.UPDATE_PHASES)
 
+        return self._profile
 
-class Garden:
-    __SUN_LEVEL: Final = int(os.getenv("GARDEN_SUN_LEVEL"))
-    __DENSITY_FACTOR: Final = int(os.getenv("GARDEN_DENSITY_FACTOR"))
+    def disable_profiling(self):
+        self._profile = None
 
-    __MUTATION_RATE: Final = int(os.getenv("GARDEN_MUTATION_RATE"))
-    __MUTATION_CHANCE: Final = float(os.getenv("GARDEN_MUTATION_CHANCE"))
+    @property
+    def metrics(self):
+        """Population metrics recorded after every step, None unless enabled"""
+        return self._metrics
 
-    __INITIAL_ENERGY: Final = int(os.getenv("GARDEN_INITIAL_ENERGY"))
+    def enable_metrics(self, recorder: Union[MetricsRecorder, None] = None):
+        """Record into `recorder`, which may come from another garden to continue its series, a new one by default"""
+        self._metrics = MetricsRecorder() if recorder is None else recorder
+        return self._metrics
 
-    __GENOME_SIZE: Final = 16
-    __CHROMOSOME_LENGTH: Final = 4
+    def disable_metrics(self):
+        self._metrics = None
 
-    __HAS_PLANT: Final = (Bulb, Stem)
-    __UPDATABLE: Final = (Bulb, Seed)
-    __AFFECTS_ENERGY: Final = (Bulb, Stem, Seed)
+    @property
+    def delta_log(self):
+        """Log every tile change is written to, None unless enabled"""
+        return self._delta_log
+
+    def enable_delta_log(self, path: Union[str, os.PathLike], keyframe_every: int = DeltaLog.KEYFRAME_EVERY):
+        """Write every tile change from now on to a new DeltaLog at `path`, replace the current one if any"""
+        self.disable_delta_log()
+        self._delta_log = DeltaLog(path, self, keyframe_every)
+        return self._delta_log
+
+    def disable_delta_log(self):
+        """Close the log with a keyframe of the current step"""
+        if self._delta_log is not None:
+            self._delta_log.keyframe(self)
+            self._delta_log.close()
+            self._delta_log = None
 
-    __ENERGY_COLORS: Final = (px.COLOR_NAVY, px.COLOR_PURPLE, px.COLOR_YELLOW)
-    __SHADOW_COLORS: Final = (px.COLOR_GRAY, px.COLOR_NAVY)
-    __ID_COLORS: Final = tuple(range(1, 15))
+    @property
+    def random(self):
+        """Random stream every random decision of this garden is drawn from"""
+        return self._random
 
-    TILE_SIZE: Final = 4
+    @property
+    def light(self):
+        """Energy multiplier of every tile, recomputed only in regions where the grid has changed"""
+        for index in self._stale_light:
+            x0, x1 = self.__region_bounds(index)
+            self._light[:, x0:x1] = column_light(self._kinds[:, x0:x1], self._config.sun_level,
+                                                 self._config.density_factor)
 
-    logger.info(f"Garden: sun_level: {__SUN_LEVEL}")
-    logger.info(f"Garden: density_factor: {__DENSITY_FACTOR}")
-    logger.info(f"Garden: genome_size: {__GENOME_SIZE}")
-    logger.info(f"Garden: chromosome_length: {__CHROMOSOME_LENGTH}")
-    logger.info(f"Garden: mutation_rate: {__MUTATION_RATE}")
-    logger.info(f"Garden: mutation_chance: {__MUTATION_CHANCE}")
-    logger.info(f"Garden: initial_energy: {__INITIAL_ENERGY}")
-    logger.info(f"Garden: tile_size: {TILE_SIZE}")
+        self._stale_light.clear()
+        return read_only(self._light)
 
-    def __init__(self, size: Tuple[int, int], border_color: int):
-        self.__border_color = border_color
-        self.__grid: npt.NDArray[Union[Cell, None]] = np.empty(size, Cell)
-        self.__plants = set()
+    @property
+    def sun_level(self):
+        return self._config.sun_level
 
-        mid_y, mid_x = map(lambda i: i // 2, self.__grid.shape)
-        initial_seed = Seed(Genome.random(self.__GENOME_SIZE, self.__CHROMOSOME_LENGTH), self.__INITIAL_ENERGY, self)
+    @property
+    def density_factor(self):
+        return self._config.density_factor
 
-        self.__grid[mid_y, mid_x] = initial_seed
+    @property
+    def has_plants(self):
+        return len(self._plants) != 0
+
+    @property
+    def is_extinct(self):
+        """No plants left and no seeds that could grow new ones"""
+        return not self.has_plants and not self._updatable
 
-        logger.info(f"Garden@{id(self)} created. size: {self.__grid.shape}")
+    def cell_counts(self):
+        """Number of tiles of every CellKind"""
+        return {kind: self._kind_counts[kind] for kind in CellKind}
 
     @property
-    def size(self):
-        return self.__grid.T.shape
+    def plant_energy(self):
+        """Energy of all plants as of the last step"""
+        return self._plant_energy
 
     @property
-    def has_plants(self):
-        return len(self.__plants) != 0
+    def age_counts(self):
+        """Number of living plants of every age as of the last step, indexed by age"""
+        return tuple(self._age_counts)
 
-    def __tile_x(self, x):
-        return x % self.__grid.shape[1]
+    def distinct_genomes(self):
+        """Number of different genomes among bulbs and seeds"""
+        return self._genomes.alive
 
-    def add_plant(self, plant: Plant):
-        self.__plants.add(plant)
+    def _tile_x(self, x):
+        return x % self._kinds.shape[1]
 
     def is_within(self, x: int, y: int):
-        x = self.__tile_x(x)
-        return 0 <= y < self.__grid.shape[0] and 0 <= x < self.__grid.shape[1]
+        x = self._tile_x(x)
+        return 0 <= y < self._kinds.shape[0] and 0 <= x < self._kinds.shape[1]
 
     def is_available(self, x: int, y: int):
-        x = self.__tile_x(x)
-        return self.is_within(x, y) and self.__grid[y, x] is None
+        x = self._tile_x(x)
+        return self.is_within(x, y) and self._kinds[y, x] == EMPTY
+
+    def replace_cell(self, cell: Cell, x: int, y: int):
+        self.remove_cell(x, y)
+        self.place_cell(cell, x, y)
 
+    def pop_dirty_tiles(self, consumer: Hashable):
+        """
+        (x, y) of tiles changed since the previous call of `consumer`, every consumer is tracked on its own.
+        Tracking starts with the first call, which returns None: every tile should be considered changed
+        """
+        dirty = self._dirty_tiles.get(consumer)
+        self._dirty_tiles[consumer] = set()
+        return dirty
+
+    def untrack_dirty_tiles(self, consumer: Hashable):
+        """Stop collecting changed tiles for `consumer`"""
+        self._dirty_tiles.pop(consumer, None)
+
+    def _set_tile(self, x: int, y: int, kind: CellKind, sprite: int, plant_id: int = NO_PLANT):
+        previous_kind, previous_plant_id = self._kinds[y, x], int(self._plant_ids[y, x])
+
+        self._kinds[y, x] = kind
+        self._sprites[y, x] = sprite
+        self._plant_ids[y, x] = plant_id
+        self._tile_changed(x, y, previous_kind, previous_plant_id, kind, plant_id)
+
+    def _tile_changed(self, x: int, y: int, previous_kind: int, previous_plant_id: int, kind: int, plant_id: int):
+        """Bookkeeping of a tile change, for tiles written without `_set_tile`"""
+        if self._profile is not None:
+            self._profile.tile_changed(previous_kind, kind)
+
+        self._kind_counts[previous_kind] -= 1
+        self._kind_counts[kind] += 1
+
+        if previous_plant_id != self.NO_PLANT:
+            self._plants.untrack(previous_plant_id, x, y)
+        if plant_id != self.NO_PLANT:
+            self._plants.track(plant_id, x, y)
+
+        self._stale_light.add(x // self._region_width)
+
+        for dirty in self._dirty_tiles.values():
+            dirty.add((x, y))
+
+        if self._delta_log is not None:
+            self._delta_log.tile_changed(self._steps, x, y, kind, int(self._sprites[y, x]), plant_id)
+
+        if kind in self.__UPDATABLE:
+            self._updatable.add((y, x))
+        else:
+            self._updatable.discard((y, x))
+
+    def _updatable_snapshot(self):
+        """
+        (y, x) of bulbs and seeds in row-major order, taken before the update pass.
+        Cells placed during the pass are not in the snapshot and get updated on the next step
+        """
+        return sorted(self._updatable)
+
+    def _exchange_plant_energy(self):
+        """Apply the energy produced and consumed by stems and bulbs to their plants, one exchange per plant"""
+        light = self.light
+        stems, tile_plant_ids, tile_light = [], [], []
+
+        for x0, x1 in self.occupied_regions():
+            kinds = self._kinds[:, x0:x1]
+            region_stems = kinds == CellKind.STEM
+            has_plant = region_stems | (kinds == CellKind.BULB)
+
+            stems.append(region_stems[has_plant])
+            tile_plant_ids.append(self._plant_ids[:, x0:x1][has_plant])
+            tile_light.append(light[:, x0:x1][has_plant])
+
+        stems = np.concatenate(stems) if stems else np.zeros(0, np.bool_)
+        if len(stems) == 0:
+            return
+
+        plant_ids, index = np.unique(np.concatenate(tile_plant_ids), return_inverse=True)
+        gains = np.bincount(index, Stem.ENERGY_GAIN * np.concatenate(tile_light) * stems, len(plant_ids))
+        costs = np.bincount(index, np.where(stems, Stem.ENERGY_CONSUMPTION, Bulb.ENERGY_CONSUMPTION), len(plant_ids))
+
+        for plant_id, gain, cost in zip(plant_ids.tolist(), gains.astype(np.int64).tolist(),
+                                        costs.astype(np.int64).tolist()):
+            self._plants.get(plant_id).exchange_energy(gain, cost)
+
+    def _dead_plants(self):
+        """Ids of dead plants and (x, y) of all their tiles in row-major order"""
+        dead = [plant_id for plant_id, plant in self._plants.items() if not plant.alive]
+        for plant_id in dead:
+            plant = self._plants.get(plant_id)
+            self._events.emit(EventKind.DEATH, plant_id, energy=plant.energy, age=plant.age)
+
+        cells = sorted((cell for plant_id in dead for cell in self._plants.cells(plant_id)),
+                       key=lambda cell: (cell[1], cell[0]))
+        return dead, cells
+
+    def _plant_id_of(self, cell: Cell):
+        """Id of the plant the cell belongs to, registering the plant on first sight"""
+        if cell.KIND not in self.__HAS_PLANT or cell.plant is None:
+            return self.NO_PLANT
+
+        return self._plants.add(cell.plant)
+
+    def _mutate(self, genome: Genome):
+        for _ in range(self._config.mutation_rate):
+            genome.mutate((0, self._GENOME_SIZE - 1), self._random, self._config.gene_active_chance)
+
+    def add_plant(self, plant: Plant):
+        return self._plants.add(plant)
+
+    def get_plant(self, x: int, y: int) -> Union[Plant, None]:
+        x = self._tile_x(x)
+        if not self.is_within(x, y):
+            return None
+
+        return self._plants.get(int(self._plant_ids[y, x]))
+
+    def state(self):
+        """Snapshot of the whole garden, see `GardenState`"""
+        energy, genome_index, chromosome, genomes = self._tile_state()
+        plant_ids, plants = zip(*self._plants.items()) if len(self._plants) else ((), ())
+        rng_state, rng_pending = self._random.get_state()
+
+        return GardenState(
+            self._steps,
+            np.array(self._kinds), np.array(self._sprites), np.array(self._plant_ids),
+            energy, genome_index, chromosome, genomes,
+            np.array(plant_ids, np.int32),
+            np.array([plant.energy for plant in plants], np.int64),
+            np.array([plant.energy_capacity for plant in plants], np.int64),
+            np.array([plant.age for plant in plants], np.int64),
+            np.array([plant.alive for plant in plants], np.bool_),
+            self._plants.next_id,
+            rng_state, rng_pending,
+            self._chunk_width or 0,
+            self._config.as_dict())
+
+    @classmethod
+    def from_state(cls, state: GardenState):
+        """Garden continuing exactly where the garden the state was taken from stopped"""
+        config = None if state.config is None else GardenConfig(**state.config)
+        garden = cls.__new__(cls)
+        garden._init_empty(state.kinds.shape, None, state.chunk_width or None, config)
+        garden._load_state(state)
+        return garden
+
+    def _load_state(self, state: GardenState):
+        self._kinds = layer_from(state.kinds, self._chunk_width, np.uint8)
+        self._sprites = layer_from(state.sprites, self._chunk_width, np.uint8)
+        self._plant_ids = layer_from(state.plant_ids, self._chunk_width, np.int32, self.NO_PLANT)
+        self._light = self._new_layer(np.int32)
+        self._stale_light = {x0 // self._region_width for x0, _ in self.occupied_regions()}
+        self._dirty_tiles.clear()
+        self._kind_counts = np.bincount(state.kinds.ravel(), minlength=len(CellKind)).tolist()
+        self._steps = state.steps
+
+        self._plants.restore((Plant.restore(*plant, self._config) for plant in zip(
+                                  state.plant_id.tolist(), state.plant_energy.tolist(), state.plant_capacity.tolist(),
+                                  state.plant_age.tolist(), state.plant_alive.tolist())),
+                             state.next_plant_id)
+        self.__tally_plants()
+        ys, xs = np.nonzero(state.plant_ids)
+        for plant_id, x, y in zip(state.plant_ids[ys, xs].tolist(), xs.tolist(), ys.tolist()):
+            self._plants.track(plant_id, x, y)
+
+        self._updatable = set(zip(*map(np.ndarray.tolist, np.nonzero(np.isin(state.kinds, self.__UPDATABLE)))))
+        self._random.set_state(state.rng_state, state.rng_pending)
+
+        # lineage is not part of the state, the genotypes of a loaded garden start new lineages
+        self._genomes = GenomePool()
+        refs = np.bincount(state.genome_index[state.genome_index >= 0], minlength=len(state.genomes)).tolist()
+        genome_ids = [self._genomes.intern(genes) for genes in state.genomes]
+        for genome_id, count in zip(genome_ids, refs):
+            if count:
+                self._genomes.acquire(genome_id, count)
+        self._genomes.collect()
+
+        self._load_tiles(state, np.array(genome_ids, np.int32))
+
+    def _empty_tile_state(self):
+        """energy, genome_index, chromosome and genomes of a garden without bulbs and seeds"""
+        return (np.zeros(self._kinds.shape, np.int32), np.full(self._kinds.shape, -1, np.int32),
+                np.zeros(self._kinds.shape, np.uint8),
+                np.zeros((0, self._GENOME_SIZE, self._CHROMOSOME_LENGTH, 2), np.uint8))
+
+    @staticmethod
+    def _unique_genomes(data: npt.NDArray[np.uint8]):
+        """Genomes of `data` without duplicates ordered by content, and where each genome of `data` ended up"""
+        unique, inverse = np.unique(data.reshape(len(data), -1), axis=0, return_inverse=True)
+        return unique.reshape(-1, *data.shape[1:]), inverse.ravel()
+
+    @abstractmethod
+    def _tile_state(self) -> Tuple[npt.NDArray[np.int32], npt.NDArray[np.int32],
+                                   npt.NDArray[np.uint8], npt.NDArray[np.uint8]]:
+        """energy, genome_index, chromosome and genomes fields of `GardenState`"""
+        pass
+
+    @abstractmethod
+    def _load_tiles(self, state: GardenState, genome_ids: npt.NDArray[np.int32]):
+        """
+        Rebuild backend specific storage, the shared tile arrays, plants and genomes are already restored.
+        `genome_ids` - id in `genomes` of every genome of the state
+        """
+        pass
+
+    @abstractmethod
     def place_cell(self, cell: Cell, x: int, y: int):
-        x = self.__tile_x(x)
+        pass
+
+    @abstractmethod
+    def remove_cell(self, x: int, y: int):
+        pass
+
+    @abstractmethod
+    def get_cell(self, x: int, y: int) -> Union[Cell, None]:
+        pass
+
+    def update(self):
+        self._events.set_step(self._steps)
+
+        if self._profile is None:
+            self.update_energy()
+            self.update_cells()
+            self.update_plants_age()
+            self.update_dead_plants()
+        else:
+            self._profile.begin_step()
+            for phase in self.UPDATE_PHASES:
+                start = time.perf_counter()
+                getattr(self, phase)()
+                self._profile.record_phase(phase, time.perf_counter() - start)
+
+        self._genomes.collect()
+        self._steps += 1
+
+        if self._metrics is not None:
+            self._metrics.record(self)
+        if self._delta_log is not None:
+            self._delta_log.end_step(self)
+
+    @abstractmethod
+    def update_energy(self):
+        pass
+
+    @abstractmethod
+    def update_cells(self):
+        pass
+
+    def update_plants_age(self):
+        self.__tally_plants(age=True)
+
+    def __tally_plants(self, age: bool = False):
+        """Tally the energy and ages of the living plants, aging every plant first with `age`"""
+        energy, ages = 0, [0] * (self._config.max_age + 2)
+        for plant in self._plants:
+            if age:
+                plant.update_age()
+            if plant.alive:
+                energy += plant.energy
+                ages[plant.age] += 1
+
+        self._plant_energy, self._age_counts = energy, ages
+
+    @abstractmethod
+    def update_dead_plants(self):
+        pass
+
+
+class Garden(BaseGarden):
+    def _init_empty(self, size: Tuple[int, int], seed: RandomSeed, chunk_width: Union[int, None],
+                    config: Union[GardenConfig, None]):
+        super()._init_empty(size, seed, chunk_width, config)
+        self.__grid: Union[npt.NDArray[Union[Cell, None]], ChunkedLayer] = self._new_layer(object, None)
+
+    def place_cell(self, cell: Cell, x: int, y: int):
+        x = self._tile_x(x)
         if self.__grid[y, x] is not None:
             logger.error(f"Grid at ({y}, {x}) is not empty")
 
+        if type(cell) is Bulb or type(cell) is Seed:
+            self._genomes.acquire(self._genomes.intern(cell.genome.data))
+
         self.__grid[y, x] = cell
+        self._set_tile(x, y, cell.KIND, cell.sprite, self._plant_id_of(cell))
 
     def remove_cell(self, x: int, y: int):
-        x = self.__tile_x(x)
-        if self.__grid[y, x] is None:
+        x = self._tile_x(x)
+        cell = self.__grid[y, x]
+        if cell is None:
             logger.warning(f"Grid at ({y}, {x}) is already empty")
+        elif type(cell) is Bulb or type(cell) is Seed:
+            self._genomes.release(self._genomes.find(cell.genome.data))
 
         self.__grid[y, x] = None
+        self._set_tile(x, y, CellKind.EMPTY, BLANK_SPRITE)
 
     def get_cell(self, x: int, y: int):
-        x = self.__tile_x(x)
+        x = self._tile_x(x)
         return self.__grid[y, x] if self.is_within(x, y) else None
 
-    def replace_cell(self, cell: Cell, x: int, y: int):
-        self.remove_cell(x, y)
-        self.place_cell(cell, x, y)
-
-    def draw_energy(self, position: Vec2):
-        for x, col in enumerate(self.__grid.T):
-            density_factor = self.__DENSITY_FACTOR
-            sun_level = self.__SUN_LEVEL
-            for y, row in enumerate(col):
-                if not type(row) in self.__AFFECTS_ENERGY:
-                    continue
+    def _tile_state(self):
+        energy, genome_index, chromosome, genomes = self._empty_tile_state()
 
-                multiplier = sun_level * (density_factor > 0)
+        ys, xs, cells = [], [], []
+        for x0, x1 in self.occupied_regions():
+            kinds = self._kinds[:, x0:x1]
+            region_ys, region_xs = np.nonzero((kinds == CellKind.BULB) | (kinds == CellKind.SEED))
+            ys.extend(region_ys.tolist())
+            xs.extend((region_xs + x0).tolist())
 
-                color = self.__ENERGY_COLORS[
-                    math.floor(linear_remap(multiplier,
-                                            0, self.__SUN_LEVEL,
-                                            0, len(self.__ENERGY_COLORS) - 1))
-                ]
+        if not ys:
+            return energy, genome_index, chromosome, genomes
 
-                px.rect(*(position + Vec2(x, y) * 4).as_tuple, self.TILE_SIZE, self.TILE_SIZE, color)
+        cells = [self.__grid[y, x] for y, x in zip(ys, xs)]
+        energy[ys, xs] = [cell.energy for cell in cells]
+        chromosome[ys, xs] = [cell.genome.active_index for cell in cells]
 
-                density_factor -= 1
-                sun_level = clamp(sun_level - 1, 0, self.__SUN_LEVEL)
+        genomes, genome_index[ys, xs] = self._unique_genomes(np.stack([cell.genome.data for cell in cells]))
 
-    def draw_shadow(self, position: Vec2):
-        for x, col in enumerate(self.__grid.T):
-            is_shadow = False
-            for y, row in enumerate(col):
-                if row is not None:
-                    is_shadow = True
+        return energy, genome_index, chromosome, genomes
 
-                color = self.__SHADOW_COLORS[is_shadow]
-                px.rect(*(position + Vec2(x, y) * 4).as_tuple, self.TILE_SIZE, self.TILE_SIZE, color)
+    def _load_tiles(self, state: GardenState, genome_ids: npt.NDArray[np.int32]):
+        # every cell starts out sharing the genes stored in the pool, see `Genome.copy`
+        genomes = [Genome(self._genomes.genes(genome_id), shared=True) for genome_id in genome_ids.tolist()]
+        self.__grid = self._new_layer(object, None)
 
-    def draw_plants(self, position: Vec2):
-        for (y, x), val in np.ndenumerate(self.__grid):
-            if val is None:
-                continue
-            else:
-                val: Cell
-                val.image.draw(*(position + Vec2(x, y) * 4).as_tuple)
+        for y, x in zip(*map(np.ndarray.tolist, np.nonzero(state.kinds))):
+            kind = state.kinds[y, x]
+            sprite = int(state.sprites[y, x])
 
-    def draw_plants_id(self, position: Vec2):
-        for (y, x), val in np.ndenumerate(self.__grid):
-            if not type(val) in self.__HAS_PLANT:
+            if kind == CellKind.STEM:
+                self.__grid[y, x] = Stem(self.get_plant(x, y), self, sprite)
                 continue
-            else:
-                color = self.__ID_COLORS[id(val.plant) % len(self.__ID_COLORS)]
-                px.rect(*(position + Vec2(x, y) * 4).as_tuple, self.TILE_SIZE, self.TILE_SIZE, color)
 
-    def draw_border(self, position: Vec2):
-        shape_vec = Vec2(*self.__grid.T.shape)
-        px.rectb(*(position - Vec2(1, 1)).as_tuple, *(shape_vec * 4 + Vec2(2, 2)).as_tuple, self.__border_color)
+            genome = genomes[state.genome_index[y, x]].copy()
+            genome.set_active_gene(int(state.chromosome[y, x]))
+            energy = int(state.energy[y, x])
 
-    def update(self):
-        self.update_energy()
-        self.update_cells()
-        self.update_plants_age()
-        self.update_dead_plants()
+            if kind == CellKind.BULB:
+                self.__grid[y, x] = Bulb(genome, energy, self, self.get_plant(x, y), sprite)
+            else:
+                self.__grid[y, x] = Seed(genome, energy, self, sprite)
 
     def update_energy(self):
-        for x, col in enumerate(self.__grid.T):
-            density_factor = self.__DENSITY_FACTOR
-            sun_level = self.__SUN_LEVEL
-            for y, row in enumerate(col):
-                if not type(row) in self.__AFFECTS_ENERGY:
-                    continue
-
-                row: Cell
-
-                multiplier = sun_level * (density_factor > 0)
+        light = self.light
 
-                row.produce_energy(multiplier)
-                row.consume_energy()
+        for x0, x1 in self.occupied_regions():
+            for y, x in zip(*map(np.ndarray.tolist, np.nonzero(self._kinds[:, x0:x1] == CellKind.BULB))):
+                cell: Bulb = self.__grid[y, x0 + x]
+                cell.produce_energy(int(light[y, x0 + x]))
 
-                density_factor -= 1
-                sun_level = clamp(sun_level - 1, 0, self.__SUN_LEVEL)
+        self._exchange_plant_energy()
 
     def update_dead_plants(self):
-        for (y, x), val in np.ndenumerate(self.__grid):
-            if not type(val) in self.__HAS_PLANT:
-                continue
-
-            val: Cell
+        dead, cells = self._dead_plants()
 
-            if val.plant.alive:
-                continue
+        for x, y in cells:
+            cell = self.__grid[y, x]
 
-            self.__plants.discard(val.plant)
-
-            if type(val) is not Bulb:
+            if type(cell) is not Bulb or cell.energy == 0:
                 self.remove_cell(x, y)
                 continue
 
-            val: Bulb
-
-            if val.energy == 0:
-                self.remove_cell(x, y)
-                continue
+            cell: Bulb
 
-            genome = val.copy_of_genome
-            if decide(self.__MUTATION_CHANCE):
-                [genome.mutate((0, self.__GENOME_SIZE - 1)) for _ in range(self.__MUTATION_RATE)]
-            seed = Seed(genome, self.__INITIAL_ENERGY, self)
+            genome = cell.copy_of_genome
+            if self._random.decide(self._config.mutation_chance):
+                self._mutate(genome)
+                self._genomes.intern(genome.data, self._genomes.find(cell.genome.data))
+                self._events.emit(EventKind.MUTATION, int(self._plant_ids[y, x]), x, y, self._config.mutation_rate)
+            seed = Seed(genome, self._config.initial_energy, self)
             self.replace_cell(seed, x, y)
 
-    def update_plants_age(self):
-        for plant in self.__plants:
-            plant.update_age()
+        for plant_id in dead:
+            self._plants.remove(plant_id)
 
     def update_cells(self):
-        for (y, x), val in np.ndenumerate(self.__grid.copy()):
-            if not type(val) in self.__UPDATABLE:
-                continue
-
-            val: Cell
-            val.update(x, y)
+        for y, x in self._updatable_snapshot():
+            cell: Cell = self.__grid[y, x]
+            cell.update(x, y)
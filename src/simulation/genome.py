@@ -1,17 +1,17 @@
-import os
-import random as rnd
-from typing import Final, Tuple, List
+from typing import Final, Tuple, List, Union
 
-from loguru import logger
+import numpy as np
+from numpy import typing as npt
 
-from src.funcs import decide
+from src.simulation.config import default_config
+from src.simulation.rng import RandomStream, default_stream
 
 
-class Gene:
-    ACTIVE_CHANCE: Final = float(os.getenv("GENE_ACTIVE_CHANCE"))
+def _active_chance(active_chance: Union[float, None]):
+    return default_config().gene_active_chance if active_chance is None else active_chance
 
-    logger.info(f"Gene: active_chance: {ACTIVE_CHANCE}")
 
+class Gene:
     def __init__(self, dna: int, active: bool):
         self.__dna = dna
         self.__active = active
@@ -24,9 +24,11 @@ class Gene:
     def active(self):
         return self.__active
 
-    def mutate(self, deviation_range: Tuple[int, int]):
-        self.__dna = rnd.randint(deviation_range[0], deviation_range[1])
-        self.__active = decide(self.ACTIVE_CHANCE)
+    def mutate(self, deviation_range: Tuple[int, int], random: RandomStream = default_stream,
+               active_chance: Union[float, None] = None):
+        """`active_chance` - chance of the gene to end up active, that of the default config by default"""
+        self.__dna = random.randint(deviation_range[0], deviation_range[1])
+        self.__active = random.decide(_active_chance(active_chance))
 
     def __repr__(self):
         return f"{self.__class__.__qualname__}({self.dna}, {self.active})"
@@ -47,9 +49,10 @@ class Chromosome:
     def size(self):
         return len(self.__genes)
 
-    def mutate(self, deviation_range: Tuple[int, int]):
-        gene = rnd.choice(self.__genes)
-        gene.mutate(deviation_range)
+    def mutate(self, deviation_range: Tuple[int, int], random: RandomStream = default_stream,
+               active_chance: Union[float, None] = None):
+        gene = random.choice(self.__genes)
+        gene.mutate(deviation_range, random, active_chance)
 
     def __repr__(self):
         return f"{self.__class__.__qualname__}({self.__genes})"
@@ -59,47 +62,95 @@ class Chromosome:
 
 
 class Genome:
-    def __init__(self, chromosomes: List[Chromosome]):
-        self.__chromosomes = chromosomes
-        self.__active_chromosome = 0
+    """
+    Chromosomes stored in one (size, chromosome_length, 2) array of (dna, active) pairs.
+    Copies share the array until one of them mutates, the active chromosome is never shared
+    """
+
+    DNA: Final = 0
+    ACTIVE: Final = 1
+
+    def __init__(self, genes: npt.NDArray[np.uint8], active_chromosome: int = 0, shared: bool = False):
+        if genes.ndim != 3 or genes.shape[2] != 2:
+            raise ValueError(f"Required: genes.shape = (size, chromosome_length, 2); Got: {genes.shape = }")
+
+        self.__genes = genes
+        self.__shared = shared
+        self.__active_chromosome = active_chromosome
+
+    @staticmethod
+    def from_chromosomes(chromosomes: List[Chromosome]):
+        return Genome(np.array([[(gene.dna, gene.active) for gene in c.genes] for c in chromosomes], np.uint8))
 
     @property
     def size(self):
-        return len(self.__chromosomes)
+        return self.__genes.shape[0]
+
+    @property
+    def chromosome_length(self):
+        return self.__genes.shape[1]
+
+    @property
+    def data(self):
+        view = self.__genes.view()
+        view.flags.writeable = False
+        return view
 
     @property
     def chromosomes(self):
-        return self.__chromosomes.copy()
+        return [self.__chromosome(index) for index in range(self.size)]
 
     @property
     def chromosome(self):
-        return self.__chromosomes[self.__active_chromosome]
+        return self.__chromosome(self.__active_chromosome)
+
+    @property
+    def active_index(self):
+        return self.__active_chromosome
+
+    def __chromosome(self, index: int):
+        return Chromosome([Gene(dna, active) for dna, active in self.genes(index)])
+
+    def genes(self, index: Union[int, None] = None):
+        """(dna, active) of every gene of a chromosome, the active one by default"""
+        row = self.__genes[self.__active_chromosome if index is None else index]
+        return [(dna, active != 0) for dna, active in row.tolist()]
 
     def set_active_gene(self, index: int):
-        if index > len(self.__chromosomes):
+        if index > self.size:
             raise ValueError("Index out of range")
 
         self.__active_chromosome = index
 
-    def mutate(self, deviation_range: Tuple[int, int]):
-        logger.info(f"Genome@{id(self)} mutated")
-        chromosome = rnd.choice(self.__chromosomes)
-        chromosome.mutate(deviation_range)
+    def __own(self):
+        if self.__shared:
+            self.__genes = self.__genes.copy()
+            self.__shared = False
+
+    def mutate(self, deviation_range: Tuple[int, int], random: RandomStream = default_stream,
+               active_chance: Union[float, None] = None):
+        """Replace a random gene, `active_chance` is that of the default config by default"""
+        self.__own()
+
+        chromosome = random.randrange(self.size)
+        gene = random.randrange(self.chromosome_length)
+        self.__genes[chromosome, gene, self.DNA] = random.randint(deviation_range[0], deviation_range[1])
+        self.__genes[chromosome, gene, self.ACTIVE] = random.decide(_active_chance(active_chance))
 
     @staticmethod
-    def random(size: int, chromosome_length: int):
-        return Genome(
-            [
-                Chromosome(
-                    [
-                        Gene(rnd.randint(0, size - 1), decide(Gene.ACTIVE_CHANCE), ) for _ in range(chromosome_length)
-                    ]
-                ) for _ in range(size)]
-        )
+    def random(size: int, chromosome_length: int, random: RandomStream = default_stream,
+               active_chance: Union[float, None] = None):
+        active_chance = _active_chance(active_chance)
+        genes = np.empty((size, chromosome_length, 2), np.uint8)
+        for chromosome in range(size):
+            for gene in range(chromosome_length):
+                genes[chromosome, gene] = (random.randint(0, size - 1), random.decide(active_chance))
+
+        return Genome(genes)
 
     def __repr__(self):
-        return f"{self.__class__.__qualname__}({self.__chromosomes})"
+        return f"{self.__class__.__qualname__}({self.chromosomes})"
 
     def copy(self):
-        genome = Genome([c.copy() for c in self.__chromosomes])
-        return genome
+        self.__shared = True
+        return Genome(self.__genes, shared=True)
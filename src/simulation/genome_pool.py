@@ -0,0 +1,138 @@
+from typing import Dict, Final, List, Set
+
+import numpy as np
+from numpy import typing as npt
+
+
+class _Genotype:
+    __slots__ = ("key", "genes", "refs", "children", "parent", "depth")
+
+    def __init__(self, key: bytes, genes: npt.NDArray[np.uint8], parent: int, depth: int):
+        self.key = key
+        self.genes = genes
+        self.refs = 0
+        self.children = 0
+        self.parent = parent
+        self.depth = depth
+
+
+class GenomePool:
+    """
+    Genomes of a garden interned by content: every distinct genotype is stored once, read-only, under an id that is
+    never reused, and counted by the tiles referring to it.
+    Genotypes created by mutation remember the genotype they were mutated from. A genotype is dropped by `collect`
+    once no tile refers to it and none of its descendants is left
+    """
+
+    NO_GENOME: Final = -1
+
+    def __init__(self):
+        self.__ids: Dict[bytes, int] = {}
+        self.__genotypes: Dict[int, _Genotype] = {}
+        self.__next_id = 0
+        self.__alive = 0
+        # genotypes nothing referred to at some point since the last `collect`
+        self.__unreferenced: Set[int] = set()
+
+    def __len__(self):
+        """Number of stored genotypes, ancestors of living genotypes included"""
+        return len(self.__genotypes)
+
+    def __contains__(self, genome_id: int):
+        return genome_id in self.__genotypes
+
+    @property
+    def alive(self):
+        """Number of distinct genotypes at least one tile refers to"""
+        return self.__alive
+
+    def find(self, genes: npt.NDArray[np.uint8]):
+        """Id of the genotype with exactly these genes, NO_GENOME if there is none"""
+        return self.__ids.get(genes.tobytes(), self.NO_GENOME)
+
+    def intern(self, genes: npt.NDArray[np.uint8], parent: int = NO_GENOME):
+        """
+        Id of the genotype with these genes, added as a child of `parent` if it is new.
+        Nothing refers to a new genotype before `acquire`, it is dropped by the next `collect` otherwise
+        """
+        key = genes.tobytes()
+        genome_id = self.__ids.get(key)
+        if genome_id is not None:
+            return genome_id
+
+        depth = 0
+        if parent != self.NO_GENOME:
+            ancestor = self.__genotypes[parent]
+            ancestor.children += 1
+            depth = ancestor.depth + 1
+
+        genes = np.array(genes, np.uint8)
+        genes.flags.writeable = False
+
+        genome_id = self.__next_id
+        self.__next_id += 1
+        self.__ids[key] = genome_id
+        self.__genotypes[genome_id] = _Genotype(key, genes, parent, depth)
+        self.__unreferenced.add(genome_id)
+        return genome_id
+
+    def acquire(self, genome_id: int, count: int = 1):
+        genotype = self.__genotypes[genome_id]
+        if genotype.refs == 0:
+            self.__alive += 1
+        genotype.refs += count
+
+    def release(self, genome_id: int, count: int = 1):
+        genotype = self.__genotypes[genome_id]
+        if count > genotype.refs:
+            raise ValueError(f"Required: count <= {genotype.refs} references of genome {genome_id}; Got: {count}")
+
+        genotype.refs -= count
+        if genotype.refs == 0:
+            self.__alive -= 1
+            self.__unreferenced.add(genome_id)
+
+    def collect(self):
+        """Drop the genotypes nothing refers to any more, along with the ancestors only they kept"""
+        for genome_id in self.__unreferenced:
+            genotype = self.__genotypes.get(genome_id)
+
+            while genotype is not None and genotype.refs == 0 and genotype.children == 0:
+                del self.__genotypes[genome_id]
+                del self.__ids[genotype.key]
+
+                genome_id = genotype.parent
+                genotype = self.__genotypes.get(genome_id)
+                if genotype is not None:
+                    genotype.children -= 1
+
+        self.__unreferenced.clear()
+
+    def genes(self, genome_id: int):
+        """Read-only (size, chromosome_length, 2) genes of a genotype"""
+        return self.__genotypes[genome_id].genes
+
+    def refs(self, genome_id: int):
+        return self.__genotypes[genome_id].refs
+
+    def parent(self, genome_id: int):
+        """Genotype this one was mutated from, NO_GENOME for genotypes without one"""
+        return self.__genotypes[genome_id].parent
+
+    def depth(self, genome_id: int):
+        """Number of mutations between the genotype and its oldest recorded ancestor"""
+        return self.__genotypes[genome_id].depth
+
+    def lineage(self, genome_id: int) -> List[int]:
+        """Ids from the genotype back to its oldest recorded ancestor"""
+        lineage = []
+        while genome_id != self.NO_GENOME:
+            lineage.append(genome_id)
+            genome_id = self.__genotypes[genome_id].parent
+
+        return lineage
+
+    def edges(self):
+        """(parent, child) of every recorded mutation between stored genotypes"""
+        return [(genotype.parent, genome_id) for genome_id, genotype in self.__genotypes.items()
+                if genotype.parent != self.NO_GENOME]
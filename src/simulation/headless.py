@@ -0,0 +1,47 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Union
+
+from src.simulation.garden import BaseGarden
+
+
+@dataclass(frozen=True)
+class RunStats:
+    steps: int
+    elapsed: float
+    extinct: bool
+
+    @property
+    def steps_per_second(self):
+        return self.steps / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+def run(garden: BaseGarden, steps: int,
+        stop_when_extinct: bool = False,
+        report_every: int = 0, report: Union[Callable[[RunStats], None], None] = None,
+        checkpoint_every: int = 0, checkpoint: Union[Callable[[BaseGarden], None], None] = None):
+    """Advance `garden` by up to `steps` steps as fast as possible, without any rendering"""
+    if steps < 0:
+        raise ValueError("Required: steps >= 0")
+    if report_every < 0:
+        raise ValueError("Required: report_every >= 0")
+    if checkpoint_every < 0:
+        raise ValueError("Required: checkpoint_every >= 0")
+
+    step = 0
+    start = time.perf_counter()
+
+    while step < steps:
+        if stop_when_extinct and garden.is_extinct:
+            break
+
+        garden.update()
+        step += 1
+
+        if report is not None and report_every and step % report_every == 0:
+            report(RunStats(step, time.perf_counter() - start, garden.is_extinct))
+
+        if checkpoint is not None and checkpoint_every and step % checkpoint_every == 0:
+            checkpoint(garden)
+
+    return RunStats(step, time.perf_counter() - start, garden.is_extinct)
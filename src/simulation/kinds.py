@@ -0,0 +1,16 @@
+from enum import IntEnum
+from typing import Final
+
+
+class CellKind(IntEnum):
+    EMPTY = 0
+    STEM = 1
+    BULB = 2
+    SEED = 3
+
+
+# plain int values of the kinds for per-tile code: looking up an enum member goes through EnumType.__getattr__
+EMPTY: Final = int(CellKind.EMPTY)
+STEM: Final = int(CellKind.STEM)
+BULB: Final = int(CellKind.BULB)
+SEED: Final = int(CellKind.SEED)
@@ -0,0 +1,18 @@
+import numpy as np
+from numpy import typing as npt
+
+from src.simulation.kinds import CellKind
+
+
+def column_light(kinds: npt.NDArray[np.uint8], sun_level: int, density_factor: int) -> npt.NDArray[np.int32]:
+    """
+    Energy multiplier of every tile of a (height, width) block of cell kinds. Light falls from the top of each column,
+    every occupied tile takes one level of it, tiles below the first `density_factor` occupied ones get none
+    """
+    occupied = kinds != CellKind.EMPTY
+    # number of occupied tiles above each tile in its column
+    rank = np.cumsum(occupied, axis=0, dtype=np.int32) - 1
+
+    light = np.clip(sun_level - rank, 0, sun_level)
+    light *= occupied & (rank < density_factor)
+    return light
@@ -0,0 +1,131 @@
+import csv
+import os
+from typing import TYPE_CHECKING, Dict, Final, Union
+
+import numpy as np
+
+from src.simulation.kinds import CellKind
+
+if TYPE_CHECKING:
+    from src.simulation.garden import BaseGarden
+
+# name and dtype of every recorded column. energy is the sum over all plants, ages are those of the living plants,
+# genomes is the number of different genomes among bulbs and seeds
+METRIC_COLUMNS: Final = (
+    ("step", np.int64),
+    ("plants", np.int32),
+    ("stems", np.int32),
+    ("bulbs", np.int32),
+    ("seeds", np.int32),
+    ("energy", np.int64),
+    ("mean_energy", np.float64),
+    ("mean_age", np.float64),
+    ("median_age", np.float64),
+    ("max_age", np.int32),
+    ("genomes", np.int32),
+)
+
+
+class MetricsRecorder:
+    """
+    Population metrics of a garden, one row every `every` steps, kept in preallocated columns.
+    The columns form a ring buffer: memory stays fixed and only the last `capacity` rows are kept
+    """
+
+    CAPACITY: Final = 65536
+
+    def __init__(self, capacity: int = CAPACITY, every: int = 1):
+        if capacity <= 0:
+            raise ValueError("Required: capacity > 0")
+        if every <= 0:
+            raise ValueError("Required: every > 0")
+
+        self.__columns = {name: np.zeros(capacity, dtype) for name, dtype in METRIC_COLUMNS}
+        self.__every = every
+        self.__head = 0
+
+    @property
+    def capacity(self):
+        return len(self.__columns["step"])
+
+    @property
+    def every(self):
+        return self.__every
+
+    @property
+    def recorded(self):
+        """Number of rows recorded since the recorder was created or cleared"""
+        return self.__head
+
+    def __len__(self):
+        return min(self.__head, self.capacity)
+
+    def record(self, garden: 'BaseGarden'):
+        """Append a row for the garden's current step, unless the step is not a multiple of `every`"""
+        if garden.steps % self.__every:
+            return
+
+        # counters the garden keeps up to date, so a row costs the same whatever the size of the garden
+        counts = garden.cell_counts()
+        plants, energy = len(garden.plants), garden.plant_energy
+        age_counts = np.asarray(garden.age_counts)
+        living = int(age_counts.sum())
+
+        row = self.__head % self.capacity
+        columns = self.__columns
+        columns["step"][row] = garden.steps
+        columns["plants"][row] = plants
+        columns["stems"][row] = counts[CellKind.STEM]
+        columns["bulbs"][row] = counts[CellKind.BULB]
+        columns["seeds"][row] = counts[CellKind.SEED]
+        columns["energy"][row] = energy
+        columns["mean_energy"][row] = energy / plants if plants else 0.0
+        if living:
+            # the middle two ages, the same one for an odd number of plants
+            below = np.cumsum(age_counts)
+            middle = np.searchsorted(below, ((living - 1) // 2, living // 2), "right")
+            columns["mean_age"][row] = (age_counts * np.arange(len(age_counts))).sum() / living
+            columns["median_age"][row] = middle.sum() / 2
+            columns["max_age"][row] = np.flatnonzero(age_counts)[-1]
+        else:
+            columns["mean_age"][row] = columns["median_age"][row] = 0.0
+            columns["max_age"][row] = 0
+        columns["genomes"][row] = garden.distinct_genomes()
+        self.__head += 1
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Copy of every column with the rows the ring still holds, oldest first"""
+        start = self.__head % self.capacity
+        if self.__head <= self.capacity:
+            return {name: column[:self.__head].copy() for name, column in self.__columns.items()}
+
+        return {name: np.concatenate((column[start:], column[:start])) for name, column in self.__columns.items()}
+
+    def clear(self):
+        self.__head = 0
+
+    def save_npz(self, path: Union[str, os.PathLike]):
+        np.savez(path, **self.columns())
+
+    def save_csv(self, path: Union[str, os.PathLike]):
+        columns = self.columns()
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            writer.writerows(zip(*(column.tolist() for column in columns.values())))
+
+    def save(self, path: Union[str, os.PathLike]):
+        """Write the columns as .csv or .npz, by the extension of `path`"""
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            self.save_csv(path)
+        elif extension == ".npz":
+            self.save_npz(path)
+        else:
+            raise ValueError(f"Required: path ending in .csv or .npz; Got: {path}")
+
+
+def load_metrics(path: Union[str, os.PathLike]):
+    """Columns saved with `MetricsRecorder.save_npz`"""
+    with np.load(path) as data:
+        return {name: data[name] for name, _ in METRIC_COLUMNS}
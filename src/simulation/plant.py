@@ -0,0 +1,173 @@
+from typing import Final, Dict, Iterable, Set, Tuple, Union
+
+from src.helper.log import logger
+from src.simulation.config import GardenConfig, default_config
+
+
+class Plant:
+    def __init__(self, energy: int, config: Union[GardenConfig, None] = None):
+        """`config` - that of the garden the plant grows in, the default config by default"""
+        config = default_config() if config is None else config
+        self.__max_age = config.max_age
+        self.__energy_per_cell = config.energy_per_cell
+
+        self.__age = 0
+        self.__energy = energy
+        self.__energy_capacity = energy
+        self.__alive = True
+        self.__id: Union[int, None] = None
+
+    @staticmethod
+    def restore(plant_id: int, energy: int, energy_capacity: int, age: int, alive: bool,
+                config: Union[GardenConfig, None] = None):
+        """Plant in the exact state it was saved in"""
+        plant = Plant(energy, config)
+        plant.__id = plant_id
+        plant.__energy_capacity = energy_capacity
+        plant.__age = age
+        plant.__alive = alive
+        return plant
+
+    @property
+    def id(self):
+        return self.__id
+
+    @id.setter
+    def id(self, value: int):
+        if self.__id is not None:
+            raise ValueError(f"Plant@{id(self)} already has id {self.__id}")
+
+        self.__id = value
+
+    @property
+    def alive(self):
+        return self.__alive
+
+    @property
+    def energy(self):
+        return self.__energy
+
+    @property
+    def energy_capacity(self):
+        return self.__energy_capacity
+
+    @property
+    def age(self):
+        return self.__age
+
+    def check_alive(self):
+        if self.__energy == 0 or self.__age > self.__max_age and self.alive:
+            self.__alive = False
+
+    def add_energy(self, amount: int):
+        if not self.alive:
+            return
+
+        if amount < 0:
+            logger.error(f"Adding negative amount of energy: {amount}")
+
+        amount = min(amount, self.__energy_capacity - self.__energy)
+        self.__energy += amount
+
+    def take_energy(self, amount: int):
+        if not self.alive:
+            return 0
+
+        amount = min(amount, self.__energy)
+        self.__energy -= amount
+
+        self.check_alive()
+        return amount
+
+    def exchange_energy(self, gain: int, cost: int):
+        """Apply the energy produced and consumed by all cells of the plant during a step at once"""
+        if gain > cost:
+            self.add_energy(gain - cost)
+        else:
+            self.take_energy(cost - gain)
+
+    def increase_capacity(self):
+        if not self.alive:
+            return
+
+        self.__energy_capacity += self.__energy_per_cell
+
+    def update_age(self):
+        if not self.alive:
+            return
+
+        self.check_alive()
+        self.__age += 1
+
+
+class PlantRegistry:
+    """Plants of a garden by stable, monotonically increasing id, along with the tiles each of them occupies"""
+
+    NO_PLANT: Final = 0
+
+    def __init__(self):
+        self.__plants: Dict[int, Plant] = {}
+        self.__cells: Dict[int, Set[Tuple[int, int]]] = {}
+        self.__next_id = self.NO_PLANT + 1
+
+    def __len__(self):
+        return len(self.__plants)
+
+    def __iter__(self):
+        return iter(self.__plants.values())
+
+    def __contains__(self, plant_id: int):
+        return plant_id in self.__plants
+
+    @property
+    def next_id(self):
+        return self.__next_id
+
+    def items(self):
+        return self.__plants.items()
+
+    def add(self, plant: Plant):
+        if plant.id is not None and self.__plants.get(plant.id) is plant:
+            return plant.id
+
+        plant.id = self.__next_id
+        self.__next_id += 1
+
+        self.__plants[plant.id] = plant
+        self.__cells[plant.id] = set()
+        return plant.id
+
+    def restore(self, plants: Iterable[Plant], next_id: int):
+        """Replace the content with plants that already have ids, none of them occupies tiles yet"""
+        self.__plants = {plant.id: plant for plant in plants}
+        self.__cells = {plant_id: set() for plant_id in self.__plants}
+        self.__next_id = next_id
+
+    def get(self, plant_id: int) -> Union[Plant, None]:
+        return self.__plants.get(plant_id)
+
+    def remove(self, plant_id: int):
+        if self.__cells[plant_id]:
+            logger.warning(f"Plant #{plant_id} removed while occupying {len(self.__cells[plant_id])} tiles")
+
+        del self.__plants[plant_id]
+        del self.__cells[plant_id]
+
+    def track(self, plant_id: int, x: int, y: int):
+        self.__cells[plant_id].add((x, y))
+
+    def untrack(self, plant_id: int, x: int, y: int):
+        self.__cells[plant_id].discard((x, y))
+
+    def cells(self, plant_id: int):
+        """(x, y) of every tile occupied by the plant"""
+        return frozenset(self.__cells[plant_id])
+
+    def bounds(self, plant_id: int):
+        """(min_x, min_y, max_x, max_y) of the plant's tiles in grid coordinates, None if it has none"""
+        cells = self.__cells[plant_id]
+        if not cells:
+            return None
+
+        xs, ys = zip(*cells)
+        return min(xs), min(ys), max(xs), max(ys)
@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from typing import Dict, Final, Tuple
+
+from src.simulation.kinds import CellKind
+
+
+@dataclass(frozen=True)
+class ProfileTotals:
+    """Sums over the steps since the previous `StepProfile.pop_totals`"""
+
+    steps: int
+    durations: Dict[str, float]
+    created: int
+    removed: int
+
+    @property
+    def total(self):
+        return sum(self.durations.values())
+
+
+class StepProfile:
+    """
+    Seconds spent in every update phase and number of tiles filled and emptied during the last step,
+    and their sums over the steps since `pop_totals` was last called, for callers that run several steps at once
+    """
+
+    __EMPTY: Final = CellKind.EMPTY
+
+    def __init__(self, phases: Tuple[str, ...]):
+        self.__durations: Dict[str, float] = dict.fromkeys(phases, 0.0)
+        self.__created = 0
+        self.__removed = 0
+
+        self.__steps = 0
+        self.__total_durations: Dict[str, float] = dict.fromkeys(phases, 0.0)
+        self.__total_created = 0
+        self.__total_removed = 0
+
+    @property
+    def durations(self):
+        return self.__durations.copy()
+
+    @property
+    def total(self):
+        return sum(self.__durations.values())
+
+    @property
+    def created(self):
+        return self.__created
+
+    @property
+    def removed(self):
+        return self.__removed
+
+    def pop_totals(self):
+        totals = ProfileTotals(self.__steps, self.__total_durations.copy(), self.__total_created,
+                               self.__total_removed)
+
+        self.__steps = 0
+        self.__total_durations = dict.fromkeys(self.__total_durations, 0.0)
+        self.__total_created = 0
+        self.__total_removed = 0
+        return totals
+
+    def begin_step(self):
+        self.__created = 0
+        self.__removed = 0
+        self.__steps += 1
+
+    def record_phase(self, phase: str, seconds: float):
+        self.__durations[phase] = seconds
+        self.__total_durations[phase] += seconds
+
+    def tile_changed(self, previous_kind: int, kind: int):
+        if previous_kind == self.__EMPTY and kind != self.__EMPTY:
+            self.__created += 1
+            self.__total_created += 1
+        elif previous_kind != self.__EMPTY and kind == self.__EMPTY:
+            self.__removed += 1
+            self.__total_removed += 1
@@ -0,0 +1,78 @@
+from typing import Any, Dict, Final, List, Sequence, TypeVar, Union
+
+import numpy as np
+from numpy import typing as npt
+
+from src.funcs import decide
+
+T = TypeVar("T")
+
+RandomSeed = Union[int, np.random.SeedSequence, np.random.Generator, None]
+
+
+class RandomStream:
+    """
+    Uniform values drawn from a numpy Generator in blocks and handed out one at a time.
+    Integers and choices are derived from the same uniform values, so every draw advances the stream by one
+    """
+
+    BLOCK_SIZE: Final = 4096
+
+    def __init__(self, seed: RandomSeed = None, block_size: int = BLOCK_SIZE):
+        if block_size <= 0:
+            raise ValueError("Required: block_size > 0")
+
+        self.__generator = np.random.default_rng(seed)
+        self.__block_size = block_size
+        self.__block: List[float] = []
+        self.__position = 0
+
+    @property
+    def generator(self):
+        return self.__generator
+
+    def get_state(self):
+        """State of the bit generator and the buffered values that have not been consumed yet"""
+        return self.__generator.bit_generator.state, np.array(self.__block[self.__position:], np.float64)
+
+    def set_state(self, state: Dict[str, Any], pending: npt.NDArray[np.float64]):
+        bit_generator = getattr(np.random, state["bit_generator"])()
+        bit_generator.state = state
+
+        self.__generator = np.random.Generator(bit_generator)
+        self.__block = pending.tolist()
+        self.__position = 0
+
+    def random(self) -> float:
+        """Uniform float in [0, 1)"""
+        if self.__position == len(self.__block):
+            self.__block = self.__generator.random(self.__block_size).tolist()
+            self.__position = 0
+
+        value = self.__block[self.__position]
+        self.__position += 1
+        return value
+
+    def randbelow(self, n: int):
+        """Uniform int in [0, n)"""
+        if n <= 0:
+            raise ValueError("Required: n > 0")
+
+        return int(self.random() * n)
+
+    def randrange(self, stop: int):
+        return self.randbelow(stop)
+
+    def randint(self, a: int, b: int):
+        """Uniform int in [a, b]"""
+        return a + self.randbelow(b - a + 1)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        return seq[self.randbelow(len(seq))]
+
+    def decide(self, probability: float):
+        return decide(probability, self.random)
+
+
+# used by cells and genomes that do not belong to a garden
+default_stream: Final = RandomStream()
@@ -0,0 +1,16 @@
+from typing import Final, Tuple
+
+SPRITE_SIZE: Final = 4
+
+# (u, v) of every cell sprite in image bank 0, addressed by index
+SPRITES: Final[Tuple[Tuple[int, int], ...]] = (
+    (0, 0),
+    (4, 0), (8, 0), (12, 0), (0, 4), (4, 4), (8, 4), (12, 4),
+    (4, 8), (8, 8), (12, 8),
+    (0, 8),
+)
+
+BLANK_SPRITE: Final = 0
+STEM_SPRITES: Final = range(1, 8)
+BULB_SPRITES: Final = range(8, 11)
+SEED_SPRITE: Final = 11
@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Union
+
+import numpy as np
+from numpy import typing as npt
+
+
+@dataclass
+class GardenState:
+    """
+    Complete state of a garden as flat arrays, independent of the backend that produced it.
+    Tile arrays have the (height, width) shape of the grid, plant arrays have one entry per plant
+    """
+
+    steps: int
+
+    kinds: npt.NDArray[np.uint8]
+    sprites: npt.NDArray[np.uint8]
+    plant_ids: npt.NDArray[np.int32]
+
+    # energy of bulbs and seeds, index into `genomes` and active chromosome of their genome, -1 for other tiles
+    energy: npt.NDArray[np.int32]
+    genome_index: npt.NDArray[np.int32]
+    chromosome: npt.NDArray[np.uint8]
+
+    # (count, genome_size, chromosome_length, 2) unique genomes
+    genomes: npt.NDArray[np.uint8]
+
+    plant_id: npt.NDArray[np.int32]
+    plant_energy: npt.NDArray[np.int64]
+    plant_capacity: npt.NDArray[np.int64]
+    plant_age: npt.NDArray[np.int64]
+    plant_alive: npt.NDArray[np.bool_]
+    next_plant_id: int
+
+    # bit generator state and the buffered values not consumed yet
+    rng_state: Dict[str, Any]
+    rng_pending: npt.NDArray[np.float64]
+
+    # width of the column chunks the garden was stored in, 0 for dense storage
+    chunk_width: int = 0
+
+    # fields of the garden's GardenConfig. None only in checkpoints saved before gardens had their own config,
+    # those load with the default config
+    config: Union[Dict[str, Any], None] = None
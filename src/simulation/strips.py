@@ -0,0 +1,228 @@
+import weakref
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Final, List, Tuple, Union
+
+import numpy as np
+from numpy import typing as npt
+
+from src.simulation.cell import Bulb
+from src.simulation.kinds import EMPTY, STEM, BULB, SEED
+from src.simulation.plant import PlantRegistry
+from src.simulation.rng import RandomStream
+from src.simulation.sprites import BLANK_SPRITE, BULB_SPRITES, STEM_SPRITES
+
+# process pools and shared memory are imported by the pools that need them, not by every array garden
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.shared_memory import SharedMemory
+
+# grid layers of an ArrayGarden shared with the workers
+LAYERS: Final = ("kinds", "sprites", "plant_ids", "energy", "genome_ids", "chromosomes")
+
+NO_GENOME: Final = -1
+NO_PLANT: Final = PlantRegistry.NO_PLANT
+# sprite of a landing whose seed died instead of rooting
+NO_SPRITE: Final = -1
+
+# a strip draws only a few values per step, a smaller block keeps the stream setup cheap
+_BLOCK_SIZE: Final = 256
+# (dx, dy) of the tiles a bulb grows into, in the order of its genes
+_GROWTH: Final = tuple((delta.x, delta.y) for delta in Bulb.POS_DELTAS)
+
+
+@dataclass(frozen=True)
+class StripTask:
+    index: int
+    x0: int
+    x1: int
+    # entropy of the random stream of the strip for this step
+    seed: Tuple[int, int]
+    # genes of every genome a bulb in the strip may grow with, by genome id
+    genomes: Dict[int, npt.NDArray[np.uint8]]
+    # energy a bulb needs to grow, see `GardenConfig`
+    energy_to_grow: int
+
+
+@dataclass
+class StripResult:
+    """
+    Changes of one strip the main process still has to apply, every list in the order the changes were made.
+    Tiles of the strip itself are already written to the shared layers
+    """
+
+    index: int
+    # (y, x, kind, plant_id) of every changed tile of the strip, as it was before its first change
+    touched: List[Tuple[int, int, int, int]] = field(default_factory=list)
+    # number of bulbs of every plant that turned into stems
+    grown: Dict[int, int] = field(default_factory=dict)
+    # change of the number of tiles referring to every genome
+    genome_refs: Dict[int, int] = field(default_factory=dict)
+    # (y, x, target_x, target_y, sprite, plant_id, genome_id, chromosome) of bulbs growing into the halo
+    border: List[Tuple[int, int, int, int, int, int, int, int]] = field(default_factory=list)
+    # (y, x, energy, sprite) of seeds that reached the ground, see NO_SPRITE
+    landings: List[Tuple[int, int, int, int]] = field(default_factory=list)
+
+
+class StripUpdate:
+    """
+    Cell update pass of ArrayGarden restricted to the columns [x0, x1) of the grid.
+    Cells are updated in row-major order like in the serial pass. The one-column halo on either side of the strip,
+    wrapping around the edges of the grid, is never read or written: growth into it becomes a border proposal.
+    Seeds that root need a new plant and are left to the main process as well
+    """
+
+    def __init__(self, layers: Dict[str, npt.NDArray], task: StripTask):
+        self.__kinds, self.__sprites, self.__plant_ids, self.__energy, self.__genome_ids, self.__chromosomes = (
+            layers[name] for name in LAYERS)
+        self.__x0, self.__x1 = task.x0, task.x1
+        self.__genomes = task.genomes
+        self.__energy_to_grow = task.energy_to_grow
+        self.__random = RandomStream(np.random.SeedSequence(task.seed), _BLOCK_SIZE)
+        self.__touched = set()
+        self.__result = StripResult(task.index)
+
+    def __refer(self, genome_id: int, delta: int):
+        if genome_id != NO_GENOME:
+            self.__result.genome_refs[genome_id] = self.__result.genome_refs.get(genome_id, 0) + delta
+
+    def __set(self, x: int, y: int, kind: int, sprite: int,
+              plant_id: int = NO_PLANT, energy: int = 0, genome_id: int = NO_GENOME, chromosome: int = 0):
+        if (y, x) not in self.__touched:
+            self.__touched.add((y, x))
+            self.__result.touched.append((y, x, int(self.__kinds[y, x]), int(self.__plant_ids[y, x])))
+
+        self.__refer(int(self.__genome_ids[y, x]), -1)
+        self.__refer(genome_id, 1)
+
+        self.__kinds[y, x] = kind
+        self.__sprites[y, x] = sprite
+        self.__plant_ids[y, x] = plant_id
+        self.__energy[y, x] = energy
+        self.__genome_ids[y, x] = genome_id
+        self.__chromosomes[y, x] = chromosome
+
+    def __clear(self, x: int, y: int):
+        self.__set(x, y, EMPTY, BLANK_SPRITE)
+
+    def __grow_bulb(self, x: int, y: int, plant_id: int, genome_id: int, chromosome: int):
+        height, width = self.__kinds.shape
+        genes = self.__genomes[genome_id][chromosome].tolist()
+
+        for (dx, dy), (dna, active) in zip(_GROWTH, genes):
+            target_x, target_y = (x + dx) % width, y + dy
+            if not active or not 0 <= target_y < height:
+                continue
+
+            if not self.__x0 <= target_x < self.__x1:
+                self.__result.border.append((y, x, target_x, target_y, self.__random.choice(BULB_SPRITES),
+                                             plant_id, genome_id, dna))
+                continue
+
+            if self.__kinds[target_y, target_x] != EMPTY:
+                continue
+
+            self.__set(target_x, target_y, BULB, self.__random.choice(BULB_SPRITES),
+                       plant_id, 1, genome_id, dna)
+
+        self.__result.grown[plant_id] = self.__result.grown.get(plant_id, 0) + 1
+        self.__set(x, y, STEM, self.__random.choice(STEM_SPRITES), plant_id)
+
+    def __update_seed(self, x: int, y: int, sprite: int, energy: int, genome_id: int, chromosome: int):
+        height = self.__kinds.shape[0]
+        if y + 1 < height and self.__kinds[y + 1, x] == EMPTY:
+            self.__set(x, y + 1, SEED, sprite, NO_PLANT, energy, genome_id, chromosome)
+            self.__clear(x, y)
+            return
+
+        if y + 1 == height and energy != 0:
+            self.__result.landings.append((y, x, energy, self.__random.choice(BULB_SPRITES)))
+            return
+
+        self.__result.landings.append((y, x, energy, NO_SPRITE))
+        self.__clear(x, y)
+
+    def run(self):
+        # read up front like in the serial pass: no cell changes before its own update
+        kinds = self.__kinds[:, self.__x0:self.__x1]
+        energy = self.__energy[:, self.__x0:self.__x1]
+        ys, xs = np.nonzero((kinds == SEED) | ((kinds == BULB) & (energy >= self.__energy_to_grow)))
+        xs += self.__x0
+
+        for y, x, kind, cell_energy, sprite, plant_id, genome_id, chromosome in zip(
+                ys.tolist(), xs.tolist(), *(layer[ys, xs].tolist() for layer in (
+                    self.__kinds, self.__energy, self.__sprites, self.__plant_ids, self.__genome_ids,
+                    self.__chromosomes))):
+            if kind == BULB:
+                self.__grow_bulb(x, y, plant_id, genome_id, chromosome)
+            else:
+                self.__update_seed(x, y, sprite, cell_energy, genome_id, chromosome)
+
+        return self.__result
+
+
+# layers of the pool a worker process belongs to, attached once when the worker starts
+_memory: List['SharedMemory'] = []
+_layers: Dict[str, npt.NDArray] = {}
+
+
+def _attach(specs: List[Tuple[str, str, Tuple[int, ...], str]]):
+    from multiprocessing.shared_memory import SharedMemory
+
+    for name, memory_name, shape, dtype in specs:
+        memory = SharedMemory(memory_name)
+        _memory.append(memory)
+        _layers[name] = np.ndarray(shape, dtype, memory.buf)
+
+
+def _update_strip(task: StripTask):
+    return StripUpdate(_layers, task).run()
+
+
+def _release(executor: 'ProcessPoolExecutor', memory: List['SharedMemory']):
+    executor.shutdown()
+    for block in memory:
+        block.unlink()
+        # arrays over the block may still be referenced, the mapping then goes away with the last of them
+        with suppress(BufferError):
+            block.close()
+
+
+class StripPool:
+    """
+    Worker processes running `StripUpdate` on copies of grid layers placed in shared memory.
+    The main process keeps using the shared copies from `layers` between runs
+    """
+
+    def __init__(self, layers: Dict[str, npt.NDArray], workers: Union[int, None] = None):
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing.shared_memory import SharedMemory
+
+        self.__memory: List[SharedMemory] = []
+        self.__layers: Dict[str, npt.NDArray] = {}
+        specs = []
+
+        for name, layer in layers.items():
+            memory = SharedMemory(create=True, size=max(layer.nbytes, 1))
+            shared = np.ndarray(layer.shape, layer.dtype, memory.buf)
+            shared[...] = layer
+
+            self.__memory.append(memory)
+            self.__layers[name] = shared
+            specs.append((name, memory.name, layer.shape, layer.dtype.str))
+
+        self.__executor = ProcessPoolExecutor(workers, initializer=_attach, initargs=(specs,))
+        self.__finalizer = weakref.finalize(self, _release, self.__executor, self.__memory)
+
+    @property
+    def layers(self):
+        return self.__layers
+
+    def run(self, tasks: List[StripTask]) -> List[StripResult]:
+        """Results of all tasks in the order of the tasks"""
+        return list(self.__executor.map(_update_strip, tasks))
+
+    def close(self):
+        """Stop the workers and release the shared memory, `layers` must not be used afterwards"""
+        self.__layers = {}
+        self.__finalizer()
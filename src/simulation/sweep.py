@@ -0,0 +1,162 @@
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.simulation.backends import BACKENDS
+from src.simulation.config import GardenConfig, default_config
+from src.simulation.ensemble import init_worker, spawn_seeds
+from src.simulation.kinds import CellKind
+from src.simulation.metrics import MetricsRecorder
+from src.types import Number
+
+Point = Dict[str, Any]
+
+
+def grid_points(grid: Dict[str, Sequence]) -> List[Point]:
+    """Every combination of the values of the GardenConfig fields in `grid`"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def random_points(space: Dict[str, Union[Tuple[Number, Number], Sequence]], count: int, seed: int = 0) -> List[Point]:
+    """
+    `count` points drawn from `space`: a (low, high) tuple is sampled uniformly, inclusive for int fields,
+    a list is chosen from
+    """
+    types = GardenConfig.field_types()
+    random = np.random.default_rng(seed)
+
+    def draw(name: str, values: Union[Tuple[Number, Number], Sequence]):
+        if isinstance(values, tuple):
+            low, high = values
+            value = random.integers(low, high + 1) if types[name] is int else random.uniform(low, high)
+        else:
+            value = values[random.integers(len(values))]
+
+        return types[name](value)
+
+    return [{name: draw(name, values) for name, values in space.items()} for _ in range(count)]
+
+
+@dataclass(frozen=True)
+class SweepRun:
+    index: int
+    # index of the point in the sweep and the config fields it changes
+    point: int
+    params: Point
+    seed: int
+    size: Tuple[int, int]
+    steps: int
+    backend: str = "object"
+    # number of metric samples, taken every `plateau_every` steps, the population has to stay within
+    # `plateau_tolerance` of its mean for the run to stop early. 0 never stops early
+    plateau_window: int = 0
+    plateau_every: int = 1
+    plateau_tolerance: float = 0.0
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    index: int
+    point: int
+    params: Point
+    seed: int
+    # why the run ended: one of STOP_REASONS
+    stop: str
+    steps: int
+    survival_time: int
+    peak_plants: int
+    plants: int
+    stems: int
+    bulbs: int
+    seeds: int
+    genomes: int
+    elapsed: float
+
+    STOP_REASONS = ("steps", "extinct", "plateau")
+
+    @staticmethod
+    def field_names(param_names: Sequence[str]):
+        """Columns of `row`: the swept parameters first"""
+        return [*param_names, *(field.name for field in fields(SweepResult) if field.name != "params")]
+
+    def row(self):
+        return {**self.params, **{field.name: getattr(self, field.name) for field in fields(SweepResult)
+                                  if field.name != "params"}}
+
+
+def plateaued(metrics: MetricsRecorder, tolerance: float):
+    """Whether plants and occupied tiles stayed within `tolerance` of their mean over the whole recorder"""
+    if len(metrics) < metrics.capacity:
+        return False
+
+    columns = metrics.columns()
+    for values in (columns["plants"], columns["stems"] + columns["bulbs"] + columns["seeds"]):
+        if values.max() - values.min() > tolerance * max(values.mean(), 1):
+            return False
+
+    return True
+
+
+def run_point(run: SweepRun):
+    start = time.perf_counter()
+    garden = BACKENDS[run.backend](run.size, run.seed, config=default_config().replace(**run.params))
+    metrics = None
+    if run.plateau_window:
+        metrics = garden.enable_metrics(MetricsRecorder(run.plateau_window, run.plateau_every))
+
+    stop = "steps"
+    survival_time = 0
+    peak_plants = 0
+
+    for step in range(1, run.steps + 1):
+        garden.update()
+        peak_plants = max(peak_plants, len(garden.plants))
+
+        if garden.is_extinct:
+            stop = "extinct"
+            break
+        survival_time = step
+
+        if metrics is not None and step % run.plateau_every == 0 and plateaued(metrics, run.plateau_tolerance):
+            stop = "plateau"
+            break
+
+    counts = garden.cell_counts()
+    return SweepResult(run.index, run.point, run.params, run.seed, stop, garden.steps, survival_time, peak_plants,
+                       len(garden.plants), counts[CellKind.STEM], counts[CellKind.BULB], counts[CellKind.SEED],
+                       garden.distinct_genomes(), time.perf_counter() - start)
+
+
+def run_sweep(points: Sequence[Point], size: Tuple[int, int], steps: int, replicates: int = 1, seed: int = 0,
+              workers: Union[int, None] = None, backend: str = "object",
+              plateau_window: int = 0, plateau_every: int = 1, plateau_tolerance: float = 0.0, quiet: bool = True):
+    """
+    Run `replicates` gardens for every point in a process pool, every point with the same garden seeds.
+    A run stops once its garden is extinct, once its population has plateaued (see `SweepRun`) or after `steps`.
+    Results are yielded as soon as each run finishes, in completion order
+    """
+    if replicates < 0:
+        raise ValueError("Required: replicates >= 0")
+    if backend not in BACKENDS:
+        raise ValueError(f"Required: backend in {tuple(BACKENDS)}; Got: {backend}")
+    if plateau_window < 0 or plateau_every <= 0:
+        raise ValueError("Required: plateau_window >= 0 and plateau_every > 0")
+
+    # invalid names and values fail here rather than in the workers
+    for point in points:
+        default_config().replace(**point)
+
+    seeds = spawn_seeds(seed, replicates)
+    runs = [SweepRun(index, point, dict(points[point]), garden_seed, size, steps, backend,
+                     plateau_window, plateau_every, plateau_tolerance)
+            for index, (point, garden_seed) in enumerate(itertools.product(range(len(points)), seeds))]
+
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(quiet,)) as executor:
+        futures = [executor.submit(run_point, run) for run in runs]
+        for future in as_completed(futures):
+            yield future.result()
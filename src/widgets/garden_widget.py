@@ -1,15 +1,51 @@
-from typing import Union, Literal
+from typing import Union, Literal, Final, Tuple
 
+import numpy as np
 import pyxel as px
+from numpy import typing as npt
 
+from src.funcs import linear_remap
 from src.helper.vec import Vec2
-from src.simulation.garden import Garden
+from src.simulation.garden import BaseGarden
+from src.simulation.kinds import CellKind
+from src.simulation.sprites import SPRITES, SPRITE_SIZE
+from src.widgets.image import Image
+from src.widgets.pixel_buffer import PixelBuffer
+from src.widgets.tile_canvas import TileCanvas
+from src.widgets.viewport import Viewport
 
 
 class GardenWidget:
-    def __init__(self, garden: Garden, position: Vec2):
+    """
+    Draws the part of a garden in its viewport, see `Viewport`.
+    Every draw mode only reads the visible tiles; zoomed out, blocks of tiles are drawn as single pixels.
+    Overlays are computed as arrays of color indices and drawn with one blt
+    """
+
+    __ENERGY_COLORS: Final = (px.COLOR_NAVY, px.COLOR_PURPLE, px.COLOR_YELLOW)
+    __SHADOW_COLORS: Final = (px.COLOR_GRAY, px.COLOR_NAVY)
+    __ID_COLORS: Final = tuple(range(1, 15))
+    # color of the kind most tiles of a block have, when zoomed out too far for sprites
+    __KIND_COLORS: Final = (px.COLOR_BLACK, px.COLOR_GREEN, px.COLOR_LIME, px.COLOR_BROWN)
+    # left out of overlays, none of the colors above except that of empty tiles is black
+    __TRANSPARENT: Final = px.COLOR_BLACK
+
+    __IMAGES: Final = tuple(Image(SPRITE_SIZE, SPRITE_SIZE, u, v, 0) for u, v in SPRITES)
+
+    TILE_SIZE: Final = 4
+
+    def __init__(self, garden: BaseGarden, position: Vec2, border_color: int,
+                 view_size: Union[Tuple[int, int], None] = None):
+        """`view_size` - (width, height) pixels the garden is shown in, the whole garden at TILE_SIZE by default"""
         self.__garden = garden
         self.__position = position
+        self.__border_color = border_color
+        self.__canvas = TileCanvas(self.__IMAGES, self.TILE_SIZE)
+        self.__overlay = PixelBuffer()
+
+        if view_size is None:
+            view_size = tuple(map(lambda s: s * self.TILE_SIZE, garden.size))
+        self.__viewport = Viewport(view_size, Viewport.ZOOMS.index((self.TILE_SIZE, 1)))
 
     @property
     def position(self):
@@ -17,7 +53,11 @@ class GardenWidget:
 
     @property
     def size(self):
-        return tuple(map(lambda s: s * Garden.TILE_SIZE, self.garden.size))
+        return self.__viewport.size
+
+    @property
+    def viewport(self):
+        return self.__viewport
 
     @property
     def garden(self):
@@ -26,11 +66,113 @@ class GardenWidget:
     @garden.setter
     def garden(self, value):
         self.__garden = value
+        self.__viewport.pan(0, 0, value.size)
+
+    def pan(self, dx: int, dy: int):
+        """Move the view by about (dx, dy) pixels"""
+        self.__viewport.pan(dx, dy, self.garden.size)
+
+    def zoom_in(self):
+        self.__viewport.zoom_in(self.garden.size)
+
+    def zoom_out(self):
+        self.__viewport.zoom_out(self.garden.size)
+
+    def __columns(self, layer: npt.ArrayLike, fill=0):
+        """Dense copy of the visible columns of a grid layer, over the whole height"""
+        x0, _, x1, _ = self.__viewport.visible(self.garden.size)
+        columns = np.full((self.garden.size[1], x1 - x0), fill, layer.dtype)
+
+        for region_x0, region_x1 in self.garden.occupied_regions():
+            left, right = max(region_x0, x0), min(region_x1, x1)
+            if left < right:
+                columns[:, left - x0:right - x0] = layer[:, left:right]
+
+        return columns
+
+    def __window(self, layer: npt.ArrayLike, fill=0):
+        """Dense copy of the visible tiles of a grid layer"""
+        _, y0, _, y1 = self.__viewport.visible(self.garden.size)
+        return self.__columns(layer, fill)[y0:y1]
+
+    def __blocks(self, values: npt.NDArray, fill=0):
+        """(rows, columns, tiles) blocks of `tiles_per_pixel` squared tiles, padded with `fill` to whole blocks"""
+        block = self.__viewport.tiles_per_pixel
+        height, width = values.shape
+        rows, columns = -(-height // block), -(-width // block)
+
+        padded = np.full((rows * block, columns * block), fill, values.dtype)
+        padded[:height, :width] = values
+        return padded.reshape(rows, block, columns, block).swapaxes(1, 2).reshape(rows, columns, -1)
+
+    def __draw_cells(self, target, colors: npt.NDArray, mask: Union[npt.NDArray, None] = None):
+        """Fill the squares of every visible tile, or block of tiles, where `mask` is set, all of them by default"""
+        if mask is not None:
+            colors = np.where(mask, colors, self.__TRANSPARENT)
+
+        self.__overlay.draw(colors, *self.position, self.__viewport.pixels_per_tile, target,
+                            None if mask is None else self.__TRANSPARENT)
+
+    def draw(self, draw_mode: Union[Literal["draw_plants", "draw_plants_id", "draw_shadow", "draw_energy"], str],
+             target: Union[px.Image, None] = None):
+        target = px if target is None else target
+        target.rect(*self.position, *self.size, px.COLOR_BLACK)
+        getattr(self, draw_mode)(target)
+        self.draw_border(target)
+
+    def draw_energy(self, target: Union[px.Image, None] = None):
+        occupied = self.__window(self.garden.kinds) != CellKind.EMPTY
+        light = self.__window(self.garden.light)
+
+        if self.__viewport.tiles_per_pixel > 1:
+            # average light of the occupied tiles of every block
+            count = self.__blocks(occupied).sum(axis=-1)
+            light = self.__blocks(light * occupied).sum(axis=-1) / np.maximum(count, 1)
+            occupied = count > 0
+            self.__draw_cells(target, self.__energy_colors(light), occupied)
+        else:
+            # the light of a tile is one of 0..sun_level, so the colors of all levels are looked up instead
+            self.__draw_cells(target, self.__energy_colors(np.arange(self.garden.sun_level + 1))[light], occupied)
+
+    def __energy_colors(self, light: npt.NDArray):
+        index = np.floor(linear_remap(light, 0, self.garden.sun_level, 0, len(self.__ENERGY_COLORS) - 1))
+        return np.asarray(self.__ENERGY_COLORS, np.uint8)[index.astype(np.intp)]
+
+    def draw_shadow(self, target: Union[px.Image, None] = None):
+        # a tile is in shadow from the first occupied tile of its column downwards
+        _, y0, _, y1 = self.__viewport.visible(self.garden.size)
+        shadow = np.logical_or.accumulate(self.__columns(self.garden.kinds) != CellKind.EMPTY, axis=0)[y0:y1]
+        if self.__viewport.tiles_per_pixel > 1:
+            shadow = self.__blocks(shadow).mean(axis=-1) >= 0.5
+
+        self.__draw_cells(target, np.asarray(self.__SHADOW_COLORS, np.uint8)[shadow.astype(np.intp)])
+
+    def draw_plants(self, target: Union[px.Image, None] = None):
+        if self.__viewport.tiles_per_pixel == 1:
+            self.__canvas.sync(self.garden, self.__viewport.visible(self.garden.size))
+            self.__canvas.draw(*self.position, target, self.__viewport.pixels_per_tile)
+            return
+
+        blocks = self.__blocks(self.__window(self.garden.kinds))
+        counts = np.stack([np.count_nonzero(blocks == kind, axis=-1) for kind in CellKind], axis=-1)
+        counts[..., CellKind.EMPTY] = 0
+
+        kinds = counts.argmax(axis=-1)
+        self.__draw_cells(target, np.asarray(self.__KIND_COLORS, np.uint8)[kinds], kinds != CellKind.EMPTY)
+
+    def draw_plants_id(self, target: Union[px.Image, None] = None):
+        plant_ids = self.__window(self.garden.plant_ids)
+        if self.__viewport.tiles_per_pixel > 1:
+            # the newest plant of every block
+            plant_ids = self.__blocks(plant_ids).max(axis=-1)
+
+        colors = np.asarray(self.__ID_COLORS, np.uint8)[plant_ids % len(self.__ID_COLORS)]
+        self.__draw_cells(target, colors, plant_ids != BaseGarden.NO_PLANT)
 
-    def draw(self, draw_mode: Union[Literal["draw_plants", "draw_plants_id", "draw_shadow", "draw_energy"], str]):
-        px.rect(*self.position.as_tuple, *self.size, px.COLOR_BLACK)
-        getattr(self.__garden, draw_mode)(self.position)
-        self.garden.draw_border(self.position)
+    def draw_border(self, target: Union[px.Image, None] = None):
+        target = px if target is None else target
+        (x, y), (width, height) = self.position, self.size
+        target.rectb(x - 1, y - 1, width + 2, height + 2, self.__border_color)
 
     def update(self):
         self.garden.update()
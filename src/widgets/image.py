@@ -2,7 +2,6 @@ from typing import Union
 
 import pyxel as px
 
-from src.helper.vec import Vec2
 from src.types import Number
 
 
@@ -10,13 +9,12 @@ class Image:
     def __init__(self, width: Number, height: Number,
                  u: Number, v: Number,
                  bank: Union[int, px.Image], transparency_key: Union[int, None] = None):
-        self.__size = Vec2(width, height)
-        self.__uv = Vec2(u, v)
+        # (u, v, width, height) as `blt` takes them, drawn for every tile
+        self.__source = (u, v, width, height)
 
         self.__bank = bank
         self.__transparency_key = transparency_key
 
-    def draw(self, x: Number, y: Number):
-        px.blt(x, y, self.__bank,
-               *self.__uv.as_tuple, *self.__size.as_tuple,
-               self.__transparency_key)
+    def draw(self, x: Number, y: Number, target: Union[px.Image, None] = None):
+        target = px if target is None else target
+        target.blt(x, y, self.__bank, *self.__source, self.__transparency_key)
@@ -34,10 +34,10 @@ class Label:
         if not self.__visible:
             return
 
-        if self.__relative_to is None:
-            x, y = self.__position.as_tuple
-        else:
-            x, y = (self.__relative_to.position + self.__position).as_tuple
+        x, y = self.__position
+        if self.__relative_to is not None:
+            x0, y0 = self.__relative_to.position
+            x, y = x0 + x, y0 + y
 
         for line in self.__lines:
             px.text(x, y, line, self.__color)
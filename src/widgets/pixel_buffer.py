@@ -0,0 +1,36 @@
+from typing import Union
+
+import numpy as np
+import pyxel as px
+from numpy import typing as npt
+
+
+def pixels(image: px.Image) -> npt.NDArray[np.uint8]:
+    """(height, width) color indices of an image, writing to the array writes to the image"""
+    return np.frombuffer(image.data_ptr(), np.uint8).reshape(image.height, image.width)
+
+
+class PixelBuffer:
+    """Offscreen image filled from a whole array of color indices at once and drawn with a single blt"""
+
+    def __init__(self):
+        self.__image: Union[px.Image, None] = None
+
+    def draw(self, colors: npt.NDArray, x: int, y: int, scale: int = 1,
+             target: Union[px.Image, None] = None, transparent: Union[int, None] = None):
+        """Draw every entry of `colors` as a `scale` x `scale` square, skipping the `transparent` color"""
+        rows, columns = colors.shape
+        width, height = columns * scale, rows * scale
+        if width == 0 or height == 0:
+            return
+
+        if self.__image is None or (self.__image.width, self.__image.height) != (width, height):
+            self.__image = px.Image(width, height)
+
+        # widening the rows first and copying each of them `scale` times is several times faster than
+        # broadcasting into all four axes at once
+        rows_of_pixels = np.repeat(colors.astype(np.uint8, copy=False), scale, axis=1)
+        pixels(self.__image).reshape(rows, scale, width)[...] = rows_of_pixels[:, None, :]
+
+        target = px if target is None else target
+        target.blt(x, y, self.__image, 0, 0, width, height, transparent)
@@ -0,0 +1,98 @@
+from typing import Dict, Final, Union
+
+import pyxel as px
+
+from src.helper.vec import Vec2
+from src.protocols import Positionable
+from src.simulation.garden import BaseGarden
+from src.simulation.kinds import CellKind
+from src.widgets.label import Label
+
+
+class ProfilerHud:
+    """
+    Overlay with the time spent per frame in every update phase and in drawing the garden, along with live counters.
+    Profiling of the garden is only enabled while the overlay is visible
+    """
+
+    __PHASE_NAMES: Final = {
+        "update_energy": "energy",
+        "update_cells": "cells",
+        "update_plants_age": "age",
+        "update_dead_plants": "dead",
+    }
+
+    # weight of the newest sample in the displayed averages
+    __SMOOTHING: Final = 0.1
+
+    __SIZE: Final = Vec2(116, 94)
+    __COLOR: Final = px.COLOR_WHITE
+    __BACKGROUND: Final = px.COLOR_BLACK
+    __BORDER: Final = px.COLOR_GRAY
+
+    def __init__(self, position: Vec2, relative_to: Union[Positionable, None] = None):
+        self.__position = position
+        self.__relative_to = relative_to
+        self.__label = Label(Vec2(3, 3), [], self.__COLOR, self)
+        self.__visible = False
+
+        self.__averages: Dict[str, float] = {}
+
+    @property
+    def position(self):
+        if self.__relative_to is None:
+            return self.__position
+        else:
+            return self.__relative_to.position + self.__position
+
+    @property
+    def visible(self):
+        return self.__visible
+
+    def toggle(self):
+        self.__visible = not self.__visible
+        self.__averages.clear()
+
+    def __average(self, name: str, seconds: float):
+        previous = self.__averages.get(name, seconds)
+        self.__averages[name] = previous + (seconds - previous) * self.__SMOOTHING
+        return self.__averages[name] * 1000
+
+    def record_draw(self, seconds: float):
+        if self.__visible:
+            self.__average("draw", seconds)
+
+    def update(self, garden: BaseGarden):
+        if not self.__visible:
+            garden.disable_profiling()
+            return
+
+        profile = garden.profile
+        if profile is None:
+            garden.enable_profiling()
+            return
+
+        # fast-forward runs several steps per frame: timings and tile counters are summed over the frame
+        totals = profile.pop_totals()
+        if totals.steps == 0:
+            return
+
+        counts = garden.cell_counts()
+        occupied = sum(counts.values()) - counts[CellKind.EMPTY]
+
+        self.__label.clear()
+        self.__label.add_line(f"step {garden.steps}  {totals.steps}/frame")
+        self.__label.add_line(f"update {self.__average('update', totals.total):7.2f} ms")
+        for phase, seconds in totals.durations.items():
+            self.__label.add_line(f"  {self.__PHASE_NAMES.get(phase, phase):<6} {self.__average(phase, seconds):6.2f}")
+        self.__label.add_line(f"draw   {self.__averages.get('draw', 0.0) * 1000:7.2f} ms")
+        self.__label.add_line(f"tiles {occupied} +{totals.created} -{totals.removed}")
+        self.__label.add_line(f"plants {len(garden.plants)} b {counts[CellKind.BULB]} s {counts[CellKind.SEED]}")
+
+    def draw(self):
+        if not self.__visible:
+            return
+
+        px.rect(*self.position, *self.__SIZE, self.__BACKGROUND)
+        px.rectb(*self.position, *self.__SIZE, self.__BORDER)
+        self.__label.draw()
@@ -0,0 +1,92 @@
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+import pyxel as px
+
+from src.simulation.garden import BaseGarden
+from src.simulation.kinds import CellKind
+from src.widgets.image import Image
+from src.widgets.pixel_buffer import PixelBuffer, pixels
+
+
+class TileCanvas:
+    """
+    Offscreen image mirroring the sprites of a window of (x0, y0, x1, y1) tiles of a garden.
+    Only tiles reported by `BaseGarden.pop_dirty_tiles` are redrawn while the window stays the same,
+    the whole window is then drawn with one blt
+    """
+
+    def __init__(self, images: Sequence[Image], tile_size: int, background: int = px.COLOR_BLACK):
+        self.__images = images
+        self.__tile_size = tile_size
+        self.__background = background
+
+        self.__garden: Union[BaseGarden, None] = None
+        self.__window: Tuple[int, int, int, int] = (0, 0, 0, 0)
+        self.__image: Union[px.Image, None] = None
+        self.__scaled = PixelBuffer()
+
+    def __draw_tile(self, x: int, y: int, kind: int, sprite: int):
+        x0, y0, _, _ = self.__window
+        u, v = (x - x0) * self.__tile_size, (y - y0) * self.__tile_size
+
+        if kind == CellKind.EMPTY:
+            self.__image.rect(u, v, self.__tile_size, self.__tile_size, self.__background)
+        else:
+            self.__images[sprite].draw(u, v, self.__image)
+
+    def __rebuild(self, garden: BaseGarden):
+        x0, y0, x1, y1 = self.__window
+        width, height = (x1 - x0) * self.__tile_size, (y1 - y0) * self.__tile_size
+        if self.__image is None or (self.__image.width, self.__image.height) != (width, height):
+            self.__image = px.Image(max(width, 1), max(height, 1))
+
+        self.__image.cls(self.__background)
+
+        kinds = garden.kinds
+        sprites = garden.sprites
+        for region_x0, region_x1 in garden.occupied_regions():
+            left, right = max(region_x0, x0), min(region_x1, x1)
+            if left >= right:
+                continue
+
+            region_sprites = sprites[:, left:right][y0:y1]
+            for y, x in zip(*map(np.ndarray.tolist, np.nonzero(kinds[:, left:right][y0:y1]))):
+                self.__images[region_sprites[y, x]].draw((left - x0 + x) * self.__tile_size, y * self.__tile_size,
+                                                         self.__image)
+
+    def sync(self, garden: BaseGarden, window: Tuple[int, int, int, int]):
+        dirty = garden.pop_dirty_tiles(self)
+
+        if dirty is None or garden is not self.__garden or window != self.__window:
+            if self.__garden is not None and garden is not self.__garden:
+                self.__garden.untrack_dirty_tiles(self)
+            self.__garden = garden
+            self.__window = window
+            self.__rebuild(garden)
+            return
+
+        x0, y0, x1, y1 = window
+        kinds = garden.kinds
+        sprites = garden.sprites
+        for x, y in dirty:
+            if x0 <= x < x1 and y0 <= y < y1:
+                self.__draw_tile(x, y, kinds[y, x], sprites[y, x])
+
+    def draw(self, x: int, y: int, target: Union[px.Image, None] = None, pixels_per_tile: Union[int, None] = None):
+        """Draw the window with its top left corner at (x, y), scaled to `pixels_per_tile`, the tile size by default"""
+        if self.__image is None:
+            return
+
+        target = px if target is None else target
+        width, height = self.__image.width, self.__image.height
+        if pixels_per_tile is None or pixels_per_tile == self.__tile_size:
+            target.blt(x, y, self.__image, 0, 0, width, height)
+            return
+
+        # scaled in whole pixels: every n-th pixel of each tile when shrinking, n x n squares when growing
+        if pixels_per_tile < self.__tile_size:
+            step = self.__tile_size // pixels_per_tile
+            self.__scaled.draw(pixels(self.__image)[::step, ::step], x, y, 1, target)
+        else:
+            self.__scaled.draw(pixels(self.__image), x, y, pixels_per_tile // self.__tile_size, target)
@@ -0,0 +1,91 @@
+from typing import Final, Tuple
+
+from src.funcs import clamp
+
+
+class Viewport:
+    """
+    Window of `size` pixels onto a grid of tiles, showing the tiles from `origin` on.
+    Zoomed in, every tile is drawn as a square of `pixels_per_tile` pixels; zoomed out,
+    every pixel stands for a block of `tiles_per_pixel` x `tiles_per_pixel` tiles, which the origin is aligned to
+    """
+
+    # (pixels per tile, tiles per pixel) of every zoom level, closest first
+    ZOOMS: Final = ((8, 1), (4, 1), (2, 1), (1, 1), (1, 2), (1, 4), (1, 8))
+
+    def __init__(self, size: Tuple[int, int], zoom: int = 1):
+        if not 0 <= zoom < len(self.ZOOMS):
+            raise ValueError(f"Required: 0 <= zoom < {len(self.ZOOMS)}; Got: {zoom}")
+
+        self.__size = size
+        self.__zoom = zoom
+        self.__origin = (0, 0)
+
+    @property
+    def size(self):
+        return self.__size
+
+    @property
+    def zoom(self):
+        return self.__zoom
+
+    @property
+    def pixels_per_tile(self):
+        return self.ZOOMS[self.__zoom][0]
+
+    @property
+    def tiles_per_pixel(self):
+        return self.ZOOMS[self.__zoom][1]
+
+    @property
+    def origin(self):
+        """(x, y) of the top left visible tile"""
+        return self.__origin
+
+    @property
+    def cells(self):
+        """(columns, rows) of squares drawn: tiles when zoomed in, blocks of tiles when zoomed out"""
+        width, height = self.__size
+        return width // self.pixels_per_tile, height // self.pixels_per_tile
+
+    @property
+    def span(self):
+        """(columns, rows) of tiles the viewport covers"""
+        columns, rows = self.cells
+        return columns * self.tiles_per_pixel, rows * self.tiles_per_pixel
+
+    def visible(self, grid_size: Tuple[int, int]):
+        """[x0, x1) and [y0, y1) tiles of a (width, height) grid in view as (x0, y0, x1, y1)"""
+        (x0, y0), (columns, rows) = self.__origin, self.span
+        return x0, y0, min(x0 + columns, grid_size[0]), min(y0 + rows, grid_size[1])
+
+    def __move_to(self, x: int, y: int, grid_size: Tuple[int, int]):
+        (columns, rows), block = self.span, self.tiles_per_pixel
+        x = clamp(x, 0, max(grid_size[0] - columns, 0))
+        y = clamp(y, 0, max(grid_size[1] - rows, 0))
+        # rounded up, so that the last tiles of the grid stay reachable
+        self.__origin = (-(-x // block) * block, -(-y // block) * block)
+
+    def pan(self, dx: int, dy: int, grid_size: Tuple[int, int]):
+        """Move the view by about (dx, dy) pixels, by at least one tile"""
+        def tiles(pixels: int):
+            moved = pixels * self.tiles_per_pixel // self.pixels_per_tile
+            return moved if moved or not pixels else (1 if pixels > 0 else -1)
+
+        x, y = self.__origin
+        self.__move_to(x + tiles(dx), y + tiles(dy), grid_size)
+
+    def set_zoom(self, zoom: int, grid_size: Tuple[int, int]):
+        """Change the zoom level, keeping the tile in the center of the view in the center"""
+        (x, y), (columns, rows) = self.__origin, self.span
+        center_x, center_y = x + columns // 2, y + rows // 2
+
+        self.__zoom = clamp(zoom, 0, len(self.ZOOMS) - 1)
+        columns, rows = self.span
+        self.__move_to(center_x - columns // 2, center_y - rows // 2, grid_size)
+
+    def zoom_in(self, grid_size: Tuple[int, int]):
+        self.set_zoom(self.__zoom - 1, grid_size)
+
+    def zoom_out(self, grid_size: Tuple[int, int]):
+        self.set_zoom(self.__zoom + 1, grid_size)
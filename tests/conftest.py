@@ -0,0 +1,26 @@
+import os
+
+import numpy as np
+from dotenv import load_dotenv
+
+from src.helper.log import logger
+
+# gardens read the default config from the environment, the way the app and the CLI load it
+load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env"))
+logger.disable("src")
+
+
+def grid(garden):
+    """Copies of the kinds, sprites and plant ids of a garden or a replay"""
+    return [np.array(layer) for layer in (garden.kinds, garden.sprites, garden.plant_ids)]
+
+
+def same_grid(first, second):
+    return all((first_layer == second_layer).all() for first_layer, second_layer in zip(grid(first), grid(second)))
+
+
+def run(garden, steps):
+    """The garden after `steps` more updates"""
+    for _ in range(steps):
+        garden.update()
+    return garden
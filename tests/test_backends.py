@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from conftest import run, same_grid
+from src.simulation.backends import BACKENDS
+
+
+@pytest.mark.parametrize("seed", (1, 3))
+def test_array_backend_replays_object_backend(seed):
+    reference, array = (run(BACKENDS[backend]((70, 100), seed), 300) for backend in ("object", "array"))
+
+    assert same_grid(reference, array)
+    assert reference.cell_counts() == array.cell_counts()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_every_consumer_gets_its_own_dirty_tiles(backend):
+    garden = BACKENDS[backend]((70, 100), 1)
+    assert garden.pop_dirty_tiles("minimap") is None
+    run(garden, 20)
+
+    assert garden.pop_dirty_tiles("view") is None
+    minimap = garden.pop_dirty_tiles("minimap")
+    assert minimap and garden.pop_dirty_tiles("minimap") == set()
+
+    before = np.array(garden.kinds)
+    garden.update()
+    changed = set(zip(*map(np.ndarray.tolist, np.nonzero(np.asarray(garden.kinds) != before)[::-1])))
+    view, minimap = garden.pop_dirty_tiles("view"), garden.pop_dirty_tiles("minimap")
+    assert view == minimap and changed <= view
+
+    garden.untrack_dirty_tiles("view")
+    garden.update()
+    assert garden.pop_dirty_tiles("view") is None
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from conftest import run, same_grid
+from src.simulation import checkpoint
+from src.simulation.backends import BACKENDS
+
+
+@pytest.mark.parametrize("saved_from", BACKENDS)
+@pytest.mark.parametrize("loaded_as", BACKENDS)
+@pytest.mark.parametrize("chunk_width", (None, 16))
+def test_loaded_garden_continues_like_the_saved_one(tmp_path, saved_from, loaded_as, chunk_width):
+    garden = run(BACKENDS[saved_from]((70, 100), 3, chunk_width), 150)
+    path = tmp_path / "garden.npz"
+    checkpoint.save(garden, path, compress=True)
+
+    loaded = checkpoint.load(path, loaded_as)
+    assert type(loaded) is BACKENDS[loaded_as]
+    assert (loaded.steps, loaded.chunk_width, loaded.config) == (150, chunk_width, garden.config)
+
+    run(garden, 150)
+    run(loaded, 150)
+    assert same_grid(garden, loaded)
+    assert loaded.cell_counts() == garden.cell_counts()
+    assert [plant.energy for plant in loaded.plants] == [plant.energy for plant in garden.plants]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_extinct_garden_loads_without_an_initial_seed(backend):
+    garden = BACKENDS[backend]((70, 100), 2)
+    while not garden.is_extinct:
+        garden.update()
+
+    loaded = BACKENDS[backend].from_state(garden.state())
+    assert loaded.is_extinct and not np.asarray(loaded.kinds).any()
+    assert loaded.random.get_state()[0] == garden.random.get_state()[0]
+
+
+def test_newer_checkpoint_versions_are_rejected(tmp_path, monkeypatch):
+    path = tmp_path / "garden.npz"
+    monkeypatch.setattr(checkpoint, "FORMAT_VERSION", checkpoint.FORMAT_VERSION + 1)
+    checkpoint.save(BACKENDS["object"]((10, 10), 1), path)
+    monkeypatch.undo()
+
+    with pytest.raises(ValueError):
+        checkpoint.load(path)
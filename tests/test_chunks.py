@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from conftest import run, same_grid
+from src.simulation.backends import BACKENDS
+from src.simulation.chunks import ChunkedLayer
+
+
+def test_chunks_are_allocated_on_write_and_released_when_empty():
+    layer = ChunkedLayer((4, 10), 4, np.int32, -1)
+    assert layer.allocated == [] and layer.nbytes == 0
+
+    layer[1, 5] = 7
+    assert layer.allocated == [1]
+    assert layer[1, 5] == 7 and layer[0, 0] == -1
+
+    layer[1, 5] = -1
+    assert layer.allocated == []
+
+
+def test_chunked_layer_matches_dense_array():
+    rng = np.random.default_rng(0)
+    dense = np.zeros((5, 23), np.uint8)
+    layer = ChunkedLayer(dense.shape, 8, np.uint8)
+
+    for _ in range(200):
+        y, x, value = rng.integers(5), rng.integers(23), rng.integers(3)
+        dense[y, x] = value
+        layer[y, x] = value
+
+    assert (np.asarray(layer) == dense).all()
+    assert layer.allocated == [index for index in range(3) if dense[:, index * 8:(index + 1) * 8].any()]
+    assert (layer[:, 8:16] == dense[:, 8:16]).all()
+
+
+def test_slices_across_chunks_are_rejected():
+    layer = ChunkedLayer((4, 10), 4, np.uint8)
+    with pytest.raises(IndexError):
+        layer[:, 2:6]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_chunked_storage_replays_dense_storage(backend):
+    dense = run(BACKENDS[backend]((40, 120), 1), 200)
+    chunked = run(BACKENDS[backend]((40, 120), 1, 16), 200)
+
+    assert same_grid(dense, chunked)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_chunked_garden_keeps_updating_once_extinct(backend):
+    garden = BACKENDS[backend]((70, 100), 2, 16)
+
+    for _ in range(1000):
+        garden.update()
+        if garden.is_extinct:
+            break
+
+    assert garden.is_extinct
+    assert garden.occupied_regions() == []
+
+    steps = garden.steps
+    assert run(garden, 10).steps == steps + 10
@@ -0,0 +1,18 @@
+from src.simulation.ensemble import GardenSpec, run_ensemble, run_garden
+
+
+def test_summary_records_the_steps_actually_run():
+    extinct = run_garden(GardenSpec(0, 2, (70, 100), 2000))
+    assert extinct.max_steps == 2000 and extinct.survival_time < extinct.steps < 2000
+    assert extinct.plants == extinct.stems == extinct.bulbs == extinct.seeds == 0
+
+    kept = run_garden(GardenSpec(0, 2, (70, 100), 2000, stop_when_extinct=False))
+    assert kept.steps == kept.max_steps == 2000 and kept.survival_time == extinct.survival_time
+
+
+def test_ensemble_is_reproducible():
+    def summaries(workers):
+        return sorted((summary.index, summary.seed, summary.steps, summary.survival_time, summary.peak_plants)
+                      for summary in run_ensemble((40, 60), 3, 150, seed=4, workers=workers))
+
+    assert summaries(1) == summaries(2)
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from conftest import run
+from src.simulation.backends import BACKENDS
+from src.simulation.config import default_config
+from src.simulation.env import GardenEnv
+from src.simulation.ensemble import spawn_seeds
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_observations_stack_the_gardens(backend):
+    env = GardenEnv((40, 60), backend)
+    seeds = spawn_seeds(5, 3)
+    first = env.reset(seeds)
+    assert len(env) == 3 and first.kinds.shape == (3, 40, 60) and first.steps.tolist() == [0, 0, 0]
+
+    observation = env.step(50)
+    assert observation.steps.tolist() == [50, 50, 50]
+
+    for index, seed in enumerate(seeds):
+        garden = run(BACKENDS[backend]((40, 60), seed), 50)
+        assert (observation.kinds[index] == np.asarray(garden.kinds)).all()
+        assert (observation.plant_ids[index] == np.asarray(garden.plant_ids)).all()
+        assert (observation.light[index] == np.asarray(garden.light)).all()
+        assert observation.extinct[index] == garden.is_extinct
+
+    # observations are copies that later steps leave alone
+    kinds = observation.kinds.copy()
+    env.step()
+    assert (observation.kinds == kinds).all()
+
+
+def test_stream_observes_every_few_steps():
+    env = GardenEnv((20, 30))
+    env.reset(spawn_seeds(1, 2))
+    assert [observation.steps.tolist() for observation in env.stream(10, 4)] == [[4, 4], [8, 8], [10, 10]]
+
+
+def test_invalid_arguments_are_rejected():
+    with pytest.raises(ValueError):
+        GardenEnv((20, 30), "gpu")
+    with pytest.raises(ValueError):
+        GardenEnv((20, 30), config=default_config().replace(sun_level=300))
+    with pytest.raises(ValueError):
+        list(GardenEnv((20, 30)).stream(10, 0))
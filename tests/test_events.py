@@ -0,0 +1,81 @@
+import numpy as np
+
+from src.simulation.events import BinaryFileSink, EventKind, EventLevel, EventStream, read_events
+
+
+class ListSink:
+    def __init__(self):
+        self.events = []
+        self.closed = False
+
+    def write(self, events):
+        self.events.extend(events["plant"].tolist())
+
+    def close(self):
+        self.closed = True
+
+
+def emit(stream, plants, kind=EventKind.BIRTH):
+    for plant in plants:
+        stream.emit(kind, plant)
+
+
+def test_ring_keeps_the_last_events():
+    stream = EventStream(4)
+    emit(stream, range(10))
+
+    assert stream.emitted == 10
+    assert stream.recent()["plant"].tolist() == [6, 7, 8, 9]
+    assert stream.recent(2)["plant"].tolist() == [8, 9]
+
+
+def test_sinks_receive_every_event_before_the_ring_overwrites_it():
+    stream = EventStream(4)
+    sink = ListSink()
+    stream.add_sink(sink)
+    emit(stream, range(10))
+    stream.close()
+
+    assert sink.events == list(range(10)) and sink.closed
+
+
+def test_late_sinks_receive_what_the_ring_still_holds():
+    stream = EventStream(4)
+    emit(stream, range(10))
+    sink = ListSink()
+    stream.add_sink(sink)
+    emit(stream, range(10, 13))
+    stream.flush()
+
+    assert sink.events == list(range(6, 13))
+
+
+def test_levels_and_sampling_drop_events_before_they_are_stored():
+    stream = EventStream(16, EventLevel.INFO, {EventKind.DEATH: 3})
+    emit(stream, range(5), EventKind.MUTATION)
+    emit(stream, range(7), EventKind.DEATH)
+    emit(stream, range(2), EventKind.BIRTH)
+
+    events = stream.recent()
+    assert events["kind"].tolist() == [EventKind.DEATH] * 2 + [EventKind.BIRTH] * 2
+    assert events["plant"].tolist() == [2, 5, 0, 1]
+
+    stream.configure(sample={EventKind.BIRTH: 0})
+    emit(stream, range(3), EventKind.BIRTH)
+    emit(stream, range(1), EventKind.MUTATION)
+    assert stream.emitted == 5
+
+
+def test_binary_file_sink_round_trips(tmp_path):
+    path = tmp_path / "events.bin"
+    stream = EventStream(4)
+    stream.add_sink(BinaryFileSink(path))
+    stream.set_step(7)
+    for plant in range(9):
+        stream.emit(EventKind.DEATH, plant, plant, -plant, plant * 10, plant + 1)
+    stream.close()
+
+    events = read_events(path)
+    assert events["plant"].tolist() == list(range(9))
+    assert (events["step"] == 7).all() and (events["kind"] == EventKind.DEATH).all()
+    assert np.array_equal(events["y"], -events["x"]) and np.array_equal(events["age"], events["plant"] + 1)
@@ -0,0 +1,59 @@
+import numpy as np
+
+from conftest import run
+from src.simulation.array_garden import ArrayGarden
+from src.simulation.genome_pool import GenomePool
+
+
+def genes(value):
+    return np.full((16, 4, 2), value, np.uint8)
+
+
+def test_genotypes_are_interned_and_counted():
+    pool = GenomePool()
+    first = pool.intern(genes(1))
+    assert pool.intern(genes(1)) == first and pool.find(genes(1)) == first
+    assert pool.find(genes(2)) == GenomePool.NO_GENOME
+    assert not pool.genes(first).flags.writeable
+
+    pool.acquire(first, 2)
+    pool.release(first)
+    pool.collect()
+    assert pool.refs(first) == 1 and pool.alive == 1
+
+    pool.release(first)
+    pool.collect()
+    assert first not in pool and pool.alive == 0 and len(pool) == 0
+
+    # ids are never reused
+    assert pool.intern(genes(1)) != first
+
+
+def test_ancestors_stay_while_a_descendant_lives():
+    pool = GenomePool()
+    root = pool.intern(genes(1))
+    child = pool.intern(genes(2), root)
+    grandchild = pool.intern(genes(3), child)
+    for genome_id in (root, grandchild):
+        pool.acquire(genome_id)
+
+    pool.release(root)
+    pool.collect()
+    assert pool.lineage(grandchild) == [grandchild, child, root]
+    assert pool.depth(grandchild) == 2 and pool.edges() == [(root, child), (child, grandchild)]
+
+    pool.release(grandchild)
+    pool.collect()
+    assert len(pool) == 0
+
+
+def test_references_match_the_tiles_of_a_garden():
+    garden = run(ArrayGarden((70, 100), 3), 300)
+
+    state = garden.state()
+    counts = np.bincount(state.genome_index[state.genome_index >= 0], minlength=len(state.genomes))
+    genome_ids = [garden.genomes.find(genome) for genome in state.genomes]
+    assert [garden.genomes.refs(genome_id) for genome_id in genome_ids] == counts.tolist()
+    assert garden.distinct_genomes() == len(genome_ids) != 0
+    for genome_id in genome_ids:
+        assert all(ancestor in garden.genomes for ancestor in garden.genomes.lineage(genome_id))
@@ -0,0 +1,35 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules only the app, the CLI entry points or logging that is switched on may import
+FORBIDDEN = ("pyxel", "dotenv", "loguru")
+
+
+def imported(code):
+    """Forbidden modules the code pulls in within a fresh interpreter, and what it prints"""
+    check = f"{code}\nimport json, sys\nprint(json.dumps([name for name in {FORBIDDEN!r} if name in sys.modules]))"
+    process = subprocess.run([sys.executable, "-c", check], cwd=ROOT, capture_output=True, text=True, check=True)
+    *output, modules = process.stdout.splitlines()
+    return json.loads(modules), "\n".join(output) + process.stderr
+
+
+@pytest.mark.parametrize("module", ("garden", "backends", "env", "sweep", "checkpoint", "__main__"))
+def test_simulation_imports_without_side_effects(module):
+    assert imported(f"import src.simulation.{module}") == ([], "")
+
+
+def test_quiet_gardens_never_import_loguru():
+    code = ("import os\n"
+            "from src.simulation.config import ENVIRONMENT\n"
+            "os.environ.update(dict.fromkeys(ENVIRONMENT.values(), '1'))\n"
+            "from src.helper.log import logger\n"
+            "logger.disable('src')\n"
+            "from src.simulation.backends import BACKENDS\n"
+            "BACKENDS['object']((20, 30), 1).update()")
+    assert imported(code) == ([], "")
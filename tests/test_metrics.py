@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from conftest import run
+from src.simulation.backends import BACKENDS
+from src.simulation.kinds import CellKind
+from src.simulation.metrics import MetricsRecorder
+
+
+def counted(garden):
+    """cell_counts, plant energy and ages of living plants, counted from scratch"""
+    counts = np.bincount(np.asarray(garden.kinds).ravel(), minlength=len(CellKind))
+    ages = [plant.age for plant in garden.plants if plant.alive]
+    return ({kind: int(counts[kind]) for kind in CellKind}, sum(plant.energy for plant in garden.plants),
+            sorted(ages))
+
+
+def kept(garden):
+    ages = [age for age, count in enumerate(garden.age_counts) for _ in range(count)]
+    return garden.cell_counts(), garden.plant_energy, ages
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("chunk_width", (None, 16))
+def test_counters_match_the_grid_and_plants(backend, chunk_width):
+    garden = BACKENDS[backend]((70, 100), 3, chunk_width)
+    for step in range(400):
+        garden.update()
+        if step % 50 == 0:
+            assert kept(garden) == counted(garden)
+
+    loaded = BACKENDS[backend].from_state(garden.state())
+    assert kept(loaded) == counted(loaded) == counted(garden)
+
+
+def test_recorded_rows_match_the_garden():
+    garden = BACKENDS["object"]((70, 100), 1)
+    recorder = garden.enable_metrics(MetricsRecorder(8, every=3))
+    run(garden, 300)
+
+    counts, energy, ages = counted(garden)
+    row = {name: column[-1] for name, column in recorder.columns().items()}
+    assert len(recorder) == 8 and row["step"] == 300
+    assert row["plants"] == len(garden.plants) and row["energy"] == energy
+    assert row["stems"] == counts[CellKind.STEM] and row["seeds"] == counts[CellKind.SEED]
+    assert row["mean_age"] == np.mean(ages) and row["median_age"] == np.median(ages) and row["max_age"] == max(ages)
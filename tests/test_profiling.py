@@ -0,0 +1,19 @@
+from src.simulation.backends import BACKENDS
+
+
+def test_totals_sum_the_steps_since_the_last_pop():
+    garden = BACKENDS["object"]((70, 100), 1)
+    profile = garden.enable_profiling()
+    durations, created, removed = {}, 0, 0
+
+    for _ in range(120):
+        garden.update()
+        for phase, seconds in profile.durations.items():
+            durations[phase] = durations.get(phase, 0.0) + seconds
+        created, removed = created + profile.created, removed + profile.removed
+
+    totals = profile.pop_totals()
+    assert (totals.steps, totals.created, totals.removed) == (120, created, removed) and created
+    assert totals.durations == durations
+
+    assert profile.pop_totals().steps == 0
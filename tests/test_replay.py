@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pytest
+
+from conftest import grid
+from src.simulation.backends import BACKENDS
+from src.simulation.delta_log import DeltaLog, Replay
+
+
+def record(path, backend, steps, keyframe_every):
+    """Grids of every step of a logged run"""
+    garden = BACKENDS[backend]((70, 100), 1)
+    garden.enable_delta_log(path, keyframe_every)
+    grids = [grid(garden)]
+    for _ in range(steps):
+        garden.update()
+        grids.append(grid(garden))
+
+    return garden, grids
+
+
+def assert_replays(replay, grids):
+    for expected, replayed in zip(grids[replay.steps], grid(replay)):
+        assert (expected == replayed).all(), replay.steps
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_replay_seeks_to_every_recorded_step(tmp_path, backend):
+    path = tmp_path / "run.gdl"
+    garden, grids = record(path, backend, 300, 50)
+    garden.disable_delta_log()
+
+    replay = Replay(path)
+    assert (replay.first_step, replay.last_step, replay.keyframe_every) == (0, 300, 50)
+    assert replay.config == garden.config
+
+    for step in (0, 37, 50, 299, 300, 120, 3, 400, -5):
+        replay.seek(step)
+        assert replay.steps == min(max(step, 0), 300)
+        assert_replays(replay, grids)
+
+    # within the steps of a keyframe, updates only touch the tiles that changed
+    replay.seek(160)
+    assert replay.pop_dirty_tiles("view") is None
+    for step in range(161, 200):
+        replay.update()
+        changed = set(zip(*np.nonzero(grids[step][0] != grids[step - 1][0])[::-1]))
+        assert replay.steps == step and changed <= replay.pop_dirty_tiles("view")
+        assert_replays(replay, grids)
+
+    replay.seek(120)
+    assert replay.pop_dirty_tiles("view") is None
+
+    while not replay.finished:
+        replay.update()
+        assert_replays(replay, grids)
+    replay.close()
+
+
+def test_log_cut_short_ends_on_a_complete_step(tmp_path, monkeypatch):
+    monkeypatch.setattr(DeltaLog, "BUFFER", 100)
+    path = tmp_path / "run.gdl"
+    garden, grids = record(path, "object", 200, 1000)
+    garden.delta_log.close()
+
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) - 50)
+
+    replay = Replay(path)
+    assert 0 < replay.last_step < 200
+    replay.seek(replay.last_step)
+    assert_replays(replay, grids)
+    replay.close()
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from conftest import run, same_grid
+from src.simulation.array_garden import ArrayGarden
+
+
+def run_parallel(strips, workers, steps=300):
+    garden = ArrayGarden((60, 120), 1)
+    garden.enable_parallel(strips, workers)
+    try:
+        return run(garden, steps)
+    finally:
+        garden.disable_parallel()
+
+
+def test_results_do_not_depend_on_the_number_of_workers():
+    single = run_parallel(4, 1)
+    several = run_parallel(4, 2)
+
+    assert same_grid(single, several)
+    assert (single.state().energy == several.state().energy).all()
+    assert single.steps == 300 and len(single.plants)
+
+
+def test_garden_bookkeeping_stays_consistent():
+    garden = run_parallel(3, 1)
+    kinds, plant_ids = np.asarray(garden.kinds), np.asarray(garden.plant_ids)
+
+    for plant_id, _ in garden.plants.items():
+        ys, xs = np.nonzero(plant_ids == plant_id)
+        assert set(zip(xs.tolist(), ys.tolist())) == garden.plants.cells(plant_id)
+
+    counts = np.bincount(kinds.ravel(), minlength=4).tolist()
+    assert list(garden.cell_counts().values()) == counts
+
+    # the garden keeps updating in a single process once parallel updates are off
+    assert run(garden, 10).steps == 310
+
+
+def test_strip_count_is_validated():
+    garden = ArrayGarden((10, 20), 1)
+    for strips in (0, 21):
+        with pytest.raises(ValueError):
+            garden.enable_parallel(strips, 1)
@@ -0,0 +1,59 @@
+import pytest
+
+from conftest import run, same_grid
+from src.simulation.backends import BACKENDS
+from src.simulation.config import ENVIRONMENT, GardenConfig, default_config
+from src.simulation.sweep import grid_points, random_points, run_sweep
+
+
+def test_config_is_read_from_the_environment_and_validated():
+    environ = {variable: "1" for variable in ENVIRONMENT.values()}
+    config = GardenConfig.from_env(environ)
+    assert config.max_age == 1 and isinstance(config.max_age, int) and config.mutation_chance == 1.0
+
+    with pytest.raises(ValueError):
+        GardenConfig.from_env({})
+    with pytest.raises(ValueError):
+        config.replace(mutation_chance=1.5)
+    with pytest.raises(ValueError):
+        config.replace(sun_level=-1)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_gardens_follow_their_own_config(backend):
+    bright = default_config().replace(sun_level=30)
+    default, changed, explicit = (run(BACKENDS[backend]((70, 100), 1, config=config), 200)
+                                  for config in (None, bright, default_config()))
+
+    assert changed.config.sun_level == 30 and default.config == default_config()
+    assert same_grid(default, explicit) and not same_grid(default, changed)
+
+
+def test_points_cover_the_grid_and_stay_within_the_space():
+    assert grid_points({"sun_level": [10, 20], "max_age": [100, 200, 300]})[:2] == [
+        {"sun_level": 10, "max_age": 100}, {"sun_level": 10, "max_age": 200}]
+    assert len(grid_points({"sun_level": [10, 20], "max_age": [100, 200, 300]})) == 6
+
+    points = random_points({"sun_level": (10, 12), "mutation_chance": (0.1, 0.2), "max_age": [50, 60]}, 20, 1)
+    assert points == random_points({"sun_level": (10, 12), "mutation_chance": (0.1, 0.2), "max_age": [50, 60]}, 20, 1)
+    for point in points:
+        assert point["sun_level"] in (10, 11, 12) and 0.1 <= point["mutation_chance"] <= 0.2
+        assert point["max_age"] in (50, 60)
+
+
+def test_sweep_runs_every_point_with_the_same_seeds():
+    points = grid_points({"sun_level": [8, 13]})
+    results = sorted(run_sweep(points, (40, 60), 100, replicates=2, seed=3, workers=2), key=lambda r: r.index)
+
+    assert [(result.point, result.params) for result in results] == [
+        (0, {"sun_level": 8}), (0, {"sun_level": 8}), (1, {"sun_level": 13}), (1, {"sun_level": 13})]
+    assert [result.seed for result in results[:2]] == [result.seed for result in results[2:]]
+    assert all(result.stop in ("steps", "extinct") for result in results)
+
+    again = sorted(run_sweep(points, (40, 60), 100, replicates=2, seed=3, workers=1), key=lambda r: r.index)
+    assert [result.row() | {"elapsed": 0} for result in results] == [result.row() | {"elapsed": 0} for result in again]
+
+
+def test_unknown_parameters_fail_before_running():
+    with pytest.raises(TypeError):
+        list(run_sweep([{"sunlight": 3}], (40, 60), 10))